@@ -5,6 +5,7 @@ Loads environment variables and provides app settings.
 
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -13,6 +14,27 @@ class Settings(BaseSettings):
     # Anthropic API Configuration
     anthropic_api_key: str = ""
     claude_model: str = "claude-sonnet-4-20250514"
+    anthropic_timeout_seconds: float = 60.0
+    anthropic_max_retries: int = 2
+    anthropic_base_url: Optional[str] = None
+    # Client-side scheduling of Claude calls; match these to the account's rate limits
+    anthropic_requests_per_minute: int = 50
+    anthropic_input_tokens_per_minute: int = 30000
+    anthropic_max_concurrency: int = 16
+    anthropic_max_queue_wait_seconds: float = 30.0
+    anthropic_retry_base_seconds: float = 1.0
+    anthropic_retry_max_seconds: float = 30.0
+    prompt_caching_enabled: bool = True
+    evaluation_mode: str = "json"  # "json" (parse the reply text) or "tool" (schema-validated tool call)
+    # Model cascade: a cheaper model screens first; results within the margin of
+    # the pass score, inconsistent or unparseable go to the profile's model
+    cascade_enabled: bool = False
+    cascade_screening_model: str = "claude-3-5-haiku-20241022"
+    cascade_score_margin: int = 10
+    
+    # Screening Profiles (JSON file of extra roles; the built-in profile is "fintech-engineer")
+    profiles_path: Optional[str] = None
+    default_profile: str = "fintech-engineer"
     
     # App Configuration
     app_name: str = "CV Screening Agent"
@@ -21,6 +43,72 @@ class Settings(BaseSettings):
     # File Upload Configuration
     max_file_size_mb: int = 10
     allowed_extensions: list[str] = [".pdf"]
+    upload_chunk_size_kb: int = 64
+    upload_spool_max_memory_mb: int = 1
+    
+    # Batch Upload Configuration
+    batch_max_files: int = 1000
+    batch_max_request_mb: int = 200  # all files and archives of one batch/bulk request together
+    batch_max_concurrency: int = 8
+    batch_rate_limit_per_second: float = 0.0
+    batch_poll_interval_seconds: float = 30.0
+    
+    # PDF Processing Configuration
+    pdf_pool_workers: int = 2
+    pdf_pool_max_tasks_per_child: int = 100
+    pdf_parse_timeout_seconds: float = 30.0
+    # Fast text extraction backend (pdfminer, pdfium, pdfplumber) and the
+    # backend used when its output looks degraded ("" disables the fallback)
+    pdf_extraction_backend: str = "pdfminer"
+    pdf_fallback_backend: str = "pdfplumber"
+    pdf_min_chars_per_page: int = 100
+    
+    # OCR of pages without a text layer (needs pytesseract, pypdfium2 and tesseract)
+    ocr_enabled: bool = False
+    ocr_workers: int = 2
+    ocr_max_pages: int = 10
+    ocr_timeout_seconds: float = 60.0
+    ocr_dpi: int = 300
+    ocr_language: str = "eng"
+    
+    # Text Compaction Configuration (token budget of 0 means no truncation)
+    compaction_enabled: bool = True
+    compaction_token_budget: int = 0
+    
+    # Prescreen Configuration ("off", "shadow" or "enforce")
+    prescreen_policy: str = "shadow"
+    
+    # Result Cache Configuration
+    cache_enabled: bool = True
+    cache_max_entries: int = 1024
+    cache_ttl_seconds: int = 86400
+    cache_sqlite_path: Optional[str] = None
+    
+    # Evaluation Store Configuration
+    store_enabled: bool = True
+    store_sqlite_path: str = "evaluations.sqlite3"
+    
+    # Near-Duplicate Detection ("off", "flag" or "reuse"); needs the evaluation store
+    near_duplicate_policy: str = "flag"
+    near_duplicate_threshold: float = 0.9
+    near_duplicate_index_path: Optional[str] = "near_duplicates.idx"
+    near_duplicate_num_perm: int = 128
+    near_duplicate_bands: int = 16
+    
+    # Candidate Search (in-memory BM25 index over the evaluation store)
+    search_enabled: bool = True
+    search_poll_interval_seconds: float = 5.0
+    
+    # Job Queue Configuration
+    job_queue_backend: str = "memory"  # "memory" or "sqlite" (required for separate workers)
+    job_queue_sqlite_path: str = "jobs.sqlite3"
+    job_workers: int = 2  # worker tasks inside the API process; 0 when using `python -m app.worker`
+    job_max_attempts: int = 3
+    job_retry_delay_seconds: float = 5.0
+    job_lease_seconds: float = 300.0
+    job_poll_interval_seconds: float = 0.5
+    job_long_poll_max_seconds: float = 30.0
+    job_result_ttl_seconds: int = 86400
 
     class Config:
         env_file = ".env"
@@ -4,11 +4,27 @@ A production-ready API for AI-powered CV evaluation.
 """
 
 import logging
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 from .config import get_settings
-from .routers import cv_router
+from .metrics import REGISTRY, HTTP_DURATION, HTTP_IN_FLIGHT, HTTP_REQUESTS
+from .routers import (
+    cv_router,
+    batch_router,
+    job_router,
+    history_router,
+    get_profile_registry,
+    get_pdf_pool,
+    get_ocr_pool,
+    get_search_index,
+    get_screening_pipeline,
+    shutdown_dependencies,
+    start_job_workers,
+    shutdown_job_workers,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -35,10 +51,35 @@ async def lifespan(app: FastAPI):
     
     logger.info(f"Using model: {settings.claude_model}")
     
+    # Compile screening profiles now so an invalid profile fails startup
+    profiles = get_profile_registry()
+    logger.info(f"Screening profiles: {', '.join(profile.name for profile in profiles)}")
+    
+    # Resolve the PDF extraction backends now so a missing library fails startup
+    pdf_pool = get_pdf_pool()
+    logger.info(f"PDF extraction backend: {pdf_pool.backend} (fallback: {pdf_pool.fallback or 'none'})")
+    
+    # Check the OCR dependencies now so a missing tesseract fails startup
+    ocr_pool = get_ocr_pool()
+    if ocr_pool is not None:
+        logger.info(f"OCR for pages without text: tesseract {ocr_pool.tesseract_version}, {ocr_pool.workers} workers")
+    
+    # Build the shared pipeline up front: lru_cache does not lock, so a burst
+    # of first requests would each build one and not share in-flight work
+    get_screening_pipeline()
+    
+    # Start indexing stored evaluations for search in the background
+    if get_search_index() is not None:
+        logger.info("Candidate search: indexing stored evaluations in the background")
+    
+    start_job_workers()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down CV Screening Agent")
+    await shutdown_job_workers()
+    await shutdown_dependencies()
 
 
 # Create FastAPI application
@@ -77,8 +118,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Allowance for multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+SINGLE_UPLOAD_PATHS = ("/api/cv/upload", "/api/cv/jobs")
+BATCH_UPLOAD_PATHS = ("/api/cv/batch", "/api/cv/bulk")
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request: Request, call_next):
+    """
+    Reject uploads whose declared size already exceeds the limit, before
+    the multipart body is read at all: one file for single-CV uploads, the
+    whole request for batch and bulk uploads.
+    """
+    if request.method == "POST" and request.url.path.startswith(SINGLE_UPLOAD_PATHS + BATCH_UPLOAD_PATHS):
+        settings = get_settings()
+        if request.url.path.startswith(BATCH_UPLOAD_PATHS):
+            max_mb, detail = settings.batch_max_request_mb, "Batch too large. Maximum total size is"
+        else:
+            max_mb, detail = settings.max_file_size_mb, "File too large. Maximum size is"
+        content_length = request.headers.get("content-length")
+        max_size_bytes = max_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES
+        if content_length and content_length.isdigit() and int(content_length) > max_size_bytes:
+            return JSONResponse(
+                status_code=400,
+                content={"detail": f"{detail} {max_mb}MB."}
+            )
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """
+    Record in-flight requests, latency and status codes per route.
+    Routes are labelled by their path template to keep label cardinality bounded.
+    """
+    started = time.perf_counter()
+    status = "500"
+    with HTTP_IN_FLIGHT.track():
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+            return response
+        finally:
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            HTTP_DURATION.observe(time.perf_counter() - started, method=request.method, path=path)
+            HTTP_REQUESTS.inc(method=request.method, path=path, status=status)
+
+
 # Include routers
 app.include_router(cv_router)
+app.include_router(batch_router)
+app.include_router(job_router)
+app.include_router(history_router)
 
 
 @app.get("/", tags=["Root"])
@@ -96,3 +190,12 @@ async def root():
 async def global_health():
     """Global health check endpoint."""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus-style metrics endpoint."""
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,350 @@
+"""
+Metrics module for the CV Screening Agent.
+Minimal Prometheus-style counters, gauges and histograms with a text exposition endpoint.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow Claude calls
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0
+)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+
+class _Metric(ABC):
+    """Base class holding one value per label combination."""
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+    
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Order label values consistently, rejecting unknown or missing labels."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+    
+    def _format_labels(self, key: tuple[str, ...], extra: Optional[dict[str, str]] = None) -> str:
+        """Render a label set in exposition format."""
+        pairs = list(zip(self.labelnames, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+        return "{" + body + "}"
+    
+    def render(self) -> list[str]:
+        """Render HELP/TYPE lines plus samples."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples(),
+        ]
+    
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Render the sample lines of every label set."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    
+    type_name = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the counter for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels: str) -> float:
+        """Current value for a label set (0 if never incremented)."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+    
+    type_name = "gauge"
+    
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+    
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+    
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the gauge for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrease the gauge for a label set."""
+        self.inc(-amount, **labels)
+    
+    def value(self, **labels: str) -> float:
+        """Current value for a label set (0 if never set)."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+    
+    @contextmanager
+    def track(self, **labels: str) -> Iterator[None]:
+        """Increment while the block runs, e.g. to count in-flight work."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+    
+    def _samples(self) -> list[str]:
+        with self._lock:
+            return [f"{self.name}{self._format_labels(k)} {_number(v)}" for k, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # key -> (bucket counts, sum, count)
+        self._values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+    
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for a label set."""
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            self._values[key] = (counts, total + value, count + 1)
+    
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+    
+    @contextmanager
+    def time_outcome(self, **labels: str) -> Iterator[None]:
+        """
+        Observe the block's duration with an `outcome` label of success or error.
+        The histogram must have an `outcome` label.
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        finally:
+            self.observe(time.perf_counter() - started, outcome=outcome, **labels)
+    
+    def count(self, **labels: str) -> int:
+        """Number of observations for a label set."""
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return entry[2] if entry else 0
+    
+    def _samples(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if math.isinf(bound) else _number(bound)
+                    lines.append(f"{self.name}_bucket{self._format_labels(key, {'le': le})} {cumulative}")
+                lines.append(f"{self.name}_sum{self._format_labels(key)} {_number(total)}")
+                lines.append(f"{self.name}_count{self._format_labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics."""
+    
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+    
+    def register(self, metric: _Metric) -> None:
+        """Add a metric; names must be unique."""
+        if any(existing.name == metric.name for existing in self._metrics):
+            raise ValueError(f"Duplicate metric name: {metric.name}")
+        self._metrics.append(metric)
+    
+    def render(self) -> str:
+        """Render every metric in Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    """Format a sample value without a trailing .0 for integers."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP layer
+HTTP_REQUESTS = Counter(
+    "cv_http_requests_total", "HTTP requests by route and status code",
+    ("method", "path", "status")
+)
+HTTP_DURATION = Histogram(
+    "cv_http_request_duration_seconds", "End-to-end HTTP request latency",
+    ("method", "path")
+)
+HTTP_IN_FLIGHT = Gauge(
+    "cv_http_requests_in_flight", "HTTP requests currently being handled"
+)
+QUEUE_DEPTH = Gauge(
+    "cv_queue_depth", "Work items waiting for a free worker or slot",
+    ("queue",)
+)
+
+# Pipeline stages
+STAGE_DURATION = Histogram(
+    "cv_stage_duration_seconds",
+    "Latency of each pipeline stage (upload_read, pdf_validate, pdf_extract, ocr, json_parse, pipeline)",
+    ("stage", "outcome")
+)
+
+# PDF extraction
+PDF_EXTRACTIONS = Counter(
+    "cv_pdf_extractions_total",
+    "PDF text extractions by backend used and fallback reason (none if the fast backend's text was kept)",
+    ("backend", "fallback_reason")
+)
+
+# OCR of pages without a text layer
+OCR_PAGES = Counter(
+    "cv_ocr_pages_total", "Pages without a text layer by OCR outcome (text, empty, capped, timeout, error)",
+    ("outcome",)
+)
+
+# Request coalescing
+COALESCED_CALLS = Counter(
+    "cv_coalesced_calls_total", "Calls that joined identical work already in flight, by stage (upload, pdf, evaluation)",
+    ("stage",)
+)
+
+# Claude API
+CLAUDE_DURATION = Histogram(
+    "cv_claude_request_duration_seconds", "Claude API call latency",
+    ("model", "outcome")
+)
+CLAUDE_TOKENS = Counter(
+    "cv_claude_tokens_total", "Claude tokens by type (input, output, cache_read, cache_creation)",
+    ("model", "type")
+)
+CLAUDE_INPUT_TOKENS = Histogram(
+    "cv_claude_input_tokens", "Input tokens per Claude call",
+    ("model",), buckets=TOKEN_BUCKETS
+)
+
+# Result cache
+CACHE_LOOKUPS = Counter(
+    "cv_cache_lookups_total", "Result cache lookups by namespace and result (memory_hit, disk_hit, miss)",
+    ("namespace", "result")
+)
+
+# Local prescreen
+PRESCREEN_DECISIONS = Counter(
+    "cv_prescreen_decisions_total", "Prescreen outcomes (llm, would_skip, skipped)",
+    ("policy", "decision")
+)
+
+# Near-duplicate detection
+NEAR_DUPLICATE_LOOKUPS = Counter(
+    "cv_near_duplicate_lookups_total", "Near-duplicate index lookups by outcome (miss, flagged, reused)",
+    ("policy", "outcome")
+)
+
+# Text compaction
+COMPACTION_TOKENS_SAVED = Histogram(
+    "cv_compaction_tokens_saved", "Estimated prompt tokens removed per CV by text compaction",
+    buckets=(0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+)
+
+# Claude call scheduling
+CLAUDE_RETRIES = Counter(
+    "cv_claude_retries_total", "Claude call retries by reason (rate_limited, overloaded, server_error, connection)",
+    ("reason",)
+)
+CLAUDE_SHED = Counter(
+    "cv_claude_shed_total", "Claude calls rejected with 429/503 by reason",
+    ("reason",)
+)
+
+# Structured output
+EVALUATION_OUTPUTS = Counter(
+    "cv_evaluation_outputs_total",
+    "Claude evaluation outputs by mode and result (valid, repaired, failed)",
+    ("mode", "result")
+)
+
+# Model cascade
+CASCADE_DECISIONS = Counter(
+    "cv_cascade_decisions_total",
+    "Screening-model results accepted or escalated, by decision (accepted, borderline, inconsistent, failed)",
+    ("decision",)
+)
+CASCADE_DURATION = Histogram(
+    "cv_cascade_tier_duration_seconds", "Evaluation latency per cascade tier (screening, escalation)",
+    ("tier", "outcome")
+)
+
+# Screening profiles
+PROFILE_EVALUATIONS = Counter(
+    "cv_profile_evaluations_total",
+    "Evaluations per screening profile by status and source (claude, cache, prescreen, store, near_duplicate)",
+    ("profile", "status", "source")
+)
+PROFILE_DURATION = Histogram(
+    "cv_profile_evaluation_duration_seconds", "Evaluation latency per screening profile",
+    ("profile", "outcome")
+)
@@ -22,6 +22,63 @@ class EvaluationCriteria(BaseModel):
     details: str = Field(..., description="Explanation of the evaluation")
 
 
+class ProfileCriterion(BaseModel):
+    """One criterion a screening profile evaluates."""
+    
+    name: str = Field(..., min_length=1, description="Criterion name, as reported in the evaluation")
+    description: str = Field(..., min_length=1, description="What the evaluator should look for")
+
+
+class ScreeningProfile(BaseModel):
+    """Definition of a role to screen for: criteria, thresholds, prompt and model."""
+    
+    name: str = Field(
+        ...,
+        pattern=r"^[a-z0-9][a-z0-9_-]*$",
+        description="Profile identifier used in the `profile` request parameter"
+    )
+    role: str = Field(..., description="Job title the CV is screened for")
+    company: str = Field("XBO.com", description="Hiring company named in the prompt")
+    criteria: list[ProfileCriterion] = Field(..., min_length=1, description="Criteria to evaluate")
+    pass_score: int = Field(60, ge=0, le=100, description="Minimum match score to pass")
+    min_criteria: int = Field(2, ge=0, description="Minimum number of criteria met to pass")
+    model: Optional[str] = Field(None, description="Claude model; defaults to CLAUDE_MODEL")
+    prompt_template: Optional[str] = Field(
+        None,
+        description="System prompt template with $placeholders; defaults to the standard template"
+    )
+    prescreen: bool = Field(False, description="Run the local keyword prescreen for this profile")
+
+
+class CompiledProfile(BaseModel):
+    """
+    A screening profile with its system prompt rendered and versioned once at startup.
+    Used internally by the evaluation service and pipeline.
+    """
+    
+    definition: ScreeningProfile = Field(..., description="Profile as configured")
+    system_prompt: str = Field(..., description="Rendered system prompt")
+    prompt_version: str = Field(..., description="Hash of the system prompt")
+    model: str = Field(..., description="Claude model used for this profile")
+    
+    @property
+    def name(self) -> str:
+        """Profile identifier."""
+        return self.definition.name
+
+
+class ProfileSummary(BaseModel):
+    """Public description of a screening profile."""
+    
+    name: str = Field(..., description="Profile identifier")
+    role: str = Field(..., description="Job title the CV is screened for")
+    criteria: list[str] = Field(..., description="Criterion names")
+    pass_score: int = Field(..., description="Minimum match score to pass")
+    min_criteria: int = Field(..., description="Minimum number of criteria met to pass")
+    model: str = Field(..., description="Claude model used for this profile")
+    prompt_version: str = Field(..., description="Hash of the system prompt")
+
+
 class CVEvaluationRequest(BaseModel):
     """Request model for CV evaluation (used internally)."""
     
@@ -29,6 +86,83 @@ class CVEvaluationRequest(BaseModel):
     filename: str = Field(..., description="Original filename of the uploaded CV")
 
 
+class PDFIngestionResult(BaseModel):
+    """
+    Result of parsing a PDF once for both validation and text extraction.
+    Used internally between the PDF service and the router.
+    """
+    
+    page_count: int = Field(0, description="Number of pages in the document")
+    pages: list[str] = Field(
+        default_factory=list,
+        description="Extracted text per page (empty string for pages without text)"
+    )
+    open_ms: float = Field(0.0, description="Time spent opening and parsing the document")
+    extract_ms: float = Field(0.0, description="Time spent extracting page text")
+    backend: Optional[str] = Field(None, description="Extraction backend that produced `pages`")
+    fallback_reason: Optional[str] = Field(
+        None,
+        description="Why the fast backend's output was replaced (error, low_text_yield, garbled_text, multi_column)"
+    )
+    ocr_pages: list[int] = Field(
+        default_factory=list,
+        description="Pages (0-based) without a text layer whose text came from OCR"
+    )
+    ocr_ms: float = Field(0.0, description="Time spent on OCR")
+    errors: list[str] = Field(
+        default_factory=list,
+        description="Validation or extraction errors; empty when the PDF is usable"
+    )
+    
+    @property
+    def is_valid(self) -> bool:
+        """Whether the PDF parsed cleanly and yielded text."""
+        return not self.errors
+    
+    @property
+    def text(self) -> str:
+        """All non-empty page text joined with double newlines."""
+        return "\n\n".join(page for page in self.pages if page.strip())
+
+
+class PDFTextExtraction(BaseModel):
+    """
+    Raw output of one PDF text extraction backend.
+    Used internally by the PDF service to decide whether to fall back.
+    """
+    
+    backend: str = Field(..., description="Backend name")
+    page_count: int = Field(0, description="Number of pages in the document")
+    pages: list[str] = Field(default_factory=list, description="Extracted text per page")
+    open_ms: float = Field(0.0, description="Time spent opening and parsing the document")
+    extract_ms: float = Field(0.0, description="Time spent extracting page text")
+    multi_column: bool = Field(False, description="Whether a page looks laid out in side-by-side columns")
+
+
+class TextCompactionResult(BaseModel):
+    """
+    CV text after normalization and compaction, with token estimates.
+    Used internally between extraction and evaluation.
+    """
+    
+    text: str = Field(..., description="Compacted CV text sent for evaluation")
+    original_tokens: int = Field(..., description="Estimated tokens of the raw extracted text")
+    compacted_tokens: int = Field(..., description="Estimated tokens after compaction")
+    truncated: bool = Field(False, description="Whether the token budget forced truncation")
+    
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated tokens removed by compaction."""
+        return max(0, self.original_tokens - self.compacted_tokens)
+
+
+class NearDuplicateMatch(BaseModel):
+    """A stored evaluation whose CV text is nearly identical to the one screened."""
+    
+    evaluation_id: int = Field(..., description="Evaluation record ID of the earlier CV")
+    similarity: float = Field(..., description="Estimated Jaccard similarity of the two CV texts")
+
+
 class CVEvaluationResponse(BaseModel):
     """
     Structured response from the CV evaluation.
@@ -57,6 +191,10 @@ class CVEvaluationResponse(BaseModel):
         None, 
         description="Extracted candidate name if found"
     )
+    near_duplicate_of: Optional[NearDuplicateMatch] = Field(
+        None,
+        description="Earlier evaluation of a nearly identical CV, if the near-duplicate index found one"
+    )
     
     class Config:
         json_schema_extra = {
@@ -97,6 +235,147 @@ class UploadResponse(BaseModel):
     )
 
 
+class RoleFit(BaseModel):
+    """How well a CV fits one role, as part of a multi-role evaluation."""
+    
+    rank: int = Field(..., description="Position in the ranking, 1 being the best fit")
+    profile: str = Field(..., description="Screening profile name")
+    role: str = Field(..., description="Job title of the profile")
+    criteria_met: int = Field(..., description="Number of criteria the candidate meets")
+    evaluation: CVEvaluationResponse = Field(..., description="Evaluation against this profile")
+
+
+class MultiRoleResponse(BaseModel):
+    """Response model for evaluating one CV against several roles."""
+    
+    success: bool = Field(..., description="Whether the evaluation was successful")
+    message: str = Field(..., description="Status message")
+    best_fit: Optional[str] = Field(None, description="Highest-ranked passing profile, if any")
+    fits: list[RoleFit] = Field(
+        default_factory=list,
+        description="Role fits, best first: passing roles, then by match score and criteria met"
+    )
+
+
+class BatchFileResult(BaseModel):
+    """Outcome of screening one file inside a batch."""
+    
+    filename: str = Field(..., description="Name of the PDF (path inside the ZIP if zipped)")
+    success: bool = Field(..., description="Whether the file was evaluated")
+    evaluation: Optional[CVEvaluationResponse] = Field(
+        None,
+        description="CV evaluation results if successful"
+    )
+    error: Optional[str] = Field(None, description="Error message if the file failed")
+
+
+class BatchUploadResponse(BaseModel):
+    """Response model for the batch upload endpoint."""
+    
+    success: bool = Field(..., description="Whether the batch was processed")
+    total: int = Field(..., description="Number of PDFs found in the batch")
+    succeeded: int = Field(..., description="Number of PDFs evaluated successfully")
+    failed: int = Field(..., description="Number of PDFs that failed")
+    results: list[BatchFileResult] = Field(..., description="Per-file results, in upload order")
+
+
+class BulkJobResponse(BaseModel):
+    """Status of an offline bulk screening job backed by the Message Batches API."""
+    
+    batch_id: str = Field(..., description="Message Batch ID, used to poll for results")
+    processing_status: str = Field(
+        ...,
+        description="Batch status: in_progress, canceling or ended"
+    )
+    request_counts: dict[str, int] = Field(
+        default_factory=dict,
+        description="Requests per state: processing, succeeded, errored, canceled, expired"
+    )
+    rejected: list[BatchFileResult] = Field(
+        default_factory=list,
+        description="Files that could not be submitted (e.g. unreadable PDFs)"
+    )
+    created_at: Optional[str] = Field(None, description="When the batch was created")
+    ended_at: Optional[str] = Field(None, description="When processing ended")
+
+
+class StoredEvaluation(BaseModel):
+    """A persisted evaluation with the metadata needed to find it again."""
+    
+    id: int = Field(..., description="Evaluation record ID")
+    file_hash: str = Field(..., description="SHA-256 of the uploaded PDF bytes")
+    filename: str = Field(..., description="Original filename of the uploaded CV")
+    candidate_name: Optional[str] = Field(None, description="Extracted candidate name if found")
+    status: PassFailStatus = Field(..., description="Overall pass/fail status")
+    match_score: int = Field(..., description="Overall match score from 0-100")
+    model: str = Field(..., description="Claude model that produced the evaluation")
+    prompt_version: str = Field(..., description="Version hash of the evaluation prompt")
+    profile: Optional[str] = Field(None, description="Screening profile the CV was evaluated against")
+    timings: dict[str, float] = Field(
+        default_factory=dict,
+        description="Stage durations in milliseconds (ingest, evaluate, total)"
+    )
+    created_at: str = Field(..., description="When the CV was screened")
+    evaluation: CVEvaluationResponse = Field(..., description="The evaluation as originally returned")
+
+
+class EvaluationPage(BaseModel):
+    """One page of stored evaluations."""
+    
+    items: list[StoredEvaluation] = Field(..., description="Evaluations on this page")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Pass as `cursor` to fetch the next page; null on the last page"
+    )
+
+
+class SearchHit(BaseModel):
+    """One stored evaluation matching a search query."""
+    
+    score: float = Field(..., description="BM25 relevance score; higher is more relevant")
+    evaluation: StoredEvaluation = Field(..., description="The matching stored evaluation")
+
+
+class SearchResponse(BaseModel):
+    """Ranked search results over stored evaluations."""
+    
+    query: str = Field(..., description="The search query")
+    hits: list[SearchHit] = Field(..., description="Matching evaluations, most relevant first")
+    indexed: int = Field(..., description="Evaluations searched; new ones are indexed within seconds")
+
+
+class JobStatus(str, Enum):
+    """Lifecycle state of an asynchronous screening job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class JobResponse(BaseModel):
+    """State of an asynchronous screening job, including its result once finished."""
+    
+    job_id: str = Field(..., description="Job ID, used to poll for the result")
+    status: JobStatus = Field(..., description="Job state: queued, running, succeeded or failed")
+    filename: str = Field(..., description="Original filename of the uploaded CV")
+    priority: int = Field(0, description="Higher priority jobs are picked up first")
+    profile: Optional[str] = Field(None, description="Screening profile; the default profile if not set")
+    attempts: int = Field(0, description="Number of times a worker has started the job")
+    max_attempts: int = Field(1, description="Attempts allowed before the job is marked failed")
+    evaluation: Optional[CVEvaluationResponse] = Field(
+        None,
+        description="CV evaluation results once the job has succeeded"
+    )
+    error: Optional[str] = Field(None, description="Last error message, if an attempt failed")
+    created_at: Optional[str] = Field(None, description="When the job was submitted")
+    updated_at: Optional[str] = Field(None, description="When the job last changed state")
+    
+    @property
+    def is_finished(self) -> bool:
+        """Whether the job has reached a terminal state."""
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
 class ErrorResponse(BaseModel):
     """Standard error response model."""
     
@@ -1,4 +1,40 @@
 # Routers package
-from .cv_router import router as cv_router
+from .cv_router import (
+    router as cv_router,
+    get_evaluation_service,
+    get_profile_registry,
+    get_pdf_pool,
+    get_ocr_pool,
+    get_result_cache,
+    get_evaluation_store,
+    get_search_index,
+    get_screening_pipeline,
+    shutdown_dependencies,
+)
+from .batch_router import router as batch_router
+from .history_router import router as history_router
+from .job_router import (
+    router as job_router,
+    get_job_queue,
+    start_job_workers,
+    shutdown_job_workers,
+)
 
-__all__ = ["cv_router"]
+__all__ = [
+    "cv_router",
+    "batch_router",
+    "job_router",
+    "history_router",
+    "get_evaluation_service",
+    "get_profile_registry",
+    "get_pdf_pool",
+    "get_ocr_pool",
+    "get_result_cache",
+    "get_evaluation_store",
+    "get_search_index",
+    "get_screening_pipeline",
+    "shutdown_dependencies",
+    "get_job_queue",
+    "start_job_workers",
+    "shutdown_job_workers",
+]
@@ -0,0 +1,450 @@
+"""
+Batch CV Upload Router.
+Screens many PDFs, uploaded individually or as ZIP archives, in one request.
+"""
+
+import asyncio
+import base64
+import binascii
+import logging
+import time
+import zipfile
+import zlib
+from contextlib import ExitStack
+from operator import itemgetter
+from typing import Callable, Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from anthropic import NotFoundError
+from anthropic.types.messages import MessageBatch
+from ..models.schemas import (
+    BatchUploadResponse,
+    BatchFileResult,
+    BulkJobResponse,
+    CompiledProfile,
+    CVEvaluationResponse,
+    ErrorResponse,
+)
+from ..services.evaluation_service import EvaluationService
+from ..services.profile_registry import ProfileRegistry
+from ..services.rate_limiter import RateLimitExceeded
+from ..services.screening_pipeline import ScreeningPipeline
+from ..services.upload_service import validate_pdf
+from ..config import get_settings, Settings
+from .cv_router import _resolve_profile, get_evaluation_service, get_profile_registry, get_screening_pipeline
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/cv", tags=["Batch Screening"])
+
+# A batch item is a filename plus a blocking callable that returns the validated
+# PDF bytes on demand (run in a thread), so ZIP entries are only decompressed
+# when their turn comes and never on the event loop.
+BatchItem = tuple[str, Callable[[], bytes]]
+
+# Message Batches custom_id limit ([a-zA-Z0-9_-], 1 to 64 characters)
+CUSTOM_ID_MAX_LENGTH = 64
+
+
+class _StartRateLimiter:
+    """Spaces out task starts so a batch never exceeds `rate` files per second."""
+    
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def wait(self) -> None:
+        """Sleep until the next start slot is available."""
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@router.post(
+    "/batch",
+    response_model=BatchUploadResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid batch"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Batch Upload and Evaluate CVs",
+    description="Upload many PDF CVs and/or ZIP archives of PDFs and receive an evaluation per file."
+)
+async def upload_and_evaluate_batch(
+    files: list[UploadFile] = File(..., description="PDF files or ZIP archives containing PDFs"),
+    profile: Optional[str] = Form(None, description="Screening profile for every file; the default profile if omitted"),
+    settings: Settings = Depends(get_settings),
+    pipeline: ScreeningPipeline = Depends(get_screening_pipeline),
+    profiles: ProfileRegistry = Depends(get_profile_registry)
+) -> BatchUploadResponse:
+    """
+    Screen a batch of CVs with bounded concurrency.
+    
+    Files are processed concurrently up to `batch_max_concurrency`, and new
+    files are started at no more than `batch_rate_limit_per_second`. A failing
+    file is reported in its own result and never fails the whole batch.
+    """
+    screening_profile = _resolve_profile(profiles, profile)
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+    limiter = _StartRateLimiter(settings.batch_rate_limit_per_second)
+    
+    async def screen(filename: str, read: Callable[[], bytes]) -> BatchFileResult:
+        async with semaphore:
+            await limiter.wait()
+            return await _screen_one(filename, read, pipeline, screening_profile)
+    
+    # ZIP archives stay open until every entry has been read
+    with ExitStack() as archives:
+        items = await _collect_batch_items(files, settings, archives)
+        _check_batch_items(items, settings)
+        
+        logger.info(f"Processing batch of {len(items)} CVs")
+        results = await asyncio.gather(*(screen(name, read) for name, read in items))
+    
+    succeeded = sum(1 for result in results if result.success)
+    
+    return BatchUploadResponse(
+        success=True,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=list(results)
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkJobResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid batch"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    },
+    summary="Submit Bulk Screening Job",
+    description="Extract many CVs and submit them as one Anthropic Message Batch for offline, lower-cost evaluation."
+)
+async def submit_bulk_job(
+    files: list[UploadFile] = File(..., description="PDF files or ZIP archives containing PDFs"),
+    profile: Optional[str] = Form(None, description="Screening profile for every file; the default profile if omitted"),
+    settings: Settings = Depends(get_settings),
+    pipeline: ScreeningPipeline = Depends(get_screening_pipeline),
+    evaluation_service: EvaluationService = Depends(get_evaluation_service)
+) -> BulkJobResponse:
+    """
+    Submit a bulk screening job.
+    
+    PDFs are extracted now; evaluation happens asynchronously in a Message
+    Batch. Poll `GET /api/cv/bulk/{batch_id}` and fetch results once ended.
+    """
+    screening_profile = _resolve_profile(evaluation_service.profiles, profile)
+    semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+    
+    async def extract(index: int, filename: str, read: Callable[[], bytes]):
+        async with semaphore:
+            try:
+                if not filename.lower().endswith(".pdf"):
+                    raise ValueError("Invalid file type. Only PDF files are accepted.")
+                content = await asyncio.to_thread(read)
+                ingestion = await pipeline.ingest(content)
+                if not ingestion.is_valid:
+                    raise ValueError(ingestion.errors[0])
+                return (_encode_custom_id(index, filename), pipeline.prepare_text(ingestion), filename)
+            except ValueError as e:
+                return BatchFileResult(filename=filename, success=False, error=str(e))
+    
+    with ExitStack() as archives:
+        items = await _collect_batch_items(files, settings, archives)
+        _check_batch_items(items, settings)
+        
+        extracted = await asyncio.gather(
+            *(extract(index, name, read) for index, (name, read) in enumerate(items))
+        )
+    
+    requests = [item for item in extracted if isinstance(item, tuple)]
+    rejected = [item for item in extracted if isinstance(item, BatchFileResult)]
+    
+    if not requests:
+        raise HTTPException(status_code=400, detail="None of the uploaded files could be processed")
+    
+    try:
+        batch = await evaluation_service.submit_batch(requests, screening_profile)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    logger.info(f"Submitted bulk job {batch.id} with {len(requests)} CVs")
+    return _bulk_job_response(batch, rejected)
+
+
+@router.get(
+    "/bulk/{batch_id}",
+    response_model=BulkJobResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown bulk job"},
+        502: {"model": ErrorResponse, "description": "Anthropic API error"}
+    },
+    summary="Bulk Job Status",
+    description="Check the processing status of a bulk screening job."
+)
+async def get_bulk_job(
+    batch_id: str,
+    evaluation_service: EvaluationService = Depends(get_evaluation_service)
+) -> BulkJobResponse:
+    """
+    Poll the status of a bulk screening job.
+    """
+    try:
+        batch = await evaluation_service.get_batch(batch_id)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Bulk job {batch_id} not found")
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    return _bulk_job_response(batch)
+
+
+@router.get(
+    "/bulk/{batch_id}/results",
+    response_model=BatchUploadResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown bulk job"},
+        409: {"model": ErrorResponse, "description": "Batch still processing"},
+        502: {"model": ErrorResponse, "description": "Anthropic API error"}
+    },
+    summary="Bulk Job Results",
+    description="Fetch per-file evaluations of an ended bulk screening job."
+)
+async def get_bulk_job_results(
+    batch_id: str,
+    evaluation_service: EvaluationService = Depends(get_evaluation_service)
+) -> BatchUploadResponse:
+    """
+    Map Message Batch results back to per-file evaluations.
+    """
+    try:
+        batch = await evaluation_service.get_batch(batch_id)
+    except NotFoundError:
+        raise HTTPException(status_code=404, detail=f"Bulk job {batch_id} not found")
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    if batch.processing_status != "ended":
+        raise HTTPException(
+            status_code=409,
+            detail=f"Batch is still {batch.processing_status}, try again later"
+        )
+    
+    try:
+        outcomes = await evaluation_service.get_batch_results(batch_id)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    results = []
+    for _, filename, outcome in sorted(
+        ((*_decode_custom_id(custom_id), outcome) for custom_id, outcome in outcomes.items()),
+        key=itemgetter(0, 1)
+    ):
+        if isinstance(outcome, CVEvaluationResponse):
+            results.append(BatchFileResult(filename=filename, success=True, evaluation=outcome))
+        else:
+            results.append(BatchFileResult(filename=filename, success=False, error=outcome))
+    
+    succeeded = sum(1 for result in results if result.success)
+    return BatchUploadResponse(
+        success=True,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results
+    )
+
+
+def _bulk_job_response(
+    batch: MessageBatch,
+    rejected: Optional[list[BatchFileResult]] = None
+) -> BulkJobResponse:
+    """Convert a Message Batch into the API response model."""
+    return BulkJobResponse(
+        batch_id=batch.id,
+        processing_status=batch.processing_status,
+        request_counts=batch.request_counts.model_dump(),
+        rejected=rejected or [],
+        created_at=batch.created_at.isoformat() if batch.created_at else None,
+        ended_at=batch.ended_at.isoformat() if batch.ended_at else None
+    )
+
+
+def _encode_custom_id(index: int, filename: str) -> str:
+    """
+    Build the Message Batches custom_id of a bulk item.
+    
+    The ID carries the upload index and the filename (URL-safe base64), so
+    results can be labelled by any process, even after a restart. Names
+    too long for the 64-character limit are shortened.
+    """
+    prefix = f"cv-{index}-"
+    name = filename.encode("utf-8")[:(CUSTOM_ID_MAX_LENGTH - len(prefix)) * 3 // 4]
+    return prefix + base64.urlsafe_b64encode(name).decode("ascii").rstrip("=")
+
+
+def _decode_custom_id(custom_id: str) -> tuple[int, str]:
+    """
+    Recover the upload index and filename from a bulk item's custom_id.
+    
+    Returns:
+        (index, filename); (-1, custom_id) for IDs not built by `_encode_custom_id`
+    """
+    tag, _, rest = custom_id.partition("-")
+    index, _, encoded = rest.partition("-")
+    if tag != "cv" or not index.isdigit():
+        return -1, custom_id
+    try:
+        name = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    except (binascii.Error, ValueError):
+        return int(index), custom_id
+    # A shortened name may end inside a multi-byte character
+    return int(index), name.decode("utf-8", errors="ignore") or custom_id
+
+
+async def _collect_batch_items(
+    files: list[UploadFile],
+    settings: Settings,
+    archives: ExitStack
+) -> list[BatchItem]:
+    """
+    Expand the uploaded files into individual PDFs.
+    
+    Nothing is read into memory here: each item reads its PDF from the
+    uploaded file (or decompresses it from its archive) when it is screened.
+    
+    Args:
+        files: Uploaded PDFs and ZIP archives
+        settings: Application settings
+        archives: Exit stack that takes ownership of every opened ZIP archive;
+            the caller closes it once the items have been read
+        
+    Returns:
+        List of (filename, reader) pairs
+        
+    Raises:
+        HTTPException: If the upload is too large in total or a ZIP archive cannot be opened
+    """
+    max_request_mb = settings.batch_max_request_mb
+    if sum(upload.size or 0 for upload in files) > max_request_mb * 1024 * 1024:
+        raise HTTPException(status_code=400, detail=f"Batch too large. Maximum total size is {max_request_mb}MB.")
+    
+    items: list[BatchItem] = []
+    
+    for upload in files:
+        filename = upload.filename or ""
+        
+        if not filename.lower().endswith(".zip"):
+            items.append((filename, lambda upload=upload: _read_upload_item(upload, settings)))
+            continue
+        
+        try:
+            archive = archives.enter_context(await asyncio.to_thread(zipfile.ZipFile, upload.file))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail=f"Invalid ZIP archive: {filename}")
+        
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(".pdf"):
+                continue
+            items.append((name, lambda archive=archive, info=info: _read_zip_entry(archive, info, settings)))
+            if len(items) > settings.batch_max_files:
+                return items
+    
+    return items
+
+
+def _check_batch_items(items: list[BatchItem], settings: Settings) -> None:
+    """
+    Reject a batch with no PDFs or more than `batch_max_files` of them.
+    
+    Raises:
+        HTTPException: If the batch is empty or too large
+    """
+    if not items:
+        raise HTTPException(status_code=400, detail="No PDF files found in the upload")
+    if len(items) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum batch size is {settings.batch_max_files}."
+        )
+
+
+def _read_upload_item(upload: UploadFile, settings: Settings) -> bytes:
+    """
+    Read one uploaded PDF of a batch and apply the single-upload checks.
+    Blocking; run it in a thread.
+    
+    Raises:
+        ValueError: If the file is empty, too large or is not a PDF
+    """
+    max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+    if upload.size is not None and upload.size > max_size_bytes:
+        raise ValueError(f"File too large. Maximum size is {settings.max_file_size_mb}MB.")
+    
+    upload.file.seek(0)
+    return validate_pdf(upload.file.read(max_size_bytes + 1), max_size_bytes)
+
+
+def _read_zip_entry(archive: zipfile.ZipFile, info: zipfile.ZipInfo, settings: Settings) -> bytes:
+    """
+    Decompress one ZIP entry, refusing entries larger than the upload limit,
+    and apply the single-upload checks. Blocking; run it in a thread.
+    
+    Raises:
+        ValueError: If the entry is unreadable, empty, too large once decompressed or not a PDF
+    """
+    max_size_bytes = settings.max_file_size_mb * 1024 * 1024
+    if info.file_size > max_size_bytes:
+        raise ValueError(f"File too large. Maximum size is {settings.max_file_size_mb}MB.")
+    
+    try:
+        with archive.open(info) as entry:
+            # Never trust the declared size: read at most one byte past the limit
+            content = entry.read(max_size_bytes + 1)
+    except (zipfile.BadZipFile, zlib.error, NotImplementedError, RuntimeError) as e:
+        raise ValueError(f"Could not read {info.filename} from the archive: {e}")
+    return validate_pdf(content, max_size_bytes)
+
+
+async def _screen_one(
+    filename: str,
+    read: Callable[[], bytes],
+    pipeline: ScreeningPipeline,
+    profile: Optional[CompiledProfile] = None
+) -> BatchFileResult:
+    """
+    Validate and evaluate one PDF, converting failures into a result entry.
+    
+    Returns:
+        Result for this file
+    """
+    if not filename.lower().endswith(".pdf"):
+        return BatchFileResult(
+            filename=filename,
+            success=False,
+            error="Invalid file type. Only PDF files are accepted."
+        )
+    
+    try:
+        content = await asyncio.to_thread(read)
+        evaluation = await pipeline.run(content, filename, profile)
+        return BatchFileResult(filename=filename, success=True, evaluation=evaluation)
+        
+    except (RateLimitExceeded, ValueError) as e:
+        logger.error(f"Batch item {filename} failed: {e}")
+        return BatchFileResult(filename=filename, success=False, error=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error processing batch item {filename}: {e}")
+        return BatchFileResult(
+            filename=filename,
+            success=False,
+            error="An unexpected error occurred while processing the CV"
+        )
@@ -3,21 +3,257 @@ CV Upload and Evaluation Router.
 Handles the main API endpoints for CV screening.
 """
 
+import json
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from ..models.schemas import UploadResponse, ErrorResponse, CVEvaluationResponse
-from ..services.pdf_service import PDFService
+from functools import lru_cache
+from typing import AsyncIterator
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from ..models.schemas import (
+    UploadResponse,
+    ErrorResponse,
+    CompiledProfile,
+    CVEvaluationResponse,
+    EvaluationCriteria,
+    MultiRoleResponse,
+    PassFailStatus,
+    PDFIngestionResult,
+    ProfileSummary,
+)
+from typing import Optional
+from ..services.pdf_pool import PDFExtractionPool
+from ..services.ocr_pool import OCRPool
 from ..services.evaluation_service import EvaluationService
+from ..services.cache_service import ResultCache
+from ..services.evaluation_store import EvaluationStore
+from ..services.near_duplicate_index import NearDuplicateIndex, POLICY_OFF
+from ..services.search_index import SearchIndex
+from ..services.prescreen_service import PrescreenService
+from ..services.profile_registry import ProfileRegistry
+from ..services.rate_limiter import RateLimitExceeded, retry_after_header
+from ..services.screening_pipeline import ScreeningPipeline
+from ..services.text_compactor import TextCompactor
+from ..services.upload_service import SpooledUpload, read_upload
 from ..config import get_settings, Settings
+from ..metrics import STAGE_DURATION
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/cv", tags=["CV Screening"])
 
 
+@lru_cache()
+def get_profile_registry() -> ProfileRegistry:
+    """
+    Dependency injection for the screening profiles.
+    Profiles are compiled once; the app calls this at startup so a bad
+    profiles file fails the deployment instead of the first request.
+    """
+    return ProfileRegistry.from_settings(get_settings())
+
+
+@lru_cache()
 def get_evaluation_service() -> EvaluationService:
-    """Dependency injection for evaluation service."""
-    return EvaluationService()
+    """
+    Dependency injection for evaluation service.
+    Uses lru_cache so every request, whatever its profile, shares one client and connection pool.
+    """
+    return EvaluationService(profiles=get_profile_registry())
+
+
+@lru_cache()
+def get_pdf_pool() -> PDFExtractionPool:
+    """
+    Dependency injection for the PDF extraction process pool.
+    One pool is shared by every request in this process.
+    """
+    settings = get_settings()
+    return PDFExtractionPool(
+        workers=settings.pdf_pool_workers,
+        max_tasks_per_child=settings.pdf_pool_max_tasks_per_child,
+        timeout_seconds=settings.pdf_parse_timeout_seconds,
+        backend=settings.pdf_extraction_backend,
+        fallback=settings.pdf_fallback_backend or None,
+        min_chars_per_page=settings.pdf_min_chars_per_page
+    )
+
+
+@lru_cache()
+def get_ocr_pool() -> Optional[OCRPool]:
+    """
+    Dependency injection for the OCR process pool.
+    Returns None when OCR is disabled in settings.
+    """
+    settings = get_settings()
+    if not settings.ocr_enabled:
+        return None
+    return OCRPool(
+        workers=settings.ocr_workers,
+        max_pages=settings.ocr_max_pages,
+        timeout_seconds=settings.ocr_timeout_seconds,
+        dpi=settings.ocr_dpi,
+        language=settings.ocr_language
+    )
+
+
+@lru_cache()
+def get_result_cache() -> Optional[ResultCache]:
+    """
+    Dependency injection for the result cache.
+    Returns None when caching is disabled in settings.
+    """
+    settings = get_settings()
+    if not settings.cache_enabled:
+        return None
+    return ResultCache(
+        max_entries=settings.cache_max_entries,
+        ttl_seconds=settings.cache_ttl_seconds,
+        sqlite_path=settings.cache_sqlite_path
+    )
+
+
+@lru_cache()
+def get_evaluation_store() -> Optional[EvaluationStore]:
+    """
+    Dependency injection for the evaluation history store.
+    Returns None when the store is disabled in settings.
+    """
+    settings = get_settings()
+    if not settings.store_enabled:
+        return None
+    return EvaluationStore(settings.store_sqlite_path)
+
+
+@lru_cache()
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """
+    Dependency injection for the near-duplicate index.
+    Returns None when it is off or there is no evaluation store to reuse results from.
+    Stored CVs missing from the index file are indexed when it is created.
+    """
+    settings = get_settings()
+    store = get_evaluation_store()
+    if settings.near_duplicate_policy == POLICY_OFF or store is None:
+        return None
+    index = NearDuplicateIndex(
+        path=settings.near_duplicate_index_path,
+        policy=settings.near_duplicate_policy,
+        threshold=settings.near_duplicate_threshold,
+        num_perm=settings.near_duplicate_num_perm,
+        bands=settings.near_duplicate_bands
+    )
+    index.sync(store.iter_texts(after_id=index.last_id))
+    return index
+
+
+@lru_cache()
+def get_search_index() -> Optional[SearchIndex]:
+    """
+    Dependency injection for the candidate search index.
+    Returns None when search or the evaluation store is disabled.
+    The store is indexed by a background thread started here.
+    """
+    settings = get_settings()
+    store = get_evaluation_store()
+    if not settings.search_enabled or store is None:
+        return None
+    index = SearchIndex(store, poll_interval_seconds=settings.search_poll_interval_seconds)
+    index.start()
+    return index
+
+
+@lru_cache()
+def get_prescreen_service() -> PrescreenService:
+    """
+    Dependency injection for the local prescreen.
+    The keyword automaton is compiled once per process.
+    """
+    return PrescreenService(policy=get_settings().prescreen_policy)
+
+
+@lru_cache()
+def get_text_compactor() -> Optional[TextCompactor]:
+    """
+    Dependency injection for the text compaction stage.
+    Returns None when compaction is disabled in settings.
+    """
+    settings = get_settings()
+    if not settings.compaction_enabled:
+        return None
+    return TextCompactor(token_budget=settings.compaction_token_budget)
+
+
+@lru_cache()
+def get_screening_pipeline() -> ScreeningPipeline:
+    """Dependency injection for the screening pipeline."""
+    return ScreeningPipeline(
+        pdf_pool=get_pdf_pool(),
+        ocr_pool=get_ocr_pool(),
+        evaluation_service=get_evaluation_service(),
+        cache=get_result_cache(),
+        prescreen=get_prescreen_service(),
+        compactor=get_text_compactor(),
+        store=get_evaluation_store(),
+        near_duplicates=get_near_duplicate_index()
+    )
+
+
+async def shutdown_dependencies() -> None:
+    """Release the shared clients, pools and caches created by the dependencies above."""
+    get_screening_pipeline.cache_clear()
+    
+    if get_evaluation_service.cache_info().currsize:
+        await get_evaluation_service().aclose()
+        get_evaluation_service.cache_clear()
+    
+    if get_pdf_pool.cache_info().currsize:
+        get_pdf_pool().shutdown()
+        get_pdf_pool.cache_clear()
+    
+    if get_ocr_pool.cache_info().currsize:
+        ocr_pool = get_ocr_pool()
+        if ocr_pool is not None:
+            ocr_pool.shutdown()
+        get_ocr_pool.cache_clear()
+    
+    if get_result_cache.cache_info().currsize:
+        cache = get_result_cache()
+        if cache is not None:
+            cache.close()
+        get_result_cache.cache_clear()
+    
+    if get_search_index.cache_info().currsize:
+        index = get_search_index()
+        if index is not None:
+            index.stop()
+        get_search_index.cache_clear()
+    
+    if get_evaluation_store.cache_info().currsize:
+        store = get_evaluation_store()
+        if store is not None:
+            store.close()
+        get_evaluation_store.cache_clear()
+    
+    get_near_duplicate_index.cache_clear()
+    
+    get_profile_registry.cache_clear()
+
+
+def _resolve_profile(registry: ProfileRegistry, name: Optional[str]) -> CompiledProfile:
+    """
+    Look up a requested screening profile, mapping unknown names to HTTP 400.
+    
+    Args:
+        registry: Screening profiles
+        name: Requested profile name; None or empty selects the default
+        
+    Returns:
+        Compiled profile
+    """
+    try:
+        return registry.get(name or None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post(
@@ -25,24 +261,30 @@ def get_evaluation_service() -> EvaluationService:
     response_model=UploadResponse,
     responses={
         400: {"model": ErrorResponse, "description": "Invalid file or processing error"},
-        500: {"model": ErrorResponse, "description": "Server error"}
+        429: {"model": ErrorResponse, "description": "Claude rate limit reached, retry after Retry-After seconds"},
+        500: {"model": ErrorResponse, "description": "Server error"},
+        503: {"model": ErrorResponse, "description": "Evaluation capacity exhausted, retry after Retry-After seconds"}
     },
     summary="Upload and Evaluate CV",
-    description="Upload a PDF CV file and receive a structured evaluation based on XBO.com hiring criteria."
+    description="Upload a PDF CV file and receive a structured evaluation against a screening profile's hiring criteria."
 )
 async def upload_and_evaluate_cv(
     file: UploadFile = File(..., description="PDF file containing the CV"),
+    profile: Optional[str] = Form(None, description="Screening profile; the default profile if omitted"),
     settings: Settings = Depends(get_settings),
-    evaluation_service: EvaluationService = Depends(get_evaluation_service)
+    pipeline: ScreeningPipeline = Depends(get_screening_pipeline),
+    profiles: ProfileRegistry = Depends(get_profile_registry)
 ) -> UploadResponse:
     """
     Upload a PDF CV and get an AI-powered evaluation.
     
-    The evaluation checks for:
+    The default profile checks for:
     - Education (High School Diploma or higher)
     - Fintech Experience (Finance/Crypto background)
     - Technical Skills (TypeScript/Python proficiency)
     
+    Other roles are screened by naming their profile (see `GET /api/cv/profiles`).
+    
     Returns a structured scorecard with pass/fail status and detailed reasoning.
     """
     # Validate file type
@@ -55,29 +297,16 @@ async def upload_and_evaluate_cv(
             detail="Invalid file type. Only PDF files are accepted."
         )
     
+    screening_profile = _resolve_profile(profiles, profile)
+    
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Validate file size
-        max_size_bytes = settings.max_file_size_mb * 1024 * 1024
-        if len(content) > max_size_bytes:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size is {settings.max_file_size_mb}MB."
-            )
-        
-        # Validate PDF
-        is_valid, error_msg = PDFService.validate_pdf(content)
-        if not is_valid:
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        # Extract text from PDF
-        logger.info(f"Processing CV: {file.filename}")
-        cv_text = PDFService.extract_text_from_bytes(content)
+        # Stream the upload to a spool, rejecting oversized or non-PDF files early
+        upload = await _read_upload(file, settings)
         
-        # Evaluate CV using AI
-        evaluation = evaluation_service.evaluate_cv(cv_text, file.filename)
+        with upload:
+            # Parse the PDF and evaluate it, reusing cached results where possible
+            logger.info(f"Processing CV: {file.filename}")
+            evaluation = await pipeline.run(upload, file.filename, screening_profile)
         
         return UploadResponse(
             success=True,
@@ -87,6 +316,90 @@ async def upload_and_evaluate_cv(
         
     except HTTPException:
         raise
+    except RateLimitExceeded as e:
+        logger.warning(f"Evaluation shed for {file.filename}: {e}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers=retry_after_header(e.retry_after)
+        )
+    except ValueError as e:
+        logger.error(f"Validation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error processing CV: {e}")
+        raise HTTPException(
+            status_code=500, 
+            detail="An unexpected error occurred while processing the CV"
+        )
+
+
+@router.post(
+    "/upload/multi",
+    response_model=MultiRoleResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid file, unknown profile or processing error"},
+        429: {"model": ErrorResponse, "description": "Claude rate limit reached, retry after Retry-After seconds"},
+        500: {"model": ErrorResponse, "description": "Server error"},
+        503: {"model": ErrorResponse, "description": "Evaluation capacity exhausted, retry after Retry-After seconds"}
+    },
+    summary="Upload and Evaluate CV Against Several Roles",
+    description="Upload a PDF CV once and receive an evaluation per screening profile, ranked by role fit."
+)
+async def upload_and_evaluate_cv_multi(
+    file: UploadFile = File(..., description="PDF file containing the CV"),
+    profiles: Optional[str] = Form(None, description="Comma-separated profile names; every profile if omitted"),
+    settings: Settings = Depends(get_settings),
+    pipeline: ScreeningPipeline = Depends(get_screening_pipeline),
+    registry: ProfileRegistry = Depends(get_profile_registry)
+) -> MultiRoleResponse:
+    """
+    Upload a PDF CV and find the roles it fits best.
+    
+    The PDF is parsed once and the CV text is sent once per model, with
+    every requested profile evaluated in the same Claude call.
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+        
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=400, 
+            detail="Invalid file type. Only PDF files are accepted."
+        )
+    
+    if profiles:
+        names = list(dict.fromkeys(name.strip() for name in profiles.split(",") if name.strip()))
+        screening_profiles = [_resolve_profile(registry, name) for name in names]
+    else:
+        screening_profiles = list(registry)
+    if not screening_profiles:
+        raise HTTPException(status_code=400, detail="No profiles selected")
+    
+    try:
+        upload = await _read_upload(file, settings)
+        
+        with upload:
+            logger.info(f"Processing CV: {file.filename} for {len(screening_profiles)} profiles")
+            fits = await pipeline.run_multi(upload, file.filename, screening_profiles)
+        
+        best_fit = next((fit.profile for fit in fits if fit.evaluation.status == PassFailStatus.PASS), None)
+        return MultiRoleResponse(
+            success=True,
+            message=f"CV evaluated against {len(fits)} profiles",
+            best_fit=best_fit,
+            fits=fits
+        )
+        
+    except HTTPException:
+        raise
+    except RateLimitExceeded as e:
+        logger.warning(f"Evaluation shed for {file.filename}: {e}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers=retry_after_header(e.retry_after)
+        )
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -98,6 +411,133 @@ async def upload_and_evaluate_cv(
         )
 
 
+@router.post(
+    "/upload/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "NDJSON progress events"},
+        400: {"model": ErrorResponse, "description": "Invalid file"}
+    },
+    summary="Upload and Evaluate CV (Streaming)",
+    description="Upload a PDF CV and receive newline-delimited JSON progress events, ending with the full evaluation."
+)
+async def upload_and_evaluate_cv_stream(
+    file: UploadFile = File(..., description="PDF file containing the CV"),
+    profile: Optional[str] = Form(None, description="Screening profile; the default profile if omitted"),
+    settings: Settings = Depends(get_settings),
+    pipeline: ScreeningPipeline = Depends(get_screening_pipeline),
+    profiles: ProfileRegistry = Depends(get_profile_registry)
+) -> StreamingResponse:
+    """
+    Upload a PDF CV and stream the evaluation as it happens.
+    
+    Each line is a JSON object with an `event` field:
+    - `upload_received`: filename and size
+    - `pdf_parsed`: page count
+    - `evaluation_started`
+      (both skipped when the PDF was already screened and is replayed from history)
+    - `criterion`: one completed criterion, as soon as Claude has written it
+    - `result`: the full CVEvaluationResponse (always last on success)
+    - `error`: detail and status_code if processing failed mid-stream
+      (plus retry_after when the evaluation was shed under load)
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+        
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=400, 
+            detail="Invalid file type. Only PDF files are accepted."
+        )
+    
+    screening_profile = _resolve_profile(profiles, profile)
+    upload = await _read_upload(file, settings)
+    
+    filename = file.filename
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield _ndjson_event("upload_received", filename=filename, size_bytes=upload.size)
+            
+            async for item in pipeline.run_stream(upload, filename, screening_profile):
+                if isinstance(item, PDFIngestionResult):
+                    yield _ndjson_event("pdf_parsed", page_count=item.page_count)
+                    yield _ndjson_event("evaluation_started")
+                elif isinstance(item, EvaluationCriteria):
+                    yield _ndjson_event("criterion", criterion=item.model_dump(mode="json"))
+                else:
+                    yield _ndjson_event("result", evaluation=item.model_dump(mode="json"))
+                    
+        except RateLimitExceeded as e:
+            logger.warning(f"Evaluation shed for {filename}: {e}")
+            yield _ndjson_event(
+                "error",
+                status_code=e.status_code,
+                detail=str(e),
+                retry_after=round(e.retry_after, 1)
+            )
+        except ValueError as e:
+            logger.error(f"Validation error: {e}")
+            yield _ndjson_event("error", status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Unexpected error processing CV: {e}")
+            yield _ndjson_event(
+                "error",
+                status_code=500,
+                detail="An unexpected error occurred while processing the CV"
+            )
+    
+    return _UploadStreamingResponse(events(), upload, media_type="application/x-ndjson")
+
+
+async def _read_upload(file: UploadFile, settings: Settings) -> SpooledUpload:
+    """
+    Stream an upload into a spool, mapping validation failures to HTTP 400.
+    
+    Args:
+        file: Uploaded file
+        settings: Application settings
+        
+    Returns:
+        Spooled upload (caller must close it)
+    """
+    try:
+        with STAGE_DURATION.time_outcome(stage="upload_read"):
+            return await read_upload(
+                file,
+                max_bytes=settings.max_file_size_mb * 1024 * 1024,
+                chunk_size=settings.upload_chunk_size_kb * 1024,
+                max_memory_bytes=settings.upload_spool_max_memory_mb * 1024 * 1024
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class _UploadStreamingResponse(StreamingResponse):
+    """
+    Streaming response that releases the request's spooled upload once it is over.
+    
+    The release wraps the whole response rather than the body generator:
+    if sending the response start fails or is cancelled, the generator never
+    starts and its cleanup would never run.
+    """
+    
+    def __init__(self, content: AsyncIterator[str], upload: SpooledUpload, **kwargs):
+        super().__init__(content, **kwargs)
+        self.upload = upload
+    
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.upload.close()
+
+
+def _ndjson_event(event: str, **data) -> str:
+    """Serialize one streaming progress event as an NDJSON line."""
+    return json.dumps({"event": event, **data}) + "\n"
+
+
 @router.get(
     "/health",
     summary="Health Check",
@@ -116,3 +556,125 @@ async def health_check(
         "service": "CV Screening Agent",
         "ai_configured": api_configured
     }
+
+
+@router.get(
+    "/usage",
+    summary="Token Usage",
+    description="Accumulated Claude token usage, including prompt cache reads and writes."
+)
+async def token_usage(
+    evaluation_service: EvaluationService = Depends(get_evaluation_service)
+) -> dict:
+    """
+    Report token usage since startup.
+    """
+    return evaluation_service.usage_stats()
+
+
+@router.get(
+    "/profiles",
+    response_model=list[ProfileSummary],
+    summary="Screening Profiles",
+    description="Roles this service screens for, with their criteria, thresholds and model."
+)
+async def list_profiles(
+    profiles: ProfileRegistry = Depends(get_profile_registry)
+) -> list[ProfileSummary]:
+    """
+    List the configured screening profiles.
+    """
+    return profiles.summaries()
+
+
+@router.get(
+    "/prescreen/stats",
+    summary="Prescreen Statistics",
+    description="How many CVs the local keyword prescreen skipped (or would skip) before calling Claude."
+)
+async def prescreen_stats(
+    prescreen: PrescreenService = Depends(get_prescreen_service)
+) -> dict:
+    """
+    Report prescreen decision counts.
+    """
+    return prescreen.stats()
+
+
+@router.get(
+    "/pdf/stats",
+    summary="PDF Extraction Statistics",
+    description="Documents per text extraction backend and how often the fast backend fell back to pdfplumber."
+)
+async def pdf_stats(
+    pdf_pool: PDFExtractionPool = Depends(get_pdf_pool)
+) -> dict:
+    """
+    Report PDF extraction backend usage.
+    """
+    return pdf_pool.stats()
+
+
+@router.get(
+    "/ocr/stats",
+    summary="OCR Statistics",
+    description="Scanned PDFs and pages without a text layer read by OCR, per outcome."
+)
+async def ocr_stats(
+    ocr_pool: Optional[OCRPool] = Depends(get_ocr_pool)
+) -> dict:
+    """
+    Report OCR usage.
+    """
+    if ocr_pool is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **ocr_pool.stats()}
+
+
+@router.get(
+    "/coalescing/stats",
+    summary="Request Coalescing Statistics",
+    description="Uploads, PDF parses and evaluations that joined identical work already in flight."
+)
+async def coalescing_stats(
+    pipeline: ScreeningPipeline = Depends(get_screening_pipeline)
+) -> dict:
+    """
+    Report coalesced call counts per stage.
+    """
+    return pipeline.coalescing_stats()
+
+
+@router.get(
+    "/near-duplicates/stats",
+    summary="Near-Duplicate Statistics",
+    description="CVs whose text nearly matched a stored evaluation, flagged or answered with that evaluation."
+)
+async def near_duplicate_stats(
+    index: Optional[NearDuplicateIndex] = Depends(get_near_duplicate_index)
+) -> dict:
+    """
+    Report near-duplicate index size and lookup outcomes.
+    """
+    if index is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **index.stats()}
+
+
+@router.get(
+    "/cache/stats",
+    summary="Cache Statistics",
+    description="Hit and miss counters for the ingestion and evaluation caches."
+)
+async def cache_stats(
+    cache: Optional[ResultCache] = Depends(get_result_cache)
+) -> dict:
+    """
+    Report result cache counters.
+    """
+    if cache is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **cache.stats()}
@@ -0,0 +1,207 @@
+"""
+Evaluation History Router.
+Lists and looks up previously screened CVs without reprocessing them.
+"""
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from ..models.schemas import (
+    ErrorResponse,
+    EvaluationPage,
+    PassFailStatus,
+    SearchHit,
+    SearchResponse,
+    StoredEvaluation,
+)
+from ..services.evaluation_store import EvaluationStore, MAX_PAGE_SIZE, SORT_NEWEST
+from ..services.search_index import SearchIndex, MAX_RESULTS
+from .cv_router import get_evaluation_store, get_search_index
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/cv", tags=["Evaluation History"])
+
+
+def _require_store(store: Optional[EvaluationStore]) -> EvaluationStore:
+    """Fail with 404 when the evaluation store is disabled."""
+    if store is None:
+        raise HTTPException(status_code=404, detail="Evaluation history is disabled")
+    return store
+
+
+@router.get(
+    "/evaluations",
+    response_model=EvaluationPage,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid sort order or cursor"}
+    },
+    summary="List Past Evaluations",
+    description="Page through stored evaluations, newest or highest-scoring first, with optional filters."
+)
+async def list_evaluations(
+    status: Optional[PassFailStatus] = Query(None, description="Only pass or only fail"),
+    min_score: Optional[int] = Query(None, ge=0, le=100, description="Minimum match score"),
+    max_score: Optional[int] = Query(None, ge=0, le=100, description="Maximum match score"),
+    candidate_name: Optional[str] = Query(None, description="Candidate name prefix (case-insensitive)"),
+    created_after: Optional[datetime] = Query(None, description="Only evaluations at or after this time (UTC unless an offset is given)"),
+    created_before: Optional[datetime] = Query(None, description="Only evaluations before this time (UTC unless an offset is given)"),
+    profile: Optional[str] = Query(None, description="Only evaluations against this screening profile"),
+    sort: str = Query(SORT_NEWEST, description="Sort order: newest or score"),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="`next_cursor` from the previous page"),
+    store: Optional[EvaluationStore] = Depends(get_evaluation_store)
+) -> EvaluationPage:
+    """
+    List stored evaluations with cursor pagination.
+    """
+    store = _require_store(store)
+    try:
+        return await asyncio.to_thread(
+            store.list,
+            status=status,
+            min_score=min_score,
+            max_score=max_score,
+            candidate_name=candidate_name,
+            created_after=created_after,
+            created_before=created_before,
+            profile=profile,
+            sort=sort,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/evaluations/stats",
+    summary="Evaluation History Statistics",
+    description="Number of stored evaluations per status."
+)
+async def evaluation_stats(
+    store: Optional[EvaluationStore] = Depends(get_evaluation_store)
+) -> dict:
+    """
+    Report stored evaluation counts.
+    """
+    if store is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **await asyncio.to_thread(store.stats)}
+
+
+@router.get(
+    "/evaluations/search",
+    response_model=SearchResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Query has no searchable terms"},
+        404: {"model": ErrorResponse, "description": "Search is disabled"}
+    },
+    summary="Search Past Evaluations",
+    description=(
+        "Rank stored evaluations by BM25 relevance of the CV text, reasoning and "
+        "criterion details to a free-text query, with optional status and score filters."
+    )
+)
+async def search_evaluations(
+    q: str = Query(..., min_length=1, description="Search terms, e.g. `python kubernetes banking`"),
+    status: Optional[PassFailStatus] = Query(None, description="Only pass or only fail"),
+    min_score: Optional[int] = Query(None, ge=0, le=100, description="Minimum match score"),
+    max_score: Optional[int] = Query(None, ge=0, le=100, description="Maximum match score"),
+    limit: int = Query(10, ge=1, le=MAX_RESULTS, description="Number of results"),
+    index: Optional[SearchIndex] = Depends(get_search_index),
+    store: Optional[EvaluationStore] = Depends(get_evaluation_store)
+) -> SearchResponse:
+    """
+    Return the top stored evaluations for a query.
+    """
+    if index is None or store is None:
+        raise HTTPException(status_code=404, detail="Evaluation search is disabled")
+    try:
+        ranked = await asyncio.to_thread(
+            index.search,
+            q,
+            limit=limit,
+            status=status,
+            min_score=min_score,
+            max_score=max_score
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    records = await asyncio.to_thread(store.get_many, [evaluation_id for evaluation_id, _ in ranked])
+    return SearchResponse(
+        query=q,
+        hits=[
+            SearchHit(score=score, evaluation=records[evaluation_id])
+            for evaluation_id, score in ranked
+            if evaluation_id in records
+        ],
+        indexed=index.stats()["indexed"]
+    )
+
+
+@router.get(
+    "/evaluations/search/stats",
+    summary="Evaluation Search Statistics",
+    description="Size of the search index and searches served."
+)
+async def search_stats(
+    index: Optional[SearchIndex] = Depends(get_search_index)
+) -> dict:
+    """
+    Report search index size and progress.
+    """
+    if index is None:
+        return {"enabled": False}
+    
+    return {"enabled": True, **index.stats()}
+
+
+@router.get(
+    "/evaluations/by-hash/{file_hash}",
+    response_model=StoredEvaluation,
+    responses={
+        404: {"model": ErrorResponse, "description": "PDF was never screened"}
+    },
+    summary="Find Evaluation by File Hash",
+    description="Latest evaluation of a PDF, identified by the SHA-256 of its bytes."
+)
+async def get_evaluation_by_hash(
+    file_hash: str,
+    store: Optional[EvaluationStore] = Depends(get_evaluation_store)
+) -> StoredEvaluation:
+    """
+    Look up a previously screened PDF by content hash.
+    """
+    store = _require_store(store)
+    record = await asyncio.to_thread(store.find_by_hash, file_hash.lower())
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"No evaluation for file hash: {file_hash}")
+    return record
+
+
+@router.get(
+    "/evaluations/{evaluation_id}",
+    response_model=StoredEvaluation,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown evaluation"}
+    },
+    summary="Get Evaluation",
+    description="A single stored evaluation by ID."
+)
+async def get_evaluation(
+    evaluation_id: int,
+    store: Optional[EvaluationStore] = Depends(get_evaluation_store)
+) -> StoredEvaluation:
+    """
+    Return one stored evaluation.
+    """
+    store = _require_store(store)
+    record = await asyncio.to_thread(store.get, evaluation_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Evaluation not found: {evaluation_id}")
+    return record
@@ -0,0 +1,176 @@
+"""
+Asynchronous Job Router.
+Accepts CVs for background screening and serves their results by job ID.
+"""
+
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query
+from ..models.schemas import JobResponse, ErrorResponse
+from ..services.job_queue import JobQueue, create_job_queue
+from ..services.job_worker import JobWorker
+from ..services.profile_registry import ProfileRegistry
+from ..config import get_settings, Settings
+from .cv_router import _read_upload, _resolve_profile, get_profile_registry, get_screening_pipeline
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/cv", tags=["Async Jobs"])
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """
+    Dependency injection for the job queue.
+    The SQLite backend can be shared with separate worker processes.
+    """
+    settings = get_settings()
+    return create_job_queue(
+        backend=settings.job_queue_backend,
+        sqlite_path=settings.job_queue_sqlite_path,
+        max_attempts=settings.job_max_attempts,
+        result_ttl_seconds=settings.job_result_ttl_seconds
+    )
+
+
+def create_job_worker(concurrency: int) -> JobWorker:
+    """
+    Build a worker over the shared queue and screening pipeline.
+    
+    Args:
+        concurrency: Jobs processed at the same time
+    
+    Returns:
+        Worker, not yet started
+    """
+    settings = get_settings()
+    return JobWorker(
+        queue=get_job_queue(),
+        pipeline=get_screening_pipeline(),
+        concurrency=concurrency,
+        poll_interval_seconds=settings.job_poll_interval_seconds,
+        lease_seconds=settings.job_lease_seconds,
+        retry_delay_seconds=settings.job_retry_delay_seconds
+    )
+
+
+_in_process_worker: Optional[JobWorker] = None
+
+
+def start_job_workers() -> None:
+    """Start in-process job workers, unless they are configured to run separately."""
+    global _in_process_worker
+    settings = get_settings()
+    if settings.job_workers <= 0:
+        return
+    _in_process_worker = create_job_worker(settings.job_workers)
+    _in_process_worker.start()
+
+
+async def shutdown_job_workers() -> None:
+    """Stop in-process job workers and close the queue."""
+    global _in_process_worker
+    if _in_process_worker is not None:
+        await _in_process_worker.stop()
+        _in_process_worker = None
+    
+    if get_job_queue.cache_info().currsize:
+        get_job_queue().close()
+        get_job_queue.cache_clear()
+
+
+@router.post(
+    "/jobs",
+    response_model=JobResponse,
+    status_code=202,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid file"}
+    },
+    summary="Submit CV for Background Evaluation",
+    description="Queue a PDF CV for evaluation and return a job ID immediately; poll the job for the result."
+)
+async def submit_job(
+    file: UploadFile = File(..., description="PDF file containing the CV"),
+    priority: int = Form(0, description="Higher priority jobs are evaluated first"),
+    profile: Optional[str] = Form(None, description="Screening profile; the default profile if omitted"),
+    settings: Settings = Depends(get_settings),
+    queue: JobQueue = Depends(get_job_queue),
+    profiles: ProfileRegistry = Depends(get_profile_registry)
+) -> JobResponse:
+    """
+    Queue a CV for evaluation by a worker.
+    
+    The PDF is validated for type and size up front; parsing and evaluation
+    happen in the worker, so failures there are reported on the job.
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+    
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Only PDF files are accepted."
+        )
+    
+    screening_profile = _resolve_profile(profiles, profile)
+    upload = await _read_upload(file, settings)
+    with upload:
+        pdf = upload.read_bytes()
+    
+    job = await asyncio.to_thread(queue.enqueue, pdf, file.filename, priority, screening_profile.name)
+    logger.info(
+        f"Queued job {job.job_id} for {file.filename} "
+        f"(profile {screening_profile.name}, priority {priority})"
+    )
+    return job
+
+
+@router.get(
+    "/jobs/stats",
+    summary="Job Queue Statistics",
+    description="Number of jobs per status in the job queue."
+)
+async def job_stats(
+    queue: JobQueue = Depends(get_job_queue)
+) -> dict:
+    """
+    Report job counts per status.
+    """
+    return await asyncio.to_thread(queue.stats)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobResponse,
+    responses={
+        404: {"model": ErrorResponse, "description": "Unknown job"}
+    },
+    summary="Get Job Status",
+    description="Current job state, with the evaluation once finished. Set `wait` to long-poll until the job finishes."
+)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, description="Seconds to wait for the job to finish before responding"),
+    settings: Settings = Depends(get_settings),
+    queue: JobQueue = Depends(get_job_queue)
+) -> JobResponse:
+    """
+    Return a job, optionally holding the request until it finishes.
+    
+    The wait is capped by the configured long-poll limit; the current state
+    is returned when it runs out, and clients simply poll again.
+    """
+    deadline = time.monotonic() + min(wait, settings.job_long_poll_max_seconds)
+    
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+        
+        remaining = deadline - time.monotonic()
+        if job.is_finished or remaining <= 0:
+            return job
+        await asyncio.sleep(min(settings.job_poll_interval_seconds, remaining))
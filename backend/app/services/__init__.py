@@ -1,5 +1,14 @@
 # Services package
 from .pdf_service import PDFService
+from .pdf_pool import PDFExtractionPool
 from .evaluation_service import EvaluationService
+from .cache_service import ResultCache
+from .screening_pipeline import ScreeningPipeline
 
-__all__ = ["PDFService", "EvaluationService"]
+__all__ = [
+    "PDFService",
+    "PDFExtractionPool",
+    "EvaluationService",
+    "ResultCache",
+    "ScreeningPipeline",
+]
@@ -0,0 +1,181 @@
+"""
+Result Cache Service.
+Content-addressed cache for PDF ingestion and CV evaluation results.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Optional
+from ..metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Two-tier cache of serialized results.
+    
+    The first tier is an in-memory LRU with a TTL. The optional second tier
+    is a SQLite file that survives restarts; disk hits are promoted back into
+    memory. Values are stored as strings (JSON) so both tiers hold the same data.
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        sqlite_path: Optional[str] = None
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum entries held in memory before evicting the LRU one
+            ttl_seconds: Lifetime of an entry in both tiers
+            sqlite_path: Path of the on-disk tier; None keeps the cache memory-only
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: Counter[str] = Counter()
+        self._db: Optional[sqlite3.Connection] = None
+        
+        if sqlite_path:
+            self._db = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+    
+    @property
+    def persistent(self) -> bool:
+        """Whether lookups and writes may touch the on-disk tier (and so block)."""
+        return self._db is not None
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a cache key from its components.
+        
+        Args:
+            parts: Key components, e.g. content hash, model and prompt version
+            
+        Returns:
+            Hex SHA-256 digest of the joined parts
+        """
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        """
+        Look up a value, checking memory first and then disk.
+        
+        Args:
+            namespace: Logical cache name, e.g. "ingestion" or "evaluation"
+            key: Key built with `make_key`
+            
+        Returns:
+            Cached value, or None on a miss or expired entry
+        """
+        full_key = f"{namespace}:{key}"
+        now = time.time()
+        
+        with self._lock:
+            entry = self._memory.get(full_key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(full_key)
+                    self._counters[f"{namespace}.memory_hits"] += 1
+                    CACHE_LOOKUPS.inc(namespace=namespace, result="memory_hit")
+                    return value
+                del self._memory[full_key]
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache_entries WHERE key = ?",
+                    (full_key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._remember(full_key, row[0], row[1])
+                    self._counters[f"{namespace}.disk_hits"] += 1
+                    CACHE_LOOKUPS.inc(namespace=namespace, result="disk_hit")
+                    return row[0]
+            
+            self._counters[f"{namespace}.misses"] += 1
+            CACHE_LOOKUPS.inc(namespace=namespace, result="miss")
+            return None
+    
+    def set(self, namespace: str, key: str, value: str) -> None:
+        """
+        Store a value in every configured tier.
+        
+        Args:
+            namespace: Logical cache name
+            key: Key built with `make_key`
+            value: Serialized result
+        """
+        full_key = f"{namespace}:{key}"
+        expires_at = time.time() + self.ttl_seconds
+        
+        with self._lock:
+            self._remember(full_key, value, expires_at)
+            self._counters[f"{namespace}.writes"] += 1
+            
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+                        "VALUES (?, ?, ?)",
+                        (full_key, value, expires_at)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to write cache entry to disk: {e}")
+    
+    def stats(self) -> dict:
+        """
+        Report hit/miss counters per namespace.
+        
+        Returns:
+            Dict of namespace -> counters (with hit_rate) plus memory usage
+        """
+        with self._lock:
+            namespaces: dict[str, dict] = {}
+            for name, count in self._counters.items():
+                namespace, counter = name.rsplit(".", 1)
+                namespaces.setdefault(namespace, {})[counter] = count
+            memory_entries = len(self._memory)
+        
+        for counters in namespaces.values():
+            hits = counters.get("memory_hits", 0) + counters.get("disk_hits", 0)
+            lookups = hits + counters.get("misses", 0)
+            counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+        
+        return {
+            "memory_entries": memory_entries,
+            "disk_enabled": self._db is not None,
+            "namespaces": namespaces
+        }
+    
+    def close(self) -> None:
+        """Close the on-disk tier, purging expired rows first."""
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+                self._db.close()
+                self._db = None
+    
+    def _remember(self, full_key: str, value: str, expires_at: float) -> None:
+        """Insert into the memory tier, evicting least-recently-used entries."""
+        self._memory[full_key] = (expires_at, value)
+        self._memory.move_to_end(full_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
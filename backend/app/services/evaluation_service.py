@@ -3,94 +3,779 @@ CV Evaluation Service.
 Handles the AI-powered evaluation of CV content using Claude.
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional
-from anthropic import Anthropic
+import time
+from collections import Counter, OrderedDict, defaultdict
+from typing import AsyncIterator, Optional, Union
+from anthropic import Anthropic, AsyncAnthropic, NotFoundError
+from anthropic.types import Message
+from anthropic.types.messages import MessageBatch
+from pydantic import ValidationError
+from .incremental_json import IncrementalJSONParser
+from .profile_registry import ProfileRegistry, prompt_version
+from .rate_limiter import AnthropicScheduler, RateLimitExceeded
+from .text_compactor import estimate_tokens
 from ..config import get_settings
-from ..models.schemas import CVEvaluationResponse, EvaluationCriteria, PassFailStatus
+from ..metrics import (
+    CASCADE_DECISIONS,
+    CASCADE_DURATION,
+    CLAUDE_DURATION,
+    CLAUDE_INPUT_TOKENS,
+    CLAUDE_TOKENS,
+    EVALUATION_OUTPUTS,
+    STAGE_DURATION,
+)
+from ..models.schemas import CompiledProfile, CVEvaluationResponse, EvaluationCriteria, PassFailStatus
 
 logger = logging.getLogger(__name__)
 
-# System prompt for CV evaluation
-CV_EVALUATION_SYSTEM_PROMPT = """You are an expert HR screening agent for XBO.com, a fintech company. 
-Your task is to evaluate CV/resume content and provide a structured assessment.
-
-You MUST evaluate candidates based on these THREE criteria:
-
-1. **Education**: Does the candidate have at least a High School Diploma (or equivalent/higher)?
-   - Look for: High School, GED, Associate's, Bachelor's, Master's, PhD, or equivalent certifications
-   
-2. **Fintech Fit**: Does the candidate have relevant experience in Finance, Banking, Cryptocurrency, or Fintech?
-   - Look for: Experience at financial institutions, crypto exchanges, trading platforms, payment companies
-   - Also consider: Blockchain experience, DeFi, traditional finance roles
-   
-3. **Technical Skills**: Does the candidate have proficiency in TypeScript OR Python?
-   - Look for: Direct mentions of TypeScript, Python, JavaScript (close to TypeScript), or related frameworks
-   - Consider: React, Node.js, FastAPI, Django, Flask as indicators of these skills
-
-SCORING GUIDELINES:
-- Each criterion is worth roughly 33 points
-- Bonus points for exceptional qualifications
-- Score 0-100 overall
-
-PASS/FAIL LOGIC:
-- PASS: Score >= 60 AND at least 2 out of 3 criteria are met
-- FAIL: Score < 60 OR fewer than 2 criteria met
-
-You MUST respond with ONLY valid JSON in this exact format:
-{
-    "status": "pass" or "fail",
-    "match_score": <number 0-100>,
-    "reasoning": "<detailed paragraph explaining your evaluation>",
-    "criteria": [
-        {
-            "name": "Education",
-            "passed": true/false,
-            "details": "<specific details found or reason for failure>"
-        },
-        {
-            "name": "Fintech Experience",
-            "passed": true/false,
-            "details": "<specific details found or reason for failure>"
-        },
-        {
-            "name": "Technical Skills",
-            "passed": true/false,
-            "details": "<specific skills found or reason for failure>"
-        }
-    ],
-    "candidate_name": "<extracted name or null if not found>"
-}
+# Output modes: free-text JSON parsed from the reply, or a forced tool call
+EVALUATION_MODE_JSON = "json"
+EVALUATION_MODE_TOOL = "tool"
+EVALUATION_TOOL_NAME = "record_cv_evaluation"
+
+# Marks the model key of results from a combined multi-profile call, whose
+# prompt differs from each profile's own
+COMBINED_MODEL_SUFFIX = "+combined"
+
+# Message Batches whose token usage was already counted, remembered so that
+# fetching the results again does not count it twice
+ACCOUNTED_BATCHES_LIMIT = 1024
+
+# A multi-profile result with the model key and prompt version that produced it
+LabelledEvaluation = tuple[CVEvaluationResponse, str, str]
+
+
+def build_evaluation_tool() -> dict:
+    """
+    Build the tool definition whose input schema is the evaluation response model.
+    
+    Returns:
+        Tool definition for the Messages API
+    """
+    schema = CVEvaluationResponse.model_json_schema()
+    definitions = schema.pop("$defs", {})
+    # Set by the screening pipeline, never by Claude
+    schema["properties"].pop("near_duplicate_of")
+    
+    def inline(node):
+        if isinstance(node, dict):
+            resolved = {key: inline(value) for key, value in node.items() if key not in ("$ref", "example")}
+            if "$ref" in node:
+                return {**inline(definitions[node["$ref"].rsplit("/", 1)[-1]]), **resolved}
+            return resolved
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        return node
+    
+    return {
+        "name": EVALUATION_TOOL_NAME,
+        "description": "Record the structured evaluation of the CV.",
+        "input_schema": inline(schema),
+    }
+
 
-Be fair but thorough. If information is missing or unclear, note it in your evaluation."""
+CV_EVALUATION_TOOL = build_evaluation_tool()
+
+# Tool for multi-role calls: one evaluation per profile, keyed by profile name
+MULTI_EVALUATION_TOOL_NAME = "record_cv_evaluations"
+
+
+def build_multi_evaluation_tool(profile_names: list[str]) -> dict:
+    """
+    Build the tool definition for evaluating one CV against several profiles.
+    
+    Args:
+        profile_names: Profiles that must each get an evaluation
+        
+    Returns:
+        Tool definition for the Messages API
+    """
+    evaluation_schema = CV_EVALUATION_TOOL["input_schema"]
+    return {
+        "name": MULTI_EVALUATION_TOOL_NAME,
+        "description": "Record one structured evaluation of the CV per role.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "evaluations": {
+                    "type": "object",
+                    "properties": {name: evaluation_schema for name in profile_names},
+                    "required": list(profile_names),
+                }
+            },
+            "required": ["evaluations"],
+        },
+    }
 
 
 class EvaluationService:
-    """Service for evaluating CV content using Claude AI."""
+    """
+    Service for evaluating CV content using Claude AI.
+    
+    A single instance is shared per process (see `get_evaluation_service`),
+    so the Anthropic clients and their HTTP connection pools are reused
+    across requests instead of being rebuilt for every upload.
+    
+    Async calls go through an `AnthropicScheduler`, which owns rate limiting
+    and retries, so the async client itself is configured not to retry.
+    
+    In "tool" evaluation mode Claude is forced to call a tool whose input
+    schema is `CVEvaluationResponse`; the tool input is validated directly,
+    and a failed validation gets one repair call with the errors attached.
+    
+    Each call is made for a screening profile from the `ProfileRegistry`,
+    which supplies the precompiled system prompt and model; every profile
+    shares the same clients and scheduler.
+    
+    With the model cascade enabled, `evaluate_cv_async` first asks the
+    cheaper screening model and only escalates to the profile's model when
+    the result is borderline, internally inconsistent or unusable.
+    """
     
-    def __init__(self):
-        """Initialize the evaluation service with Anthropic client."""
+    def __init__(self, profiles: Optional[ProfileRegistry] = None):
+        """
+        Initialize the evaluation service with sync and async Anthropic clients.
+        
+        Args:
+            profiles: Screening profiles; built from settings when omitted
+        """
         self.settings = get_settings()
-        self.client = Anthropic(api_key=self.settings.anthropic_api_key)
+        self.profiles = profiles or ProfileRegistry.from_settings(self.settings)
+        self.client = Anthropic(
+            api_key=self.settings.anthropic_api_key,
+            base_url=self.settings.anthropic_base_url,
+            timeout=self.settings.anthropic_timeout_seconds,
+            max_retries=self.settings.anthropic_max_retries
+        )
+        self.async_client = AsyncAnthropic(
+            api_key=self.settings.anthropic_api_key,
+            base_url=self.settings.anthropic_base_url,
+            timeout=self.settings.anthropic_timeout_seconds,
+            max_retries=0
+        )
+        self.scheduler = AnthropicScheduler(
+            requests_per_minute=self.settings.anthropic_requests_per_minute,
+            input_tokens_per_minute=self.settings.anthropic_input_tokens_per_minute,
+            max_concurrency=self.settings.anthropic_max_concurrency,
+            max_retries=self.settings.anthropic_max_retries,
+            retry_base_seconds=self.settings.anthropic_retry_base_seconds,
+            retry_max_seconds=self.settings.anthropic_retry_max_seconds,
+            max_queue_wait_seconds=self.settings.anthropic_max_queue_wait_seconds
+        )
+        self.usage: Counter[str] = Counter()
+        self.usage_by_model: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        self.cascade: Counter[str] = Counter()
+        self._accounted_batches: OrderedDict[str, None] = OrderedDict()
+        
+    def evaluate_cv(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> CVEvaluationResponse:
+        """
+        Evaluate CV content using Claude AI (blocking).
+        
+        Prefer `evaluate_cv_async` inside request handlers; this variant
+        blocks the calling thread for the whole API round-trip.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile; defaults to the registry's default profile
+            
+        Returns:
+            Structured evaluation response
+            
+        Raises:
+            ValueError: If evaluation fails
+        """
+        try:
+            logger.info(f"Sending CV for evaluation: {filename}")
+            request = self._build_request(cv_text, filename, profile)
+            
+            # Call Claude API
+            with CLAUDE_DURATION.time_outcome(model=request["model"]):
+                response = self.client.messages.create(**request)
+            self._record_usage(response.usage, filename, request["model"])
+            
+            return self._evaluation_from_message(response)
+            
+        except Exception as e:
+            raise self._evaluation_error(e)
+    
+    async def evaluate_cv_async(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> CVEvaluationResponse:
+        """
+        Evaluate CV content using Claude AI without blocking the event loop.
+        
+        Concurrent callers share the pooled `AsyncAnthropic` client, so their
+        network waits overlap instead of being handled one after another.
+        The call waits for rate-limit budget and is retried on transient errors.
+        With the cascade enabled, the screening model answers first.
         
-    def evaluate_cv(self, cv_text: str, filename: str) -> CVEvaluationResponse:
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile; defaults to the registry's default profile
+            
+        Returns:
+            Structured evaluation response
+            
+        Raises:
+            RateLimitExceeded: If the call is shed under load
+            ValueError: If evaluation fails
         """
-        Evaluate CV content using Claude AI.
+        profile = profile or self.profiles.default
+        if self._cascades(profile):
+            return await self._evaluate_cascade(cv_text, filename, profile)
+        return await self._evaluate_once(cv_text, filename, profile)
+    
+    async def _evaluate_once(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: CompiledProfile,
+        model: Optional[str] = None
+    ) -> CVEvaluationResponse:
+        """
+        Evaluate CV content with one model (plus a repair call in tool mode).
         
         Args:
             cv_text: Extracted text content from the CV
             filename: Original filename for context
+            profile: Screening profile
+            model: Model to ask instead of the profile's model
             
         Returns:
             Structured evaluation response
             
         Raises:
+            RateLimitExceeded: If the call is shed under load
             ValueError: If evaluation fails
         """
         try:
-            # Prepare the user message
-            user_message = f"""Please evaluate the following CV/Resume:
+            logger.info(f"Sending CV for evaluation: {filename}")
+            request = self._build_request(cv_text, filename, profile, model)
+            
+            # Call Claude API
+            estimated_tokens = self._estimate_request_tokens(request)
+            response = await self.scheduler.run(
+                lambda: self._create_message(request),
+                estimated_tokens=estimated_tokens
+            )
+            self._record_usage(response.usage, filename, request["model"])
+            
+            return await self._validated_evaluation(response, request, estimated_tokens, filename)
+            
+        except Exception as e:
+            raise self._evaluation_error(e)
+    
+    async def _evaluate_cascade(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: CompiledProfile
+    ) -> CVEvaluationResponse:
+        """
+        Screen with the cheap model, escalating to the profile's model when needed.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile whose model is the escalation tier
+            
+        Returns:
+            The screening result if it is clear-cut, else the escalated result
+            
+        Raises:
+            RateLimitExceeded: If a call is shed under load
+            ValueError: If the escalated evaluation fails
+        """
+        screening_model = self.settings.cascade_screening_model
+        started = time.perf_counter()
+        try:
+            evaluation = await self._evaluate_once(cv_text, filename, profile, screening_model)
+        except ValueError as e:
+            self._record_tier("screening", started, "error")
+            logger.warning(f"Screening model failed on {filename}: {e}")
+            reason = "failed"
+        else:
+            self._record_tier("screening", started, "success")
+            reason = self._escalation_reason(evaluation, profile)
+            if reason is None:
+                self._record_cascade("accepted")
+                return evaluation
+        
+        self._record_cascade(reason)
+        logger.info(f"Escalating {filename} to {profile.model} ({reason})")
+        started = time.perf_counter()
+        try:
+            evaluation = await self._evaluate_once(cv_text, filename, profile)
+        except Exception:
+            self._record_tier("escalation", started, "error")
+            raise
+        self._record_tier("escalation", started, "success")
+        return evaluation
+    
+    def _cascades(self, profile: CompiledProfile) -> bool:
+        """Whether a profile's evaluations go through the screening model first."""
+        return (
+            self.settings.cascade_enabled
+            and self.settings.cascade_screening_model != profile.model
+        )
+    
+    def _escalation_reason(self, evaluation: CVEvaluationResponse, profile: CompiledProfile) -> Optional[str]:
+        """
+        Decide whether a screening-model result needs the stronger model.
+        
+        Args:
+            evaluation: Result of the screening model
+            profile: Profile whose pass score and minimum criteria apply
+            
+        Returns:
+            "borderline" if the score is within the margin of the pass score,
+            "inconsistent" if the status contradicts the score and criteria,
+            None if the result can be used as is
+        """
+        definition = profile.definition
+        if abs(evaluation.match_score - definition.pass_score) <= self.settings.cascade_score_margin:
+            return "borderline"
+        
+        criteria_met = sum(1 for criterion in evaluation.criteria if criterion.passed)
+        expected_pass = (
+            evaluation.match_score >= definition.pass_score
+            and criteria_met >= definition.min_criteria
+        )
+        if expected_pass != (evaluation.status == PassFailStatus.PASS):
+            return "inconsistent"
+        if len(evaluation.criteria) != len(definition.criteria):
+            return "inconsistent"
+        return None
+    
+    def model_key(self, profile: Optional[CompiledProfile] = None) -> str:
+        """
+        Name the model(s) that evaluate a profile, for cache and store keys.
+        
+        With the cascade enabled a result may come from either tier, so the
+        key names both and results of a single-model setup are not reused.
+        
+        Args:
+            profile: Screening profile; defaults to the registry's default profile
+        """
+        profile = profile or self.profiles.default
+        if self._cascades(profile):
+            return f"{self.settings.cascade_screening_model}>{profile.model}"
+        return profile.model
+    
+    def stream_model_key(self, profile: Optional[CompiledProfile] = None) -> str:
+        """
+        Name the model that evaluates a profile on the streaming path.
+        
+        Streams skip the cascade (criteria already sent cannot be taken back
+        on escalation), so their results come from the profile's model alone
+        and must not be cached or stored under the cascade's key.
+        
+        Args:
+            profile: Screening profile; defaults to the registry's default profile
+        """
+        return (profile or self.profiles.default).model
+    
+    def _record_cascade(self, decision: str) -> None:
+        """
+        Count a screening-tier decision.
+        
+        Args:
+            decision: "accepted", or the escalation reason ("borderline", "inconsistent", "failed")
+        """
+        CASCADE_DECISIONS.inc(decision=decision)
+        self.cascade[decision] += 1
+    
+    def _record_tier(self, tier: str, started: float, outcome: str) -> None:
+        """Record the latency of one cascade tier."""
+        elapsed = time.perf_counter() - started
+        CASCADE_DURATION.observe(elapsed, tier=tier, outcome=outcome)
+        self.cascade[f"{tier}_calls"] += 1
+        self.cascade[f"{tier}_ms"] += elapsed * 1000
+    
+    async def evaluate_cv_multi(
+        self,
+        cv_text: str,
+        filename: str,
+        profiles: list[CompiledProfile]
+    ) -> dict[str, LabelledEvaluation]:
+        """
+        Evaluate one CV against several profiles, sending the CV text once per model.
+        
+        Profiles that share a model are evaluated together in one call whose
+        system prompt holds every profile's compiled prompt; groups for
+        different models run concurrently. Any profile missing or invalid in
+        the combined reply falls back to its own `evaluate_cv_async` call.
+        
+        A result from a combined call comes from another prompt (and skips
+        the cascade), so it is labelled with the combined model key and
+        prompt version (see `multi_labels`) rather than the profile's own.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profiles: Profiles to evaluate against
+            
+        Returns:
+            Dict of profile name -> (evaluation, model key, prompt version)
+            
+        Raises:
+            RateLimitExceeded: If a call is shed under load
+            ValueError: If evaluation fails
+        """
+        evaluations: dict[str, LabelledEvaluation] = {}
+        for group in await asyncio.gather(
+            *(self._evaluate_group(cv_text, filename, group) for group in _group_by_model(profiles))
+        ):
+            evaluations.update(group)
+        return evaluations
+    
+    def multi_labels(self, profiles: list[CompiledProfile]) -> dict[str, tuple[str, str]]:
+        """
+        Model key and prompt version `evaluate_cv_multi` gives each profile's
+        result when every profile is answered by its group's call.
+        
+        Args:
+            profiles: Profiles to evaluate against
+            
+        Returns:
+            Dict of profile name -> (model key, prompt version)
+        """
+        labels: dict[str, tuple[str, str]] = {}
+        for group in _group_by_model(profiles):
+            if len(group) == 1:
+                labels[group[0].name] = (self.model_key(group[0]), group[0].prompt_version)
+                continue
+            version = prompt_version(self.profiles.combined_prompt(group))
+            for profile in group:
+                labels[profile.name] = (f"{profile.model}{COMBINED_MODEL_SUFFIX}", version)
+        return labels
+    
+    async def _evaluate_group(
+        self,
+        cv_text: str,
+        filename: str,
+        profiles: list[CompiledProfile]
+    ) -> dict[str, LabelledEvaluation]:
+        """
+        Evaluate a CV for profiles sharing one model with a single combined call.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profiles: Profiles with the same model
+            
+        Returns:
+            Dict of profile name -> (evaluation, model key, prompt version)
+        """
+        if len(profiles) == 1:
+            profile = profiles[0]
+            evaluation = await self.evaluate_cv_async(cv_text, filename, profile)
+            return {profile.name: (evaluation, self.model_key(profile), profile.prompt_version)}
+        
+        try:
+            logger.info(f"Sending CV for evaluation against {len(profiles)} profiles: {filename}")
+            request = self._build_multi_request(cv_text, filename, profiles)
+            
+            # Call Claude API
+            response = await self.scheduler.run(
+                lambda: self._create_message(request),
+                estimated_tokens=self._estimate_request_tokens(request)
+            )
+            self._record_usage(response.usage, filename, request["model"])
+        except Exception as e:
+            raise self._evaluation_error(e)
+        
+        labels = self.multi_labels(profiles)
+        evaluations = {
+            name: (evaluation, *labels[name])
+            for name, evaluation in self._evaluations_from_multi(response, profiles).items()
+        }
+        missing = [profile for profile in profiles if profile.name not in evaluations]
+        if missing:
+            logger.warning(
+                f"Combined evaluation of {filename} lacked {', '.join(p.name for p in missing)}, "
+                "evaluating them separately"
+            )
+            for profile, evaluation in zip(missing, await asyncio.gather(
+                *(self.evaluate_cv_async(cv_text, filename, profile) for profile in missing)
+            )):
+                evaluations[profile.name] = (evaluation, self.model_key(profile), profile.prompt_version)
+        return evaluations
+    
+    async def evaluate_cv_stream(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> AsyncIterator[Union[EvaluationCriteria, CVEvaluationResponse]]:
+        """
+        Evaluate CV content with a streamed Claude response.
+        
+        Criteria are yielded as soon as each one is complete in the streamed
+        JSON; the full evaluation is always the last item yielded. Streams
+        are rate limited but not retried, since criteria may already be out,
+        and always use the profile's model (see `stream_model_key`).
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile; defaults to the registry's default profile
+            
+        Yields:
+            EvaluationCriteria items, then the final CVEvaluationResponse
+            
+        Raises:
+            RateLimitExceeded: If the call is shed under load
+            ValueError: If evaluation fails
+        """
+        parser = IncrementalJSONParser()
+        
+        try:
+            logger.info(f"Streaming CV evaluation: {filename}")
+            
+            request = self._build_request(cv_text, filename, profile)
+            estimated_tokens = self._estimate_request_tokens(request)
+            async with self.scheduler.slot(estimated_tokens):
+                with CLAUDE_DURATION.time_outcome(model=request["model"]):
+                    async with self.async_client.messages.stream(**request) as stream:
+                        self.scheduler.observe_headers(stream.response.headers)
+                        async for event in stream:
+                            # Text deltas in JSON mode, tool input deltas in tool mode
+                            if event.type == "text":
+                                chunk = event.text
+                            elif event.type == "input_json":
+                                chunk = event.partial_json
+                            else:
+                                continue
+                            for criterion in parser.feed(chunk):
+                                yield EvaluationCriteria(**criterion)
+                        message = await stream.get_final_message()
+            
+            self._record_usage(message.usage, filename, request["model"])
+            if self.settings.evaluation_mode == EVALUATION_MODE_TOOL:
+                evaluation = await self._validated_evaluation(message, request, estimated_tokens, filename)
+            else:
+                try:
+                    with STAGE_DURATION.time_outcome(stage="json_parse"):
+                        evaluation = self._evaluation_from_data(parser.result())
+                except Exception:
+                    self._record_output("failed")
+                    raise
+                self._record_output("valid")
+            yield evaluation
+            
+        except Exception as e:
+            raise self._evaluation_error(e)
+    
+    async def submit_batch(
+        self,
+        items: list[tuple[str, str, str]],
+        profile: Optional[CompiledProfile] = None
+    ) -> MessageBatch:
+        """
+        Submit many CVs as one Message Batch for offline, lower-cost evaluation.
+        
+        Every request uses the same parameters as `evaluate_cv`, so results can
+        be mapped back through `_parse_evaluation_response` unchanged.
+        
+        Args:
+            items: List of (custom_id, cv_text, filename) tuples
+            profile: Screening profile for every CV; defaults to the default profile
+            
+        Returns:
+            The created batch
+            
+        Raises:
+            ValueError: If the batch cannot be created
+        """
+        try:
+            logger.info(f"Submitting message batch of {len(items)} CVs")
+            return await self.async_client.messages.batches.create(
+                requests=[
+                    {"custom_id": custom_id, "params": self._build_request(cv_text, filename, profile)}
+                    for custom_id, cv_text, filename in items
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Batch submission failed: {e}")
+            raise ValueError(f"Failed to submit batch: {e}")
+    
+    async def get_batch(self, batch_id: str) -> MessageBatch:
+        """
+        Fetch the current status of a Message Batch.
+        
+        Args:
+            batch_id: ID returned by `submit_batch`
+            
+        Returns:
+            The batch, including processing status and request counts
+            
+        Raises:
+            NotFoundError: If there is no batch with that ID
+            ValueError: If the batch cannot be retrieved for any other reason
+        """
+        try:
+            return await self.async_client.messages.batches.retrieve(batch_id)
+        except NotFoundError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to retrieve batch {batch_id}: {e}")
+            raise ValueError(f"Failed to retrieve batch: {e}")
+    
+    async def wait_for_batch(
+        self,
+        batch_id: str,
+        poll_interval_seconds: Optional[float] = None
+    ) -> MessageBatch:
+        """
+        Poll a Message Batch until processing has ended.
+        
+        Args:
+            batch_id: ID returned by `submit_batch`
+            poll_interval_seconds: Delay between polls (defaults to settings)
+            
+        Returns:
+            The ended batch
+        """
+        interval = poll_interval_seconds or self.settings.batch_poll_interval_seconds
+        while True:
+            batch = await self.get_batch(batch_id)
+            if batch.processing_status == "ended":
+                return batch
+            await asyncio.sleep(interval)
+    
+    async def get_batch_results(
+        self,
+        batch_id: str
+    ) -> dict[str, Union[CVEvaluationResponse, str]]:
+        """
+        Download an ended batch's results and map them to evaluations.
+        
+        Token usage is counted on the first download only (per process), so
+        polling the results endpoint does not inflate the usage counters.
+        
+        Args:
+            batch_id: ID of an ended batch
+            
+        Returns:
+            Dict of custom_id -> evaluation, or an error message for failed requests
+            
+        Raises:
+            ValueError: If the results cannot be downloaded
+        """
+        try:
+            decoder = await self.async_client.messages.batches.results(batch_id)
+            entries = [entry async for entry in decoder]
+        except Exception as e:
+            logger.error(f"Failed to download results for batch {batch_id}: {e}")
+            raise ValueError(f"Failed to download batch results: {e}")
+        
+        account = batch_id not in self._accounted_batches
+        if account:
+            self._accounted_batches[batch_id] = None
+            if len(self._accounted_batches) > ACCOUNTED_BATCHES_LIMIT:
+                self._accounted_batches.popitem(last=False)
+        
+        results: dict[str, Union[CVEvaluationResponse, str]] = {}
+        for entry in entries:
+            if entry.result.type != "succeeded":
+                results[entry.custom_id] = f"Batch request {entry.result.type}"
+                continue
+            message = entry.result.message
+            if account:
+                self._record_usage(message.usage, entry.custom_id, message.model)
+            try:
+                results[entry.custom_id] = self._evaluation_from_message(message)
+            except Exception as e:
+                results[entry.custom_id] = str(self._evaluation_error(e))
+        return results
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pools."""
+        self.client.close()
+        await self.async_client.close()
+    
+    async def _create_message(self, request: dict):
+        """
+        Make one Messages API call, feeding its rate-limit headers to the scheduler.
+        
+        Args:
+            request: Parameters from `_build_request`
+            
+        Returns:
+            The parsed Message
+        """
+        with CLAUDE_DURATION.time_outcome(model=request["model"]):
+            raw = await self.async_client.messages.with_raw_response.create(**request)
+        self.scheduler.observe_headers(raw.headers)
+        return await raw.parse()
+    
+    @staticmethod
+    def _estimate_request_tokens(request: dict) -> int:
+        """Estimate input tokens of a request (user message plus system prompt)."""
+        system = request["system"]
+        system_text = system if isinstance(system, str) else system[0]["text"]
+        return estimate_tokens(request["messages"][0]["content"]) + estimate_tokens(system_text)
+    
+    def _build_multi_request(
+        self,
+        cv_text: str,
+        filename: str,
+        profiles: list[CompiledProfile]
+    ) -> dict:
+        """
+        Build a `messages.create` call that evaluates the CV for several profiles.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profiles: Profiles sharing one model
+            
+        Returns:
+            Request parameters for the Messages API
+        """
+        request = self._build_request(cv_text, filename, profiles[0])
+        request["max_tokens"] = 2048 * len(profiles)
+        request["system"] = self._build_system_prompt(self.profiles.combined_prompt(profiles))
+        if self.settings.evaluation_mode == EVALUATION_MODE_TOOL:
+            request["tools"] = [build_multi_evaluation_tool([profile.name for profile in profiles])]
+            request["tool_choice"] = {"type": "tool", "name": MULTI_EVALUATION_TOOL_NAME}
+        return request
+    
+    def _build_request(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None,
+        model: Optional[str] = None
+    ) -> dict:
+        """
+        Build the keyword arguments for a `messages.create` call.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile; defaults to the registry's default profile
+            model: Model overriding the profile's (the cascade's screening model)
+            
+        Returns:
+            Request parameters for the Messages API
+        """
+        # Prepare the user message
+        user_message = f"""Please evaluate the following CV/Resume:
 
 Filename: {filename}
 
@@ -100,74 +785,409 @@ Filename: {filename}
 
 Provide your structured evaluation as JSON."""
 
-            logger.info(f"Sending CV for evaluation: {filename}")
+        profile = profile or self.profiles.default
+        request = {
+            "model": model or profile.model,
+            "max_tokens": 2048,
+            "system": self._build_system_prompt(profile.system_prompt),
+            "messages": [
+                {"role": "user", "content": user_message}
+            ]
+        }
+        if self.settings.evaluation_mode == EVALUATION_MODE_TOOL:
+            request["tools"] = [CV_EVALUATION_TOOL]
+            request["tool_choice"] = {"type": "tool", "name": EVALUATION_TOOL_NAME}
+        return request
+    
+    def _build_system_prompt(self, system_prompt: str) -> Union[str, list[dict]]:
+        """
+        Build the system parameter, marking it cacheable when prompt caching is on.
+        
+        The system prompt is identical for every CV of a profile, so with a cache breakpoint
+        after it the API serves it from the prompt cache instead of re-reading
+        it. Prompts shorter than the model's minimum cacheable length are
+        simply processed uncached.
+        
+        Args:
+            system_prompt: Compiled system prompt of a profile (or profile combination)
+        
+        Returns:
+            Plain prompt string, or a text block list with cache_control
+        """
+        if not self.settings.prompt_caching_enabled:
+            return system_prompt
+        
+        return [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+    
+    def _record_usage(self, usage, label: str, model: Optional[str] = None) -> None:
+        """
+        Accumulate token usage, including prompt cache reads and writes.
+        
+        Args:
+            usage: `usage` object from a Messages API response
+            label: Filename or batch custom_id, for the log line
+            model: Model that served the call; defaults to CLAUDE_MODEL
+        """
+        if usage is None:
+            return
+        
+        cache_read = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_creation = getattr(usage, "cache_creation_input_tokens", None) or 0
+        
+        model = model or self.settings.claude_model
+        CLAUDE_TOKENS.inc(usage.input_tokens, model=model, type="input")
+        CLAUDE_TOKENS.inc(usage.output_tokens, model=model, type="output")
+        CLAUDE_TOKENS.inc(cache_read, model=model, type="cache_read")
+        CLAUDE_TOKENS.inc(cache_creation, model=model, type="cache_creation")
+        CLAUDE_INPUT_TOKENS.observe(usage.input_tokens + cache_read + cache_creation, model=model)
+        
+        self.usage["requests"] += 1
+        self.usage["input_tokens"] += usage.input_tokens
+        self.usage["output_tokens"] += usage.output_tokens
+        self.usage["cache_read_input_tokens"] += cache_read
+        self.usage["cache_creation_input_tokens"] += cache_creation
+        
+        by_model = self.usage_by_model[model]
+        by_model["requests"] += 1
+        by_model["input_tokens"] += usage.input_tokens + cache_read + cache_creation
+        by_model["output_tokens"] += usage.output_tokens
+        
+        logger.info(
+            f"Token usage for {label}: input={usage.input_tokens} "
+            f"output={usage.output_tokens} cache_read={cache_read} "
+            f"cache_creation={cache_creation}"
+        )
+    
+    def usage_stats(self) -> dict:
+        """
+        Report accumulated token usage since startup.
+        
+        Returns:
+            Token counters plus the share of input tokens served from the prompt cache
+        """
+        stats = {
+            "prompt_caching_enabled": self.settings.prompt_caching_enabled,
+            "requests": self.usage["requests"],
+            "input_tokens": self.usage["input_tokens"],
+            "output_tokens": self.usage["output_tokens"],
+            "cache_read_input_tokens": self.usage["cache_read_input_tokens"],
+            "cache_creation_input_tokens": self.usage["cache_creation_input_tokens"],
+        }
+        total_input = (
+            stats["input_tokens"]
+            + stats["cache_read_input_tokens"]
+            + stats["cache_creation_input_tokens"]
+        )
+        stats["cache_read_ratio"] = (
+            round(stats["cache_read_input_tokens"] / total_input, 4) if total_input else 0.0
+        )
+        
+        outputs = self.usage["outputs"]
+        failures = self.usage["parse_failures"]
+        stats["evaluation_mode"] = self.settings.evaluation_mode
+        stats["parse_failures"] = failures
+        stats["repairs"] = self.usage["repairs"]
+        stats["parse_failure_rate"] = round(failures / outputs, 4) if outputs else 0.0
+        stats["repair_success_rate"] = (
+            round(self.usage["repairs"] / failures, 4) if failures else 0.0
+        )
+        stats["by_model"] = {model: dict(counts) for model, counts in self.usage_by_model.items()}
+        stats["cascade"] = self.cascade_stats()
+        return stats
+    
+    def cascade_stats(self) -> dict:
+        """
+        Report model cascade decisions and per-tier latency.
+        
+        Returns:
+            Screening results accepted and escalated (by reason), escalation
+            rate, and calls and mean latency per tier
+        """
+        screened = sum(
+            self.cascade[decision] for decision in ("accepted", "borderline", "inconsistent", "failed")
+        )
+        escalated = screened - self.cascade["accepted"]
+        stats = {
+            "enabled": self.settings.cascade_enabled,
+            "screening_model": self.settings.cascade_screening_model,
+            "score_margin": self.settings.cascade_score_margin,
+            "screened": screened,
+            "accepted": self.cascade["accepted"],
+            "escalated": escalated,
+            "escalations": {
+                reason: self.cascade[reason]
+                for reason in ("borderline", "inconsistent", "failed")
+            },
+            "escalation_rate": round(escalated / screened, 4) if screened else 0.0,
+        }
+        for tier in ("screening", "escalation"):
+            calls = self.cascade[f"{tier}_calls"]
+            stats[tier] = {
+                "calls": calls,
+                "mean_latency_ms": round(self.cascade[f"{tier}_ms"] / calls, 1) if calls else 0.0,
+            }
+        return stats
+    
+    def _evaluation_from_message(self, message: Message) -> CVEvaluationResponse:
+        """
+        Extract the evaluation from a Messages API response, without repair.
+        
+        Args:
+            message: Claude response in either evaluation mode
             
-            # Call Claude API
-            response = self.client.messages.create(
-                model=self.settings.claude_model,
-                max_tokens=2048,
-                system=CV_EVALUATION_SYSTEM_PROMPT,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ]
-            )
+        Returns:
+            Structured evaluation response
+        """
+        try:
+            if self.settings.evaluation_mode == EVALUATION_MODE_TOOL:
+                evaluation = self._evaluation_from_tool_call(message)
+            else:
+                evaluation = self._build_evaluation(message.content[0].text)
+        except Exception:
+            self._record_output("failed")
+            raise
+        self._record_output("valid")
+        return evaluation
+    
+    async def _validated_evaluation(
+        self,
+        message: Message,
+        request: dict,
+        estimated_tokens: int,
+        filename: str
+    ) -> CVEvaluationResponse:
+        """
+        Extract and validate the evaluation, repairing invalid tool input once.
+        
+        In JSON mode this is `_evaluation_from_message`. In tool mode a tool
+        input that fails schema validation is sent back as an error
+        `tool_result`, asking Claude for a corrected call.
+        
+        Args:
+            message: Claude response
+            request: Request that produced the response
+            estimated_tokens: Estimated input tokens of the request
+            filename: Original filename, for logging
             
-            # Extract the response text
-            response_text = response.content[0].text
-            logger.debug(f"Raw Claude response: {response_text}")
-            
-            # Parse the JSON response
-            evaluation_data = self._parse_evaluation_response(response_text)
-            
-            # Construct the response model
-            return CVEvaluationResponse(
-                status=PassFailStatus(evaluation_data["status"]),
-                match_score=evaluation_data["match_score"],
-                reasoning=evaluation_data["reasoning"],
-                criteria=[
-                    EvaluationCriteria(**criterion) 
-                    for criterion in evaluation_data["criteria"]
-                ],
-                candidate_name=evaluation_data.get("candidate_name")
+        Returns:
+            Structured evaluation response
+        """
+        if self.settings.evaluation_mode != EVALUATION_MODE_TOOL:
+            return self._evaluation_from_message(message)
+        
+        try:
+            evaluation = self._evaluation_from_tool_call(message)
+            self._record_output("valid")
+            return evaluation
+        except ValidationError as e:
+            validation_error = e
+        except ValueError:
+            self._record_output("failed")
+            raise
+        
+        logger.warning(f"Evaluation of {filename} failed validation, requesting a repair")
+        tool_call = self._tool_call(message)
+        repair_request = {
+            **request,
+            "messages": [
+                *request["messages"],
+                {"role": "assistant", "content": [tool_call.model_dump(include={"type", "id", "name", "input"})]},
+                {"role": "user", "content": [{
+                    "type": "tool_result",
+                    "tool_use_id": tool_call.id,
+                    "is_error": True,
+                    "content": (
+                        f"The evaluation did not match the schema: {_validation_summary(validation_error)}. "
+                        f"Call {EVALUATION_TOOL_NAME} again with a complete, corrected evaluation."
+                    ),
+                }]},
+            ],
+        }
+        try:
+            response = await self.scheduler.run(
+                lambda: self._create_message(repair_request),
+                estimated_tokens=estimated_tokens
             )
+            self._record_usage(response.usage, filename, request["model"])
+            evaluation = self._evaluation_from_tool_call(response)
+        except Exception:
+            self._record_output("failed")
+            raise
+        self._record_output("repaired")
+        return evaluation
+    
+    def _evaluations_from_multi(
+        self,
+        message: Message,
+        profiles: list[CompiledProfile]
+    ) -> dict[str, CVEvaluationResponse]:
+        """
+        Extract the per-profile evaluations of a combined response.
+        
+        Entries that are missing or fail validation are left out (and
+        counted as failed outputs) so the caller can evaluate them again.
+        
+        Args:
+            message: Claude response to a `_build_multi_request` call
+            profiles: Profiles the call asked for
             
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse Claude response as JSON: {e}")
-            raise ValueError("AI returned invalid response format")
-        except KeyError as e:
-            logger.error(f"Missing required field in AI response: {e}")
-            raise ValueError(f"AI response missing required field: {e}")
+        Returns:
+            Dict of profile name -> evaluation for the valid entries
+        """
+        try:
+            if self.settings.evaluation_mode == EVALUATION_MODE_TOOL:
+                data = self._tool_call(message, MULTI_EVALUATION_TOOL_NAME).input
+            else:
+                with STAGE_DURATION.time_outcome(stage="json_parse"):
+                    data = self._parse_evaluation_response(message.content[0].text)
+            entries = data.get("evaluations")
         except Exception as e:
-            logger.error(f"Evaluation failed: {e}")
-            raise ValueError(f"Failed to evaluate CV: {e}")
+            logger.error(f"Failed to parse combined evaluation: {e}")
+            entries = None
+        if not isinstance(entries, dict):
+            entries = {}
+        
+        evaluations: dict[str, CVEvaluationResponse] = {}
+        for profile in profiles:
+            try:
+                evaluations[profile.name] = CVEvaluationResponse.model_validate(entries.get(profile.name))
+            except ValidationError as e:
+                logger.warning(f"Combined evaluation for {profile.name} is unusable: {_validation_summary(e)}")
+                self._record_output("failed")
+                continue
+            self._record_output("valid")
+        return evaluations
     
-    def _parse_evaluation_response(self, response_text: str) -> dict:
+    def _evaluation_from_tool_call(self, message: Message) -> CVEvaluationResponse:
         """
-        Parse the Claude response text to extract JSON.
-        Handles cases where JSON might be wrapped in markdown code blocks.
+        Validate the evaluation tool's input against the response model.
+        
+        Raises:
+            ValidationError: If the tool input does not match the schema
+            ValueError: If Claude did not call the tool
+        """
+        tool_call = self._tool_call(message)
+        with STAGE_DURATION.time_outcome(stage="json_parse"):
+            return CVEvaluationResponse.model_validate(tool_call.input)
+    
+    @staticmethod
+    def _tool_call(message: Message, name: str = EVALUATION_TOOL_NAME):
+        """
+        Find the evaluation tool call in a response.
+        
+        Raises:
+            ValueError: If the response has no such tool call
+        """
+        for block in message.content:
+            if block.type == "tool_use" and block.name == name:
+                return block
+        raise ValueError("AI response did not include a structured evaluation")
+    
+    def _record_output(self, result: str) -> None:
+        """
+        Count an evaluation output for the parse-failure and repair rates.
+        
+        Args:
+            result: "valid", "repaired" or "failed"
+        """
+        EVALUATION_OUTPUTS.inc(mode=self.settings.evaluation_mode, result=result)
+        self.usage["outputs"] += 1
+        if result != "valid":
+            self.usage["parse_failures"] += 1
+        if result == "repaired":
+            self.usage["repairs"] += 1
+    
+    def _build_evaluation(self, response_text: str) -> CVEvaluationResponse:
+        """
+        Turn the raw Claude response text into a response model.
         
         Args:
             response_text: Raw response from Claude
             
         Returns:
-            Parsed JSON as dictionary
+            Structured evaluation response
         """
-        # Clean up the response - remove markdown code blocks if present
-        text = response_text.strip()
+        logger.debug(f"Raw Claude response: {response_text}")
         
-        # Remove ```json and ``` markers if present
-        if text.startswith("```json"):
-            text = text[7:]
-        elif text.startswith("```"):
-            text = text[3:]
+        # Parse the JSON response
+        with STAGE_DURATION.time_outcome(stage="json_parse"):
+            return self._evaluation_from_data(self._parse_evaluation_response(response_text))
+    
+    @staticmethod
+    def _evaluation_from_data(evaluation_data: dict) -> CVEvaluationResponse:
+        """
+        Construct the response model from parsed evaluation JSON.
+        
+        Args:
+            evaluation_data: Parsed JSON object
             
-        if text.endswith("```"):
-            text = text[:-3]
+        Returns:
+            Structured evaluation response
+        """
+        return CVEvaluationResponse(
+            status=PassFailStatus(evaluation_data["status"]),
+            match_score=evaluation_data["match_score"],
+            reasoning=evaluation_data["reasoning"],
+            criteria=[
+                EvaluationCriteria(**criterion) 
+                for criterion in evaluation_data["criteria"]
+            ],
+            candidate_name=evaluation_data.get("candidate_name")
+        )
+    
+    def _evaluation_error(self, error: Exception) -> Exception:
+        """
+        Map an evaluation failure to the error surfaced to the router.
+        
+        Load-shedding errors pass through unchanged so the router can answer
+        429/503; un-retried transient API errors (streams) become one.
+        
+        Args:
+            error: Exception raised while calling or parsing
             
-        text = text.strip()
+        Returns:
+            RateLimitExceeded, or ValueError with a user-facing message
+        """
+        if isinstance(error, RateLimitExceeded):
+            return error
+        shed = self.scheduler.shed_error(error)
+        if shed is not None:
+            logger.warning(f"Evaluation shed: {error}")
+            return shed
+        if isinstance(error, json.JSONDecodeError):
+            logger.error(f"Failed to parse Claude response as JSON: {error}")
+            return ValueError("AI returned invalid response format")
+        if isinstance(error, KeyError):
+            logger.error(f"Missing required field in AI response: {error}")
+            return ValueError(f"AI response missing required field: {error}")
+        if isinstance(error, ValidationError):
+            logger.error(f"AI response failed validation: {error}")
+            return ValueError(f"AI response failed validation: {_validation_summary(error)}")
+        logger.error(f"Evaluation failed: {error}")
+        return ValueError(f"Failed to evaluate CV: {error}")
+    
+    def _parse_evaluation_response(self, response_text: str) -> dict:
+        """
+        Parse the Claude response text to extract JSON.
+        Handles cases where JSON might be wrapped in markdown code blocks
+        or surrounded by stray text.
         
-        # Parse JSON
-        return json.loads(text)
+        Args:
+            response_text: Raw response from Claude
+            
+        Returns:
+            Parsed JSON as dictionary
+        """
+        # Skips any markdown code fence or text around the JSON object
+        parser = IncrementalJSONParser()
+        parser.feed(response_text)
+        return parser.result()
     
     def health_check(self) -> bool:
         """
@@ -182,3 +1202,19 @@ Provide your structured evaluation as JSON."""
                        len(self.settings.anthropic_api_key) > 10)
         except Exception:
             return False
+
+
+def _validation_summary(error: ValidationError) -> str:
+    """Collapse a validation error into one line of "field: message" pairs."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'response'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+def _group_by_model(profiles: list[CompiledProfile]) -> list[list[CompiledProfile]]:
+    """Split profiles into groups sharing a model, keeping request order within each group."""
+    groups: dict[str, list[CompiledProfile]] = {}
+    for profile in profiles:
+        groups.setdefault(profile.model, []).append(profile)
+    return list(groups.values())
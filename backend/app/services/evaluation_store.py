@@ -0,0 +1,371 @@
+"""
+Evaluation Store Service.
+Persists screening results so past candidates can be listed and looked up.
+"""
+
+import base64
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
+from ..models.schemas import CVEvaluationResponse, EvaluationPage, PassFailStatus, StoredEvaluation
+
+logger = logging.getLogger(__name__)
+
+# Sort orders for listing, each backed by an index so pages are keyset seeks
+SORT_NEWEST = "newest"
+SORT_SCORE = "score"
+SORT_COLUMNS = {
+    SORT_NEWEST: "created_at",
+    SORT_SCORE: "match_score",
+}
+
+MAX_PAGE_SIZE = 100
+
+
+class EvaluationStore:
+    """
+    SQLite-backed history of evaluations.
+    
+    Every record keeps the file hash, filename, model, prompt version,
+    stage timings and the extracted CV text next to the evaluation itself.
+    Listing uses keyset (cursor) pagination over composite indexes, so the
+    cost of a page does not grow with how deep the client has paged.
+    """
+    
+    _COLUMNS = (
+        "id, file_hash, filename, candidate_name, status, match_score, model, "
+        "prompt_version, timings, created_at, evaluation, profile"
+    )
+    
+    def __init__(self, sqlite_path: str):
+        """
+        Open (and create if needed) the store.
+        
+        Args:
+            sqlite_path: SQLite file path
+        """
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[int], None]] = []
+        self._db = sqlite3.connect(sqlite_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, file_hash TEXT NOT NULL, "
+            "filename TEXT NOT NULL, candidate_name TEXT COLLATE NOCASE, "
+            "status TEXT NOT NULL, match_score INTEGER NOT NULL, model TEXT NOT NULL, "
+            "prompt_version TEXT NOT NULL, timings TEXT NOT NULL, created_at REAL NOT NULL, "
+            "evaluation TEXT NOT NULL, cv_text TEXT NOT NULL, profile TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(evaluations)")}
+        if "profile" not in columns:
+            # Stores created before screening profiles existed
+            self._db.execute("ALTER TABLE evaluations ADD COLUMN profile TEXT")
+        for name, columns in (
+            ("evaluations_file_hash", "file_hash, model, prompt_version, id"),
+            ("evaluations_created", "created_at, id"),
+            ("evaluations_score", "match_score, id"),
+            ("evaluations_status_created", "status, created_at, id"),
+            ("evaluations_status_score", "status, match_score, id"),
+            ("evaluations_candidate", "candidate_name, id"),
+            ("evaluations_profile_created", "profile, created_at, id"),
+        ):
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS {name} ON evaluations ({columns})")
+    
+    def save(
+        self,
+        file_hash: str,
+        filename: str,
+        cv_text: str,
+        evaluation: CVEvaluationResponse,
+        model: str,
+        prompt_version: str,
+        timings: Optional[dict[str, float]] = None,
+        profile: Optional[str] = None
+    ) -> int:
+        """
+        Persist one evaluation.
+        
+        Args:
+            file_hash: SHA-256 of the PDF bytes
+            filename: Original filename
+            cv_text: Text that was evaluated
+            evaluation: Evaluation result
+            model: Claude model used
+            prompt_version: Evaluation prompt version
+            timings: Stage durations in milliseconds
+            profile: Screening profile the CV was evaluated against
+        
+        Returns:
+            ID of the new record
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO evaluations (file_hash, filename, candidate_name, status, "
+                "match_score, model, prompt_version, timings, created_at, evaluation, cv_text, profile) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    file_hash,
+                    filename,
+                    evaluation.candidate_name,
+                    evaluation.status.value,
+                    evaluation.match_score,
+                    model,
+                    prompt_version,
+                    json.dumps({name: round(ms, 1) for name, ms in (timings or {}).items()}),
+                    time.time(),
+                    evaluation.model_dump_json(),
+                    cv_text,
+                    profile,
+                )
+            )
+        for listener in self._listeners:
+            listener(cursor.lastrowid)
+        return cursor.lastrowid
+    
+    def subscribe(self, listener: Callable[[int], None]) -> None:
+        """
+        Call a function with the ID of every evaluation saved from now on.
+        Listeners run in the saving thread and must return quickly.
+        
+        Args:
+            listener: Callback taking the new record ID
+        """
+        self._listeners.append(listener)
+    
+    def get(self, evaluation_id: int) -> Optional[StoredEvaluation]:
+        """Look up one record by ID."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM evaluations WHERE id = ?", (evaluation_id,)
+            ).fetchone()
+        return self._to_record(row) if row is not None else None
+    
+    def get_many(self, evaluation_ids: list[int]) -> dict[int, StoredEvaluation]:
+        """Look up several records by ID in one query; unknown IDs are left out."""
+        if not evaluation_ids:
+            return {}
+        placeholders = ", ".join("?" * len(evaluation_ids))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM evaluations WHERE id IN ({placeholders})", evaluation_ids
+            ).fetchall()
+        records = [self._to_record(row) for row in rows]
+        return {record.id: record for record in records}
+    
+    def find_by_hash(
+        self,
+        file_hash: str,
+        model: Optional[str] = None,
+        prompt_version: Optional[str] = None
+    ) -> Optional[StoredEvaluation]:
+        """
+        Find the latest evaluation of a PDF.
+        
+        Args:
+            file_hash: SHA-256 of the PDF bytes
+            model: Only match evaluations by this model
+            prompt_version: Only match evaluations made with this prompt version
+        
+        Returns:
+            Most recent matching record, or None
+        """
+        clauses, params = ["file_hash = ?"], [file_hash]
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+            if prompt_version is not None:
+                clauses.append("prompt_version = ?")
+                params.append(prompt_version)
+        
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM evaluations WHERE {' AND '.join(clauses)} "
+                "ORDER BY id DESC LIMIT 1",
+                params
+            ).fetchone()
+        return self._to_record(row) if row is not None else None
+    
+    def list(
+        self,
+        status: Optional[PassFailStatus] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        candidate_name: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        profile: Optional[str] = None,
+        sort: str = SORT_NEWEST,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> EvaluationPage:
+        """
+        List evaluations, newest or highest-scoring first.
+        
+        Args:
+            status: Only pass or only fail
+            min_score: Minimum match score (inclusive)
+            max_score: Maximum match score (inclusive)
+            candidate_name: Case-insensitive candidate name prefix
+            created_after: Only evaluations at or after this time (UTC if naive)
+            created_before: Only evaluations before this time (UTC if naive)
+            profile: Only evaluations against this screening profile
+            sort: "newest" or "score"
+            limit: Page size (capped at MAX_PAGE_SIZE)
+            cursor: `next_cursor` of the previous page
+        
+        Returns:
+            Page of records plus the cursor for the next page
+        
+        Raises:
+            ValueError: If the sort order or cursor is invalid
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Invalid sort order: {sort}. Use one of: {', '.join(SORT_COLUMNS)}")
+        column = SORT_COLUMNS[sort]
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        
+        clauses: list[str] = []
+        params: list = []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status.value)
+        if min_score is not None:
+            clauses.append("match_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("match_score <= ?")
+            params.append(max_score)
+        if candidate_name:
+            clauses.append("candidate_name LIKE ? ESCAPE '\\'")
+            params.append(_escape_like(candidate_name) + "%")
+        if created_after is not None:
+            clauses.append("created_at >= ?")
+            params.append(_epoch(created_after))
+        if created_before is not None:
+            clauses.append("created_at < ?")
+            params.append(_epoch(created_before))
+        if profile is not None:
+            clauses.append("profile = ?")
+            params.append(profile)
+        if cursor:
+            last_value, last_id = _decode_cursor(cursor)
+            clauses.append(f"({column}, id) < (?, ?)")
+            params.extend([last_value, last_id])
+        
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM evaluations {where}"
+                f"ORDER BY {column} DESC, id DESC LIMIT ?",
+                [*params, limit + 1]
+            ).fetchall()
+        
+        items = [self._to_record(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            sort_value = last[9] if sort == SORT_NEWEST else last[5]
+            next_cursor = _encode_cursor(sort_value, last[0])
+        return EvaluationPage(items=items, next_cursor=next_cursor)
+    
+    def get_text(self, evaluation_id: int) -> Optional[str]:
+        """Fetch the CV text an evaluation was based on."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT cv_text FROM evaluations WHERE id = ?", (evaluation_id,)
+            ).fetchone()
+        return row[0] if row is not None else None
+    
+    def iter_texts(self, after_id: int = 0, batch_size: int = 500) -> Iterator[tuple[int, str, str]]:
+        """
+        Walk stored CV texts in ID order, for building search or dedup indexes.
+        
+        Args:
+            after_id: Only records with a larger ID
+            batch_size: Rows fetched per query
+        
+        Yields:
+            (id, cv_text, evaluation JSON) tuples
+        """
+        last_id = after_id
+        while True:
+            with self._lock:
+                rows = self._db.execute(
+                    "SELECT id, cv_text, evaluation FROM evaluations WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+    
+    def stats(self) -> dict:
+        """Count stored evaluations per status."""
+        with self._lock:
+            counts = dict(self._db.execute(
+                "SELECT status, COUNT(*) FROM evaluations GROUP BY status"
+            ).fetchall())
+        return {
+            "total": sum(counts.values()),
+            **{status.value: counts.get(status.value, 0) for status in PassFailStatus}
+        }
+    
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+    
+    @staticmethod
+    def _to_record(row: tuple) -> StoredEvaluation:
+        (evaluation_id, file_hash, filename, candidate_name, status, match_score,
+         model, prompt_version, timings, created_at, evaluation, profile) = row
+        return StoredEvaluation(
+            id=evaluation_id,
+            file_hash=file_hash,
+            filename=filename,
+            candidate_name=candidate_name,
+            status=PassFailStatus(status),
+            match_score=match_score,
+            model=model,
+            prompt_version=prompt_version,
+            profile=profile,
+            timings=json.loads(timings),
+            created_at=datetime.fromtimestamp(created_at, tz=timezone.utc).isoformat(),
+            evaluation=CVEvaluationResponse.model_validate_json(evaluation)
+        )
+
+
+def _encode_cursor(sort_value: float, evaluation_id: int) -> str:
+    """Opaque cursor holding the sort key of the last row on a page."""
+    payload = json.dumps([sort_value, evaluation_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Decode a cursor from `_encode_cursor`.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, evaluation_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(sort_value), int(evaluation_id)
+    except (ValueError, TypeError, UnicodeEncodeError):
+        raise ValueError("Invalid cursor")
+
+
+def _epoch(moment: datetime) -> float:
+    """Convert a time to epoch seconds, reading a naive datetime as UTC like the stored times."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _escape_like(text: str) -> str:
+    """Escape LIKE wildcards so a name prefix matches literally."""
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
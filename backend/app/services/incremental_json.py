@@ -0,0 +1,125 @@
+"""
+Incremental JSON Parser.
+Parses a JSON object as it streams in and reports array items as soon as they close.
+"""
+
+import json
+from typing import Optional
+
+
+class IncrementalJSONParser:
+    """
+    Streaming scanner for a single JSON object in model output.
+    
+    Text before the first `{` (such as a ```json fence) and after the matching
+    `}` is ignored. While the document is still arriving, every object inside
+    the top-level array named `watch_key` is decoded and returned from `feed`
+    the moment its closing brace arrives.
+    """
+    
+    def __init__(self, watch_key: str = "criteria"):
+        """
+        Initialize the parser.
+        
+        Args:
+            watch_key: Top-level key whose array items should be emitted early
+        """
+        self.watch_key = watch_key
+        self._text = ""
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        # Open containers as (bracket, key the container was opened under)
+        self._stack: list[tuple[str, Optional[str]]] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._item_start: Optional[int] = None
+    
+    @property
+    def complete(self) -> bool:
+        """Whether the top-level object has been closed."""
+        return self._end is not None
+    
+    def feed(self, chunk: str) -> list[dict]:
+        """
+        Consume the next chunk of streamed text.
+        
+        Args:
+            chunk: Newly received text
+            
+        Returns:
+            Items of the watched array that were completed by this chunk
+        """
+        offset = len(self._text)
+        self._text += chunk
+        
+        if self.complete:
+            return []
+        
+        completed: list[dict] = []
+        for index, char in enumerate(chunk, start=offset):
+            if self._start is None:
+                if char == "{":
+                    self._start = index
+                    self._stack.append(("{", None))
+                continue
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = self._text[self._string_start:index + 1]
+                continue
+            
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char == ":":
+                self._key = json.loads(self._last_string) if self._last_string else None
+            elif char == ",":
+                self._key = None
+            elif char in "{[":
+                key = self._key if self._stack[-1][0] == "{" else None
+                if char == "{" and self._in_watched_array():
+                    self._item_start = index
+                self._stack.append((char, key))
+                self._key = None
+            elif char in "}]":
+                self._stack.pop()
+                if char == "}" and self._item_start is not None and self._in_watched_array():
+                    completed.append(json.loads(self._text[self._item_start:index + 1]))
+                    self._item_start = None
+                if not self._stack:
+                    self._end = index
+                    break
+        
+        return completed
+    
+    def result(self) -> dict:
+        """
+        Decode the full JSON object.
+        
+        Returns:
+            Parsed object
+            
+        Raises:
+            json.JSONDecodeError: If no complete, valid object was received
+        """
+        text = self._text
+        if self._start is None:
+            return json.loads(text.strip())
+        if self._end is None:
+            return json.loads(text[self._start:])
+        return json.loads(text[self._start:self._end + 1])
+    
+    def _in_watched_array(self) -> bool:
+        """Whether the innermost open container is the watched top-level array."""
+        return (
+            len(self._stack) == 2
+            and self._stack[-1] == ("[", self.watch_key)
+        )
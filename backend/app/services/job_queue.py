@@ -0,0 +1,545 @@
+"""
+Job Queue Service.
+Durable hand-off of uploaded CVs from the API to screening workers.
+"""
+
+import heapq
+import itertools
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+from ..metrics import QUEUE_DEPTH
+from ..models.schemas import CVEvaluationResponse, JobResponse, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue(ABC):
+    """
+    Interface shared by the queue backends.
+    
+    Jobs are claimed highest priority first, oldest first within a priority.
+    A claimed job holds a lease, which its worker renews while the job runs;
+    if the worker dies and the lease expires, the job becomes claimable again. Failed attempts are re-queued after a
+    delay until `max_attempts` is reached.
+    
+    Outcomes are recorded for a specific attempt: once a job has been
+    reclaimed after its lease expired, the worker that lost it can no
+    longer complete or fail it.
+    """
+    
+    @abstractmethod
+    def enqueue(
+        self,
+        pdf: bytes,
+        filename: str,
+        priority: int = 0,
+        profile: Optional[str] = None
+    ) -> JobResponse:
+        """
+        Add a CV to the queue.
+        
+        Args:
+            pdf: Raw PDF bytes
+            filename: Original filename
+            priority: Higher values are claimed first
+            profile: Screening profile name; None for the default profile
+        
+        Returns:
+            The queued job
+        """
+    
+    @abstractmethod
+    def claim(self, lease_seconds: float) -> Optional[JobResponse]:
+        """
+        Take the next runnable job and mark it running.
+        
+        Args:
+            lease_seconds: How long the job stays reserved for this worker
+        
+        Returns:
+            The claimed job, or None if nothing is runnable
+        """
+    
+    @abstractmethod
+    def payload(self, job_id: str) -> bytes:
+        """
+        Fetch the PDF bytes of a job.
+        
+        Raises:
+            ValueError: If the job or its payload no longer exists
+        """
+    
+    @abstractmethod
+    def renew(self, job_id: str, attempt: int, lease_seconds: float) -> bool:
+        """
+        Extend the lease of a running job.
+        
+        Args:
+            job_id: Job being processed
+            attempt: The job's `attempts` when it was claimed
+            lease_seconds: New lease, counted from now
+        
+        Returns:
+            False if that attempt no longer holds the job (nothing is changed)
+        """
+    
+    @abstractmethod
+    def complete(self, job_id: str, attempt: int, evaluation: CVEvaluationResponse) -> bool:
+        """
+        Store a job's result and mark it succeeded.
+        
+        Args:
+            job_id: Job that succeeded
+            attempt: The job's `attempts` when it was claimed
+            evaluation: Evaluation result
+        
+        Returns:
+            False if that attempt no longer holds the job (nothing is changed)
+        """
+    
+    @abstractmethod
+    def fail(
+        self,
+        job_id: str,
+        attempt: int,
+        error: str,
+        retry_delay_seconds: Optional[float] = None
+    ) -> Optional[JobResponse]:
+        """
+        Record a failed attempt.
+        
+        Args:
+            job_id: Job that failed
+            attempt: The job's `attempts` when it was claimed
+            error: Error message shown to clients
+            retry_delay_seconds: Re-queue after this delay if attempts remain;
+                None marks the job failed immediately
+        
+        Returns:
+            The job after the update, or None if that attempt no longer
+            holds the job (nothing is changed)
+        """
+    
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[JobResponse]:
+        """Look up a job, or None if it does not exist."""
+    
+    @abstractmethod
+    def stats(self) -> dict:
+        """Count jobs per status."""
+    
+    def close(self) -> None:
+        """Release backend resources."""
+
+
+class InMemoryJobQueue(JobQueue):
+    """
+    Queue held in this process, for single-process deployments and development.
+    Jobs are lost on restart and cannot be shared with separate worker processes.
+    """
+    
+    def __init__(self, max_attempts: int = 3, result_ttl_seconds: float = 86400):
+        """
+        Initialize an empty queue.
+        
+        Args:
+            max_attempts: Attempts allowed per job
+            result_ttl_seconds: How long finished jobs stay retrievable
+        """
+        self.max_attempts = max_attempts
+        self.result_ttl_seconds = result_ttl_seconds
+        self._finished_at: dict[str, float] = {}
+        self._jobs: dict[str, JobResponse] = {}
+        self._payloads: dict[str, bytes] = {}
+        self._available_at: dict[str, float] = {}
+        self._lease_until: dict[str, float] = {}
+        self._heap: list[tuple[int, int, str]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+    
+    def enqueue(
+        self,
+        pdf: bytes,
+        filename: str,
+        priority: int = 0,
+        profile: Optional[str] = None
+    ) -> JobResponse:
+        now = _timestamp()
+        job = JobResponse(
+            job_id=uuid.uuid4().hex,
+            status=JobStatus.QUEUED,
+            filename=filename,
+            priority=priority,
+            profile=profile,
+            max_attempts=self.max_attempts,
+            created_at=now,
+            updated_at=now
+        )
+        with self._lock:
+            self._purge_finished()
+            self._jobs[job.job_id] = job
+            self._payloads[job.job_id] = pdf
+            self._push(job, delay_seconds=0)
+            self._report_depth()
+        return job.model_copy()
+    
+    def claim(self, lease_seconds: float) -> Optional[JobResponse]:
+        now = time.monotonic()
+        with self._lock:
+            self._reclaim_expired(now)
+            deferred = []
+            claimed = None
+            while self._heap:
+                entry = heapq.heappop(self._heap)
+                job = self._jobs.get(entry[2])
+                if job is None or job.status != JobStatus.QUEUED:
+                    continue
+                if self._available_at[job.job_id] > now:
+                    deferred.append(entry)
+                    continue
+                claimed = job
+                break
+            for entry in deferred:
+                heapq.heappush(self._heap, entry)
+            
+            if claimed is None:
+                return None
+            claimed.status = JobStatus.RUNNING
+            claimed.attempts += 1
+            claimed.updated_at = _timestamp()
+            self._lease_until[claimed.job_id] = now + lease_seconds
+            self._report_depth()
+            return claimed.model_copy()
+    
+    def payload(self, job_id: str) -> bytes:
+        with self._lock:
+            pdf = self._payloads.get(job_id)
+        if pdf is None:
+            raise ValueError(f"No payload for job {job_id}")
+        return pdf
+    
+    def renew(self, job_id: str, attempt: int, lease_seconds: float) -> bool:
+        with self._lock:
+            if self._held(job_id, attempt) is None:
+                return False
+            self._lease_until[job_id] = time.monotonic() + lease_seconds
+            return True
+    
+    def complete(self, job_id: str, attempt: int, evaluation: CVEvaluationResponse) -> bool:
+        with self._lock:
+            job = self._held(job_id, attempt)
+            if job is None:
+                return False
+            job.status = JobStatus.SUCCEEDED
+            job.evaluation = evaluation
+            job.error = None
+            job.updated_at = _timestamp()
+            self._finish(job_id)
+            return True
+    
+    def fail(
+        self,
+        job_id: str,
+        attempt: int,
+        error: str,
+        retry_delay_seconds: Optional[float] = None
+    ) -> Optional[JobResponse]:
+        with self._lock:
+            job = self._held(job_id, attempt)
+            if job is None:
+                return None
+            job.error = error
+            job.updated_at = _timestamp()
+            self._lease_until.pop(job_id, None)
+            if retry_delay_seconds is not None and job.attempts < job.max_attempts:
+                job.status = JobStatus.QUEUED
+                self._push(job, delay_seconds=retry_delay_seconds)
+            else:
+                job.status = JobStatus.FAILED
+                self._finish(job_id)
+            self._report_depth()
+            return job.model_copy()
+    
+    def get(self, job_id: str) -> Optional[JobResponse]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job is not None else None
+    
+    def stats(self) -> dict:
+        with self._lock:
+            counts = Counter(job.status.value for job in self._jobs.values())
+        return {"backend": "memory", **{status.value: counts[status.value] for status in JobStatus}}
+    
+    def _held(self, job_id: str, attempt: int) -> Optional[JobResponse]:
+        """The job if it is still running the given attempt (it may have been reclaimed or purged)."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != JobStatus.RUNNING or job.attempts != attempt:
+            return None
+        return job
+    
+    def _push(self, job: JobResponse, delay_seconds: float, now: Optional[float] = None) -> None:
+        """Schedule a queued job; the heap orders by priority, then submission."""
+        self._available_at[job.job_id] = (now if now is not None else time.monotonic()) + delay_seconds
+        heapq.heappush(self._heap, (-job.priority, next(self._sequence), job.job_id))
+    
+    def _reclaim_expired(self, now: float) -> None:
+        """Re-queue running jobs whose lease ran out (e.g. a cancelled worker task)."""
+        for job_id, lease_until in list(self._lease_until.items()):
+            if lease_until > now:
+                continue
+            del self._lease_until[job_id]
+            job = self._jobs[job_id]
+            job.error = "Worker lease expired"
+            if job.attempts < job.max_attempts:
+                job.status = JobStatus.QUEUED
+                # Claimable by the very claim that found it expired
+                self._push(job, delay_seconds=0, now=now)
+            else:
+                job.status = JobStatus.FAILED
+                self._finish(job_id)
+    
+    def _finish(self, job_id: str) -> None:
+        """Drop the payload and scheduling state of a finished job."""
+        self._finished_at[job_id] = time.monotonic()
+        self._payloads.pop(job_id, None)
+        self._available_at.pop(job_id, None)
+        self._lease_until.pop(job_id, None)
+        self._report_depth()
+    
+    def _purge_finished(self) -> None:
+        """Forget finished jobs older than the result TTL."""
+        cutoff = time.monotonic() - self.result_ttl_seconds
+        for job_id, finished_at in list(self._finished_at.items()):
+            if finished_at <= cutoff:
+                del self._finished_at[job_id]
+                self._jobs.pop(job_id, None)
+    
+    def _report_depth(self) -> None:
+        QUEUE_DEPTH.set(
+            sum(1 for job in self._jobs.values() if job.status == JobStatus.QUEUED),
+            queue="jobs"
+        )
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Queue stored in a SQLite file.
+    
+    Several processes (API pods and `python -m app.worker` instances on the
+    same host or volume) can share one file: claims are single atomic
+    UPDATE statements, and leases let another worker pick up jobs whose
+    worker died.
+    """
+    
+    _COLUMNS = (
+        "id, status, filename, priority, attempts, max_attempts, "
+        "result, error, created_at, updated_at, profile"
+    )
+    
+    def __init__(self, path: str, max_attempts: int = 3, result_ttl_seconds: float = 86400):
+        """
+        Open (and create if needed) the queue database.
+        
+        Args:
+            path: SQLite file path
+            max_attempts: Attempts allowed per job
+            result_ttl_seconds: How long finished jobs stay retrievable
+        """
+        self.max_attempts = max_attempts
+        self.result_ttl_seconds = result_ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT NOT NULL, "
+            "priority INTEGER NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "max_attempts INTEGER NOT NULL, pdf BLOB, result TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "available_at REAL NOT NULL, lease_until REAL, profile TEXT)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "profile" not in columns:
+            # Queues created before screening profiles existed
+            self._db.execute("ALTER TABLE jobs ADD COLUMN profile TEXT")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_claim_order "
+            "ON jobs (status, priority DESC, created_at)"
+        )
+    
+    def enqueue(
+        self,
+        pdf: bytes,
+        filename: str,
+        priority: int = 0,
+        profile: Optional[str] = None
+    ) -> JobResponse:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at <= ?",
+                (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, now - self.result_ttl_seconds)
+            )
+            self._db.execute(
+                "INSERT INTO jobs (id, status, filename, priority, max_attempts, pdf, "
+                "created_at, updated_at, available_at, profile) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED.value, filename, priority, self.max_attempts,
+                 pdf, now, now, now, profile)
+            )
+        return self.get(job_id)
+    
+    def claim(self, lease_seconds: float) -> Optional[JobResponse]:
+        now = time.time()
+        with self._lock:
+            self._reclaim_expired(now)
+            row = self._db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, "
+                "lease_until = ?, updated_at = ? "
+                "WHERE id = (SELECT id FROM jobs WHERE status = ? AND available_at <= ? "
+                "ORDER BY priority DESC, created_at LIMIT 1) "
+                f"RETURNING {self._COLUMNS}",
+                (JobStatus.RUNNING.value, now + lease_seconds, now, JobStatus.QUEUED.value, now)
+            ).fetchone()
+        return self._to_job(row) if row is not None else None
+    
+    def payload(self, job_id: str) -> bytes:
+        with self._lock:
+            row = self._db.execute("SELECT pdf FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None or row[0] is None:
+            raise ValueError(f"No payload for job {job_id}")
+        return row[0]
+    
+    def renew(self, job_id: str, attempt: int, lease_seconds: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (now + lease_seconds, now, job_id, JobStatus.RUNNING.value, attempt)
+            )
+        return cursor.rowcount > 0
+    
+    def complete(self, job_id: str, attempt: int, evaluation: CVEvaluationResponse) -> bool:
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, pdf = NULL, "
+                "lease_until = NULL, updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (JobStatus.SUCCEEDED.value, evaluation.model_dump_json(), time.time(),
+                 job_id, JobStatus.RUNNING.value, attempt)
+            )
+        return cursor.rowcount > 0
+    
+    def fail(
+        self,
+        job_id: str,
+        attempt: int,
+        error: str,
+        retry_delay_seconds: Optional[float] = None
+    ) -> Optional[JobResponse]:
+        now = time.time()
+        updated = 0
+        with self._lock:
+            if retry_delay_seconds is not None:
+                updated = self._db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_until = NULL, available_at = ?, "
+                    "updated_at = ? WHERE id = ? AND status = ? AND attempts = ? AND attempts < max_attempts",
+                    (JobStatus.QUEUED.value, error, now + retry_delay_seconds, now,
+                     job_id, JobStatus.RUNNING.value, attempt)
+                ).rowcount
+            if not updated:
+                updated = self._db.execute(
+                    "UPDATE jobs SET status = ?, error = ?, pdf = NULL, lease_until = NULL, "
+                    "updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+                    (JobStatus.FAILED.value, error, now, job_id, JobStatus.RUNNING.value, attempt)
+                ).rowcount
+        return self.get(job_id) if updated else None
+    
+    def get(self, job_id: str) -> Optional[JobResponse]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_job(row) if row is not None else None
+    
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        QUEUE_DEPTH.set(counts.get(JobStatus.QUEUED.value, 0), queue="jobs")
+        return {"backend": "sqlite", **{status.value: counts.get(status.value, 0) for status in JobStatus}}
+    
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+    
+    def _reclaim_expired(self, now: float) -> None:
+        """Re-queue (or fail, if out of attempts) running jobs whose lease ran out."""
+        self._db.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+            "pdf = CASE WHEN attempts < max_attempts THEN pdf END, "
+            "error = 'Worker lease expired', lease_until = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_until <= ?",
+            (JobStatus.QUEUED.value, JobStatus.FAILED.value, now, JobStatus.RUNNING.value, now)
+        )
+    
+    @staticmethod
+    def _to_job(row: tuple) -> JobResponse:
+        (job_id, status, filename, priority, attempts, max_attempts,
+         result, error, created, updated, profile) = row
+        return JobResponse(
+            job_id=job_id,
+            status=JobStatus(status),
+            filename=filename,
+            priority=priority,
+            profile=profile,
+            attempts=attempts,
+            max_attempts=max_attempts,
+            evaluation=CVEvaluationResponse.model_validate_json(result) if result else None,
+            error=error,
+            created_at=_timestamp(created),
+            updated_at=_timestamp(updated)
+        )
+
+
+def create_job_queue(
+    backend: str,
+    sqlite_path: str,
+    max_attempts: int,
+    result_ttl_seconds: float
+) -> JobQueue:
+    """
+    Build the configured queue backend.
+    
+    Args:
+        backend: "memory" or "sqlite"
+        sqlite_path: Database path for the SQLite backend
+        max_attempts: Attempts allowed per job
+        result_ttl_seconds: How long finished jobs stay retrievable
+    
+    Returns:
+        The queue
+    
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if backend == "memory":
+        return InMemoryJobQueue(max_attempts=max_attempts, result_ttl_seconds=result_ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteJobQueue(
+            sqlite_path,
+            max_attempts=max_attempts,
+            result_ttl_seconds=result_ttl_seconds
+        )
+    raise ValueError(f"Unknown job queue backend: {backend}")
+
+
+def _timestamp(epoch: Optional[float] = None) -> str:
+    """ISO 8601 UTC timestamp for API responses."""
+    moment = datetime.fromtimestamp(epoch if epoch is not None else time.time(), tz=timezone.utc)
+    return moment.isoformat()
@@ -0,0 +1,161 @@
+"""
+Job Worker Service.
+Runs queued screening jobs through the screening pipeline.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+from .job_queue import JobQueue
+from .rate_limiter import RateLimitExceeded
+from .screening_pipeline import ScreeningPipeline
+from ..models.schemas import JobResponse
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Pulls jobs from a queue and screens them with a bounded number of tasks.
+    
+    The same worker runs inside the API process (for the in-memory queue)
+    or standalone via `python -m app.worker` against a shared SQLite queue.
+    Invalid PDFs and unusable AI responses fail a job immediately; shed
+    calls and unexpected errors are retried with exponential backoff.
+    
+    While a job runs, its lease is renewed every third of `lease_seconds`,
+    so a slow evaluation (timeouts, rate-limit retries) is never reclaimed
+    and paid for twice; only a dead worker's jobs are picked up again.
+    """
+    
+    def __init__(
+        self,
+        queue: JobQueue,
+        pipeline: ScreeningPipeline,
+        concurrency: int = 2,
+        poll_interval_seconds: float = 0.5,
+        lease_seconds: float = 300.0,
+        retry_delay_seconds: float = 5.0
+    ):
+        """
+        Configure the worker.
+        
+        Args:
+            queue: Queue to pull jobs from
+            pipeline: Pipeline used to screen each CV
+            concurrency: Jobs processed at the same time
+            poll_interval_seconds: Delay between polls when the queue is empty
+            lease_seconds: How long a claimed job stays reserved without a renewal
+                before others may retry it
+            retry_delay_seconds: Base delay before a failed job is retried
+        """
+        self.queue = queue
+        self.pipeline = pipeline
+        self.concurrency = concurrency
+        self.poll_interval_seconds = poll_interval_seconds
+        self.lease_seconds = lease_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self._tasks: list[asyncio.Task] = []
+    
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"job-worker-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} job worker tasks")
+    
+    async def stop(self) -> None:
+        """Cancel the worker tasks; interrupted jobs are retried once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+    
+    async def run_forever(self) -> None:
+        """Run the worker tasks until cancelled."""
+        self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+    
+    async def _run(self) -> None:
+        """Claim and process jobs one at a time."""
+        while True:
+            try:
+                job = await asyncio.to_thread(self.queue.claim, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}")
+                job = None
+            
+            if job is None:
+                await asyncio.sleep(self.poll_interval_seconds)
+                continue
+            try:
+                await self.process(job)
+            except Exception as e:
+                # Never let one job end this task; the job is retried once its lease expires
+                logger.error(f"Failed to record the outcome of job {job.job_id}: {e}")
+    
+    async def process(self, job: JobResponse) -> None:
+        """
+        Screen one claimed job and record its outcome, renewing its lease meanwhile.
+        
+        Args:
+            job: Job returned by `JobQueue.claim`
+        """
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self._process(job)
+        finally:
+            heartbeat.cancel()
+    
+    async def _process(self, job: JobResponse) -> None:
+        """Screen one claimed job and record its outcome."""
+        logger.info(f"Processing job {job.job_id} ({job.filename}), attempt {job.attempts}")
+        retry_delay: Optional[float] = None
+        
+        try:
+            profile = self.pipeline.profile(job.profile)
+            pdf = await asyncio.to_thread(self.queue.payload, job.job_id)
+            evaluation = await self.pipeline.run(pdf, job.filename, profile)
+            if await asyncio.to_thread(self.queue.complete, job.job_id, job.attempts, evaluation):
+                logger.info(f"Job {job.job_id} succeeded")
+            else:
+                logger.warning(f"Job {job.job_id} was reclaimed after its lease expired, result discarded")
+            return
+        except RateLimitExceeded as e:
+            error = str(e)
+            retry_delay = max(e.retry_after, self._backoff(job.attempts))
+        except ValueError as e:
+            error = str(e)
+        except Exception as e:
+            logger.error(f"Unexpected error processing job {job.job_id}: {e}")
+            error = "An unexpected error occurred while processing the CV"
+            retry_delay = self._backoff(job.attempts)
+        
+        updated = await asyncio.to_thread(self.queue.fail, job.job_id, job.attempts, error, retry_delay)
+        if updated is None:
+            logger.warning(f"Job {job.job_id} was reclaimed after its lease expired, failure ({error}) discarded")
+        elif not updated.is_finished and retry_delay is not None:
+            logger.warning(f"Job {job.job_id} failed ({error}), retrying in {retry_delay:.1f}s")
+        else:
+            logger.error(f"Job {job.job_id} failed: {error}")
+    
+    async def _heartbeat(self, job: JobResponse) -> None:
+        """Renew a job's lease until cancelled or until the job is lost to another worker."""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                held = await asyncio.to_thread(self.queue.renew, job.job_id, job.attempts, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Failed to renew the lease of job {job.job_id}: {e}")
+                continue
+            if not held:
+                logger.warning(f"Job {job.job_id} lost its lease to another worker")
+                return
+    
+    def _backoff(self, attempts: int) -> float:
+        """Exponential retry delay for the given number of attempts so far."""
+        return self.retry_delay_seconds * (2 ** max(0, attempts - 1))
@@ -0,0 +1,94 @@
+"""
+Keyword Matcher.
+Aho-Corasick automaton for finding many keywords in a single pass over the text.
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern, case-insensitive keyword matcher.
+    
+    All keywords are compiled once into an Aho-Corasick automaton, so
+    scanning a CV costs one pass over its characters regardless of how many
+    keywords are registered. Matches must sit on word boundaries, so
+    "python" matches "Python," but not "pythonic".
+    """
+    
+    def __init__(self, lexicons: dict[str, list[str]]):
+        """
+        Compile the automaton.
+        
+        Args:
+            lexicons: Category name -> keywords belonging to it
+        """
+        # Node 0 is the root; each node has transitions, a fail link and outputs
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[tuple[str, str]]] = [[]]
+        
+        for category, keywords in lexicons.items():
+            for keyword in keywords:
+                self._add(keyword.lower(), category)
+        self._build_fail_links()
+    
+    def find(self, text: str) -> dict[str, set[str]]:
+        """
+        Find all keywords present in the text.
+        
+        Args:
+            text: Text to scan
+            
+        Returns:
+            Category -> set of keywords found (categories without hits are omitted)
+        """
+        found: dict[str, set[str]] = {}
+        lowered = text.lower()
+        state = 0
+        
+        for index, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            
+            for keyword, category in self._outputs[state]:
+                start = index - len(keyword) + 1
+                if _is_boundary(lowered, start - 1) and _is_boundary(lowered, index + 1):
+                    found.setdefault(category, set()).add(keyword)
+        
+        return found
+    
+    def _add(self, keyword: str, category: str) -> None:
+        """Insert one keyword into the trie."""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        self._outputs[state].append((keyword, category))
+    
+    def _build_fail_links(self) -> None:
+        """Compute fail links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Whether position `index` is outside the text or not a word character."""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
@@ -0,0 +1,378 @@
+"""
+Near-Duplicate Index Service.
+Finds stored CVs whose text is nearly identical to a new one, using MinHash
+signatures with LSH banding.
+"""
+
+import hashlib
+import logging
+import operator
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from collections import Counter
+from typing import Iterable, Optional, Union
+from ..metrics import NEAR_DUPLICATE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+POLICY_OFF = "off"
+POLICY_FLAG = "flag"
+POLICY_REUSE = "reuse"
+
+# Words per shingle: small enough that a changed phone number or a moved
+# bullet only touches a handful of shingles
+SHINGLE_WORDS = 3
+
+# File layout: header, then fixed-size records (evaluation ID, signature)
+MAGIC = b"CVND"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHH")
+RECORD_ID = struct.Struct("<Q")
+
+EMPTY_BIN = 0xFFFFFFFF
+# Offset added per bin when an empty bin borrows a neighbour's value
+ROTATION_OFFSET = 0x9E3779B1
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index over the text of stored evaluations.
+    
+    Each text is reduced to its set of word shingles, and the set to a
+    fixed-size MinHash signature: one-permutation hashing (every shingle is
+    hashed once and kept as the minimum of one of `num_perm` bins) with
+    rotation for empty bins, so a signature costs one hash per shingle.
+    The share of equal signature values estimates the Jaccard similarity of
+    two shingle sets.
+    
+    Signatures are cut into `bands` bands; texts sharing any band land in
+    the same bucket, so a lookup only compares the few candidates sharing a
+    bucket instead of the whole corpus. With rows r = num_perm / bands, a
+    pair of similarity s becomes a candidate with probability
+    1 - (1 - s^r)^bands.
+    
+    Signatures are appended to a binary file as they are inserted, and the
+    buckets are rebuilt from it at startup without re-reading any text.
+    Processes sharing the file (API workers, the job worker) pick up each
+    other's records with `refresh`.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str],
+        policy: str = POLICY_FLAG,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        bands: int = 16
+    ):
+        """
+        Create an index and load its file, if present.
+        
+        Args:
+            path: Signature file; None keeps the index in memory only
+            policy: One of "off", "flag" or "reuse"
+            threshold: Minimum estimated similarity counted as a near-duplicate
+            num_perm: Signature length (MinHash bins)
+            bands: LSH bands; must divide num_perm
+        """
+        if policy not in (POLICY_OFF, POLICY_FLAG, POLICY_REUSE):
+            raise ValueError(f"Unknown near-duplicate policy: {policy}")
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Near-duplicate threshold must be in (0, 1], got {threshold}")
+        if bands <= 0 or num_perm % bands:
+            raise ValueError(f"Near-duplicate bands ({bands}) must divide num_perm ({num_perm})")
+        
+        self.path = path
+        self.policy = policy
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.lookups: Counter[str] = Counter()
+        self.last_id = 0
+        
+        # Bytes of the signature file read so far
+        self._offset = 0
+        self._lock = threading.Lock()
+        self._ids = array("Q")
+        self._signatures = array("I")
+        self._known: set[int] = set()
+        # Band key -> position of the one text in the bucket, or a list of positions
+        self._buckets: list[dict[int, Union[int, list[int]]]] = [{} for _ in range(bands)]
+        
+        if path:
+            self._load()
+    
+    @property
+    def record_size(self) -> int:
+        """Bytes per record in the signature file."""
+        return RECORD_ID.size + 4 * self.num_perm
+    
+    def signature(self, text: str) -> Optional[array]:
+        """
+        Compute the MinHash signature of some text.
+        
+        Args:
+            text: CV text
+        
+        Returns:
+            Signature of `num_perm` unsigned 32-bit values, or None if the
+            text has no words
+        """
+        words = WORD_PATTERN.findall(text.lower())
+        if not words:
+            return None
+        shingles = {
+            " ".join(words[i:i + SHINGLE_WORDS])
+            for i in range(max(len(words) - SHINGLE_WORDS + 1, 1))
+        }
+        
+        bins = [EMPTY_BIN] * self.num_perm
+        for shingle in shingles:
+            value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+            slot = value % self.num_perm
+            value >>= 32
+            if value < bins[slot]:
+                bins[slot] = value
+        
+        if EMPTY_BIN in bins:
+            filled = [slot for slot, value in enumerate(bins) if value != EMPTY_BIN]
+            for slot in range(self.num_perm):
+                if bins[slot] == EMPTY_BIN:
+                    # Borrow from the next filled bin to the right (circularly)
+                    source = next((f for f in filled if f > slot), filled[0])
+                    distance = (source - slot) % self.num_perm
+                    bins[slot] = (bins[source] + distance * ROTATION_OFFSET) % EMPTY_BIN
+        return array("I", bins)
+    
+    def insert(self, evaluation_id: int, text: str) -> bool:
+        """
+        Add a stored evaluation's text to the index and its file.
+        
+        Args:
+            evaluation_id: Evaluation store record ID
+            text: Text the evaluation was based on
+        
+        Returns:
+            Whether the text was indexed (False if it has no words or the ID is known)
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return False
+        with self._lock:
+            if evaluation_id in self._known:
+                return False
+            self._add(evaluation_id, signature.tobytes())
+            if self.path:
+                self._append(evaluation_id, signature)
+        return True
+    
+    def query(self, text: str) -> list[tuple[int, float]]:
+        """
+        Find indexed evaluations whose text is a near-duplicate.
+        
+        Args:
+            text: CV text
+        
+        Returns:
+            (evaluation ID, estimated similarity) pairs at or above the
+            threshold, most similar first
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return []
+        
+        with self._lock:
+            candidates: set[int] = set()
+            for band, key in enumerate(self._band_keys(signature.tobytes())):
+                bucket = self._buckets[band].get(key)
+                if isinstance(bucket, int):
+                    candidates.add(bucket)
+                elif bucket is not None:
+                    candidates.update(bucket)
+            
+            matches = []
+            for position in candidates:
+                start = position * self.num_perm
+                equal = sum(map(operator.eq, signature, self._signatures[start:start + self.num_perm]))
+                similarity = equal / self.num_perm
+                if similarity >= self.threshold:
+                    matches.append((self._ids[position], round(similarity, 4)))
+        
+        matches.sort(key=lambda match: (-match[1], -match[0]))
+        return matches
+    
+    def refresh(self) -> int:
+        """
+        Load records other processes appended to the signature file since it was last read.
+        
+        Returns:
+            Number of records added
+        """
+        if not self.path:
+            return 0
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                return 0
+            count = (size - self._offset) // self.record_size
+            if count <= 0:
+                return 0
+            with open(self.path, "rb") as file:
+                file.seek(self._offset)
+                data = file.read(count * self.record_size)
+            count = len(data) // self.record_size
+            before = len(self._ids)
+            self._add_records(data, 0, count * self.record_size)
+            self._offset += count * self.record_size
+            return len(self._ids) - before
+    
+    def sync(self, records: Iterable[tuple[int, str, str]]) -> int:
+        """
+        Index records missing from the file, e.g. from an evaluation store's `iter_texts`.
+        
+        Args:
+            records: (ID, text, ...) tuples in ID order
+        
+        Returns:
+            Number of records added
+        """
+        started = time.perf_counter()
+        added = sum(1 for evaluation_id, text, *_ in records if self.insert(evaluation_id, text))
+        if added:
+            logger.info(
+                f"Indexed {added} stored CVs for near-duplicate detection "
+                f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+        return added
+    
+    def record(self, outcome: str) -> None:
+        """
+        Count a lookup outcome locally and in metrics.
+        
+        Args:
+            outcome: miss, flagged or reused
+        """
+        self.lookups[outcome] += 1
+        NEAR_DUPLICATE_LOOKUPS.inc(policy=self.policy, outcome=outcome)
+    
+    def stats(self) -> dict:
+        """
+        Report index size and lookup outcomes.
+        
+        Returns:
+            Policy, threshold, LSH shape, indexed texts, counts per outcome and the near-duplicate rate
+        """
+        total = sum(self.lookups.values())
+        matched = self.lookups["flagged"] + self.lookups["reused"]
+        return {
+            "policy": self.policy,
+            "threshold": self.threshold,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "indexed": len(self._ids),
+            "lookups": total,
+            "flagged": self.lookups["flagged"],
+            "reused": self.lookups["reused"],
+            "near_duplicate_rate": round(matched / total, 4) if total else 0.0,
+        }
+    
+    def _band_keys(self, raw: bytes) -> list[int]:
+        """Hash each band of a signature (as native-order bytes) to its bucket key."""
+        step = 4 * self.rows
+        return [hash(raw[start:start + step]) for start in range(0, len(raw), step)]
+    
+    def _add(self, evaluation_id: int, raw: bytes) -> None:
+        """
+        Add a signature (as native-order bytes) to memory and its buckets.
+        The caller holds the lock.
+        
+        Buckets hold a bare position until a second text shares them: most
+        are never shared, and plain ints keep the garbage collector from
+        rescanning a list per bucket while a large file loads.
+        """
+        position = len(self._ids)
+        self._ids.append(evaluation_id)
+        self._signatures.frombytes(raw)
+        self._known.add(evaluation_id)
+        self.last_id = max(self.last_id, evaluation_id)
+        for band, key in enumerate(self._band_keys(raw)):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                self._buckets[band][key] = position
+            elif isinstance(bucket, int):
+                self._buckets[band][key] = [bucket, position]
+            else:
+                bucket.append(position)
+    
+    def _append(self, evaluation_id: int, signature: array) -> None:
+        """Append one record to the signature file; the caller holds the lock."""
+        if sys.byteorder == "big":
+            signature = array("I", signature)
+            signature.byteswap()
+        with open(self.path, "ab") as file:
+            file.write(RECORD_ID.pack(evaluation_id) + signature.tobytes())
+            end = file.tell()
+        # Skip our own record on the next refresh unless another process wrote in between
+        if end == self._offset + self.record_size:
+            self._offset = end
+    
+    def _add_records(self, data: bytes, start: int, end: int) -> None:
+        """Add the file records in data[start:end], skipping known IDs; the caller holds the lock or is loading."""
+        for offset in range(start, end, self.record_size):
+            (evaluation_id,) = RECORD_ID.unpack_from(data, offset)
+            if evaluation_id in self._known:
+                continue
+            raw = data[offset + RECORD_ID.size:offset + self.record_size]
+            if sys.byteorder == "big":
+                signature = array("I")
+                signature.frombytes(raw)
+                signature.byteswap()
+                raw = signature.tobytes()
+            self._add(evaluation_id, raw)
+    
+    def _load(self) -> None:
+        """
+        Read the signature file, or start a new one.
+        
+        A file written with another signature length or shingle size is
+        replaced, and a record cut short by a crash is dropped.
+        """
+        started = time.perf_counter()
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, self.num_perm, SHINGLE_WORDS)
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            data = b""
+        
+        if data[:HEADER.size] != header:
+            if data:
+                logger.warning(f"Near-duplicate index {self.path} has another format, rebuilding it")
+            with open(self.path + ".tmp", "wb") as file:
+                file.write(header)
+            os.replace(self.path + ".tmp", self.path)
+            self._offset = HEADER.size
+            return
+        
+        count = (len(data) - HEADER.size) // self.record_size
+        end = HEADER.size + count * self.record_size
+        self._add_records(data, HEADER.size, end)
+        self._offset = end
+        
+        if len(data) > end:
+            with open(self.path, "r+b") as file:
+                file.truncate(end)
+        
+        logger.info(
+            f"Loaded {len(self._ids)} near-duplicate signatures "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
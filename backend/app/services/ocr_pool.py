@@ -0,0 +1,219 @@
+"""
+OCR Pool.
+Runs OCR of scanned PDF pages in its own worker processes, page by page.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+from .ocr_service import OCRService
+from .pdf_pool import terminate_executor
+from .pdf_service import NO_TEXT_ERROR
+from ..metrics import OCR_PAGES, QUEUE_DEPTH, STAGE_DURATION
+from ..models.schemas import PDFIngestionResult
+
+logger = logging.getLogger(__name__)
+
+
+class OCRPool:
+    """
+    Process pool that OCRs the pages text extraction left empty.
+    
+    Each empty page is its own task, so the pages of one scan are read in
+    parallel. The pool is separate from the PDF extraction pool, so slow
+    scans never hold up ordinary uploads. Every document gets a page cap
+    and a time budget: pages past the cap are skipped, queued pages are
+    cancelled when the budget runs out, and a running Tesseract is stopped
+    at the same deadline, so no worker is tied up past it. Workers render
+    one page at a time in memory and release it before the next.
+    """
+    
+    def __init__(
+        self,
+        workers: int,
+        max_pages: int,
+        timeout_seconds: float,
+        dpi: int = 300,
+        language: str = "eng",
+        max_tasks_per_child: int = 100
+    ):
+        """
+        Check the OCR dependencies and configure the pool. Worker processes
+        are started lazily on first use.
+        
+        Args:
+            workers: Number of worker processes (at least 1)
+            max_pages: Most pages OCR'd per document
+            timeout_seconds: Per-document OCR budget
+            dpi: Page rendering resolution
+            language: Tesseract language code(s)
+            max_tasks_per_child: Pages a worker reads before being recycled
+        
+        Raises:
+            ValueError: If pytesseract, pypdfium2 or the tesseract binary is missing
+        """
+        if workers < 1:
+            raise ValueError("OCR needs at least one worker process")
+        try:
+            import pypdfium2  # noqa: F401
+            import pytesseract
+        except ImportError:
+            raise ValueError("OCR requires pytesseract and pypdfium2 (pip install pytesseract pypdfium2)")
+        try:
+            self.tesseract_version = str(pytesseract.get_tesseract_version())
+        except Exception as e:
+            raise ValueError(f"OCR requires the tesseract binary: {e}")
+        
+        self.workers = workers
+        self.max_pages = max_pages
+        self.timeout_seconds = timeout_seconds
+        self.dpi = dpi
+        self.language = language
+        self.max_tasks_per_child = max_tasks_per_child
+        self.documents = 0
+        self.pages: Counter[str] = Counter()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+    
+    async def complete(self, source: Union[bytes, str], ingestion: PDFIngestionResult) -> PDFIngestionResult:
+        """
+        OCR the pages of a parsed PDF that came out without text.
+        
+        Args:
+            source: Raw PDF bytes, or a path the workers can open directly
+            ingestion: Result of text extraction
+        
+        Returns:
+            The ingestion with OCR text filled in (and the no-text error
+            cleared if OCR found text); unchanged if there was nothing to OCR
+        """
+        if ingestion.errors and ingestion.errors != [NO_TEXT_ERROR]:
+            return ingestion
+        blank = [index for index, page in enumerate(ingestion.pages) if not page.strip()]
+        if not blank:
+            return ingestion
+        
+        selected = blank[:self.max_pages]
+        if len(blank) > len(selected):
+            logger.warning(f"OCR limited to {self.max_pages} of {len(blank)} pages without text")
+            self._record("capped", len(blank) - len(selected))
+        
+        self.documents += 1
+        started = time.perf_counter()
+        deadline = time.time() + self.timeout_seconds
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        read_page = functools.partial(
+            OCRService.ocr_page,
+            source,
+            deadline=deadline,
+            dpi=self.dpi,
+            language=self.language
+        )
+        tasks = {loop.run_in_executor(executor, read_page, index): index for index in selected}
+        
+        self._pending += len(tasks)
+        self._report_queue_depth()
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=self.timeout_seconds)
+        finally:
+            self._pending -= len(tasks)
+            self._report_queue_depth()
+        
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"OCR time budget of {self.timeout_seconds:g}s ran out with {len(pending)} pages left")
+            self._record("timeout", len(pending))
+        
+        pages = list(ingestion.pages)
+        ocr_pages: list[int] = []
+        for task in done:
+            index = tasks[task]
+            try:
+                text = task.result()
+            except BrokenProcessPool:
+                logger.error("OCR worker process died, restarting pool")
+                self._restart(executor)
+                self._record("error")
+                continue
+            except TimeoutError as e:
+                logger.warning(f"OCR of page {index + 1} timed out: {e}")
+                self._record("timeout")
+                continue
+            except Exception as e:
+                logger.warning(f"OCR of page {index + 1} failed: {e}")
+                self._record("error")
+                continue
+            self._record("text" if text else "empty")
+            if text:
+                pages[index] = text
+                ocr_pages.append(index)
+        
+        elapsed = time.perf_counter() - started
+        STAGE_DURATION.observe(elapsed, stage="ocr", outcome="success" if ocr_pages else "error")
+        logger.info(f"OCR read {len(ocr_pages)} of {len(selected)} pages in {elapsed * 1000:.0f}ms")
+        
+        result = ingestion.model_copy(update={
+            "pages": pages,
+            "ocr_pages": sorted(ocr_pages),
+            "ocr_ms": elapsed * 1000,
+        })
+        if result.errors and result.text.strip():
+            result.errors = []
+        return result
+    
+    def stats(self) -> dict:
+        """
+        Report OCR usage.
+        
+        Returns:
+            Pool settings, documents OCR'd and pages per outcome
+        """
+        return {
+            "workers": self.workers,
+            "max_pages": self.max_pages,
+            "timeout_seconds": self.timeout_seconds,
+            "tesseract": self.tesseract_version,
+            "documents": self.documents,
+            "pages": dict(self.pages),
+        }
+    
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+    
+    def _record(self, outcome: str, count: int = 1) -> None:
+        """Count pages by outcome, locally and in metrics."""
+        self.pages[outcome] += count
+        OCR_PAGES.inc(count, outcome=outcome)
+    
+    def _report_queue_depth(self) -> None:
+        """Publish how many pages are waiting for a free worker."""
+        QUEUE_DEPTH.set(max(0, self._pending - self.workers), queue="ocr_pool")
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the running executor, creating it on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # max_tasks_per_child is not supported with the fork start method
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child
+            )
+        return self._executor
+    
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Kill the given executor's workers so a fresh pool is built next time."""
+        if executor is not self._executor:
+            return
+        self._executor = None
+        terminate_executor(executor)
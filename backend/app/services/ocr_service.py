@@ -0,0 +1,81 @@
+"""
+OCR Service.
+Reads the text of PDF pages that have no text layer (scans) with Tesseract.
+"""
+
+import time
+from typing import Union
+
+# Largest bitmap rendered for one page; an A4 page at 300 DPI is ~8.7M pixels
+MAX_PAGE_PIXELS = 25_000_000
+
+
+class OCRService:
+    """
+    Page-level OCR, run inside the OCR pool's worker processes.
+    
+    Requires pypdfium2 (rendering) and pytesseract with the `tesseract`
+    binary; both are imported on first use so the rest of the app does not
+    depend on them.
+    """
+    
+    @staticmethod
+    def ocr_page(
+        source: Union[bytes, str],
+        page_index: int,
+        deadline: float,
+        dpi: int = 300,
+        language: str = "eng"
+    ) -> str:
+        """
+        Render one page in memory and OCR it.
+        
+        The page is rendered in grayscale, capped at MAX_PAGE_PIXELS, and
+        the bitmap is released before returning, so a worker holds at most
+        one page image at a time.
+        
+        Args:
+            source: Raw PDF bytes or a file path
+            page_index: Page to read (0-based)
+            deadline: Wall-clock time (`time.time()`) by which Tesseract is stopped
+            dpi: Rendering resolution
+            language: Tesseract language code(s), e.g. "eng" or "eng+deu"
+        
+        Returns:
+            Text of the page (empty if none was recognized)
+        
+        Raises:
+            TimeoutError: If the deadline has passed or Tesseract was stopped at it
+            RuntimeError: If Tesseract fails
+        """
+        import pypdfium2
+        import pytesseract
+        
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise TimeoutError("OCR time budget exhausted")
+        
+        document = pypdfium2.PdfDocument(source)
+        try:
+            page = document[page_index]
+            try:
+                width, height = page.get_size()
+                scale = dpi / 72
+                pixels = width * height * scale * scale
+                if pixels > MAX_PAGE_PIXELS:
+                    scale *= (MAX_PAGE_PIXELS / pixels) ** 0.5
+                bitmap = page.render(scale=scale, grayscale=True)
+                try:
+                    image = bitmap.to_pil()
+                    return pytesseract.image_to_string(image, lang=language, timeout=remaining).strip()
+                except RuntimeError as e:
+                    # pytesseract reports a stopped process as a plain RuntimeError
+                    if "timeout" in str(e).lower():
+                        raise TimeoutError(f"OCR stopped at the time budget: {e}")
+                    raise
+                finally:
+                    bitmap.close()
+            finally:
+                page.close()
+        finally:
+            document.close()
@@ -0,0 +1,284 @@
+"""
+PDF Text Extraction Backends.
+Interchangeable text extractors used by the PDF service, plus the checks that
+decide when a fast backend's output is too poor to use.
+"""
+
+import io
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Optional, Union
+import pdfplumber
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LAParams, LTTextBox, LTTextLine
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from ..models.schemas import PDFTextExtraction
+
+# Unmapped glyphs: pdfminer writes "(cid:NN)", others a replacement character
+GARBLED_PATTERN = re.compile(r"\(cid:\d+\)|\ufffd|[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class PDFTextBackend(ABC):
+    """
+    Interface shared by the extraction backends.
+    
+    `extract` raises ValueError with a user-facing message: "Invalid PDF
+    file: ..." when the document cannot be opened, "Failed to process
+    PDF: ..." when a page cannot be read.
+    """
+    
+    name = ""
+    
+    @abstractmethod
+    def extract(self, stream: BinaryIO) -> PDFTextExtraction:
+        """
+        Extract the text of every page.
+        
+        Args:
+            stream: Binary stream positioned at the start of the PDF
+        
+        Returns:
+            Page texts, page count and timings
+        """
+
+
+class PDFPlumberBackend(PDFTextBackend):
+    """
+    Reference backend: pdfplumber's character-level layout analysis.
+    Slowest, but the output every other backend is compared against.
+    """
+    
+    name = "pdfplumber"
+    
+    def extract(self, stream: BinaryIO) -> PDFTextExtraction:
+        started = time.perf_counter()
+        try:
+            pdf = pdfplumber.open(stream)
+            page_count = len(pdf.pages)
+        except Exception as e:
+            raise ValueError(f"Invalid PDF file: {e}")
+        opened = time.perf_counter()
+        
+        with pdf:
+            try:
+                pages = [page.extract_text() or "" for page in pdf.pages]
+            except Exception as e:
+                raise ValueError(f"Failed to process PDF: {e}")
+        
+        return PDFTextExtraction(
+            backend=self.name,
+            page_count=page_count,
+            pages=pages,
+            open_ms=(opened - started) * 1000,
+            extract_ms=(time.perf_counter() - opened) * 1000
+        )
+
+
+class PDFMinerBackend(PDFTextBackend):
+    """
+    pdfminer.six layout analysis tuned for plain CV text.
+    
+    Skips what pdfplumber and the pdfminer defaults spend most of their time
+    on: per-character objects for the caller, vertical text detection, text
+    inside figures and the hierarchical ordering of text boxes. Boxes are
+    read top to bottom instead, which is why pages with side-by-side columns
+    are flagged for the fallback.
+    """
+    
+    name = "pdfminer"
+    
+    LAPARAMS = LAParams(
+        line_margin=0.5,
+        char_margin=2.0,
+        word_margin=0.1,
+        boxes_flow=None,
+        detect_vertical=False,
+        all_texts=False
+    )
+    
+    def extract(self, stream: BinaryIO) -> PDFTextExtraction:
+        started = time.perf_counter()
+        try:
+            document = PDFDocument(PDFParser(stream))
+            pdf_pages = list(PDFPage.create_pages(document))
+        except Exception as e:
+            raise ValueError(f"Invalid PDF file: {e}")
+        opened = time.perf_counter()
+        
+        resources = PDFResourceManager(caching=True)
+        device = PDFPageAggregator(resources, laparams=self.LAPARAMS)
+        interpreter = PDFPageInterpreter(resources, device)
+        
+        pages: list[str] = []
+        multi_column = False
+        try:
+            for pdf_page in pdf_pages:
+                interpreter.process_page(pdf_page)
+                layout = device.get_result()
+                boxes = [item for item in layout if isinstance(item, LTTextBox)]
+                pages.append("".join(box.get_text() for box in boxes).strip())
+                if not multi_column:
+                    lines = [
+                        (line.x0, line.x1)
+                        for box in boxes for line in box
+                        if isinstance(line, LTTextLine)
+                    ]
+                    multi_column = has_columns(lines)
+        except Exception as e:
+            raise ValueError(f"Failed to process PDF: {e}")
+        finally:
+            device.close()
+        
+        return PDFTextExtraction(
+            backend=self.name,
+            page_count=len(pdf_pages),
+            pages=pages,
+            open_ms=(opened - started) * 1000,
+            extract_ms=(time.perf_counter() - opened) * 1000,
+            multi_column=multi_column
+        )
+
+
+class PdfiumBackend(PDFTextBackend):
+    """
+    PDFium's text extraction through pypdfium2.
+    Native code and far faster than the pure-Python backends.
+    """
+    
+    name = "pdfium"
+    
+    def __init__(self):
+        try:
+            import pypdfium2
+        except ImportError:
+            raise ValueError("The pdfium PDF backend requires pypdfium2 (pip install pypdfium2)")
+        self._pdfium = pypdfium2
+    
+    def extract(self, stream: BinaryIO) -> PDFTextExtraction:
+        started = time.perf_counter()
+        try:
+            document = self._pdfium.PdfDocument(stream.read())
+            page_count = len(document)
+        except Exception as e:
+            raise ValueError(f"Invalid PDF file: {e}")
+        opened = time.perf_counter()
+        
+        pages: list[str] = []
+        multi_column = False
+        try:
+            for index in range(page_count):
+                page = document[index]
+                text_page = page.get_textpage()
+                try:
+                    pages.append(text_page.get_text_range().replace("\r\n", "\n").strip())
+                    if not multi_column:
+                        rects = [text_page.get_rect(i) for i in range(text_page.count_rects())]
+                        multi_column = has_columns([(left, right) for left, _, right, _ in rects])
+                finally:
+                    text_page.close()
+                    page.close()
+        except Exception as e:
+            raise ValueError(f"Failed to process PDF: {e}")
+        finally:
+            document.close()
+        
+        return PDFTextExtraction(
+            backend=self.name,
+            page_count=page_count,
+            pages=pages,
+            open_ms=(opened - started) * 1000,
+            extract_ms=(time.perf_counter() - opened) * 1000,
+            multi_column=multi_column
+        )
+
+
+BACKENDS: dict[str, type[PDFTextBackend]] = {
+    PDFMinerBackend.name: PDFMinerBackend,
+    PdfiumBackend.name: PdfiumBackend,
+    PDFPlumberBackend.name: PDFPlumberBackend,
+}
+
+# One instance per backend and process (worker processes build their own)
+_instances: dict[str, PDFTextBackend] = {}
+
+
+def get_backend(name: str) -> PDFTextBackend:
+    """
+    Look up an extraction backend by name.
+    
+    Raises:
+        ValueError: If the backend is unknown or its library is missing
+    """
+    if name not in _instances:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {name}. Available: {', '.join(BACKENDS)}")
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+def has_columns(lines: list[tuple[float, float]], min_lines: int = 8) -> bool:
+    """
+    Whether text lines sit in side-by-side columns.
+    
+    Looks for a vertical gutter: an x position that almost no line crosses,
+    with a substantial share of the lines on each side. Right-aligned dates
+    next to full-width text do not count, since the full-width lines cross
+    any candidate gutter.
+    
+    Args:
+        lines: Horizontal extent (x0, x1) of each text line on a page
+        min_lines: Pages with fewer lines are never treated as columns
+    """
+    if len(lines) < min_lines:
+        return False
+    
+    for gutter in sorted({round(x1) + 1 for _, x1 in lines}):
+        left = sum(1 for _, x1 in lines if x1 < gutter)
+        right = sum(1 for x0, _ in lines if x0 > gutter)
+        crossing = len(lines) - left - right
+        if crossing <= 0.1 * len(lines) and min(left, right) >= 0.25 * len(lines):
+            return True
+    return False
+
+
+def degraded_reason(extraction: PDFTextExtraction, min_chars_per_page: int) -> Optional[str]:
+    """
+    Decide whether extracted text is too poor to use.
+    
+    Args:
+        extraction: Output of a fast backend
+        min_chars_per_page: Lowest acceptable mean of non-whitespace characters per page
+    
+    Returns:
+        low_text_yield, garbled_text or multi_column; None if the text looks usable
+    """
+    text = "".join(extraction.pages)
+    visible = len(text) - sum(1 for char in text if char.isspace())
+    if visible < min_chars_per_page * max(extraction.page_count, 1):
+        return "low_text_yield"
+    
+    garbled = sum(len(match) for match in GARBLED_PATTERN.findall(text))
+    if garbled > 0.05 * visible:
+        return "garbled_text"
+    
+    if extraction.multi_column:
+        return "multi_column"
+    return None
+
+
+def open_stream(source: Union[bytes, str, BinaryIO]) -> tuple[BinaryIO, bool]:
+    """
+    Turn PDF bytes, a path or a binary file object into a seekable stream.
+    
+    Returns:
+        The stream and whether the caller has to close it
+    """
+    if isinstance(source, bytes):
+        return io.BytesIO(source), True
+    if isinstance(source, str):
+        return open(source, "rb"), True
+    return source, False
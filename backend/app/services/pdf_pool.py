@@ -0,0 +1,188 @@
+"""
+PDF Extraction Pool.
+Runs CPU-heavy PDF ingestion in worker processes so it never blocks the event loop.
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+from .pdf_backends import get_backend
+from .pdf_service import DEFAULT_BACKEND, FALLBACK_BACKEND, PDFService
+from ..metrics import PDF_EXTRACTIONS, QUEUE_DEPTH
+from ..models.schemas import PDFIngestionResult
+
+logger = logging.getLogger(__name__)
+
+
+class PDFExtractionPool:
+    """
+    Process-pool backend for `PDFService.ingest_pdf`.
+    
+    Each document gets a hard time budget. A parse that exceeds it cannot be
+    interrupted inside its worker, so the pool is torn down (killing the
+    runaway process) and rebuilt; documents that were in flight on the same
+    pool at that moment fail and may be retried by the client.
+    
+    The pool also counts which extraction backend produced each document's
+    text and how often the fast backend's output was rejected.
+    """
+    
+    def __init__(
+        self,
+        workers: int,
+        max_tasks_per_child: int,
+        timeout_seconds: float,
+        backend: str = DEFAULT_BACKEND,
+        fallback: Optional[str] = FALLBACK_BACKEND,
+        min_chars_per_page: int = 100
+    ):
+        """
+        Configure the pool. Worker processes are started lazily on first use.
+        
+        Args:
+            workers: Number of worker processes; 0 runs ingestion in a thread instead
+            max_tasks_per_child: Documents a worker parses before being recycled
+            timeout_seconds: Per-document parse budget
+            backend: Fast text extraction backend
+            fallback: Backend for documents whose fast output looks degraded (None disables it)
+            min_chars_per_page: Text yield below which the fallback is used
+            
+        Raises:
+            ValueError: If a backend is unknown or its library is missing
+        """
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout_seconds = timeout_seconds
+        self.backend = get_backend(backend).name
+        self.fallback = get_backend(fallback).name if fallback else None
+        # Module-level function plus keyword arguments, so it pickles for spawned workers
+        self._ingest = functools.partial(
+            PDFService.ingest_pdf,
+            backend=self.backend,
+            fallback=self.fallback,
+            min_chars_per_page=min_chars_per_page
+        )
+        self.backends_used: Counter = Counter()
+        self.fallback_reasons: Counter = Counter()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+    
+    async def ingest(self, source: Union[bytes, str]) -> PDFIngestionResult:
+        """
+        Parse a PDF off the event loop.
+        
+        Args:
+            source: Raw PDF bytes, or a path the worker can open directly
+            
+        Returns:
+            Ingestion result from `PDFService.ingest_pdf`
+            
+        Raises:
+            ValueError: If parsing times out or the worker crashes
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        
+        self._pending += 1
+        self._report_queue_depth()
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(executor, self._ingest, source),
+                timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"PDF parse exceeded {self.timeout_seconds}s, restarting pool")
+            self._restart(executor)
+            raise ValueError(
+                f"PDF processing timed out after {self.timeout_seconds:g} seconds"
+            )
+        except BrokenProcessPool:
+            logger.error("PDF worker process died, restarting pool")
+            self._restart(executor)
+            raise ValueError("PDF processing was interrupted, please try again")
+        finally:
+            self._pending -= 1
+            self._report_queue_depth()
+        
+        self._record(result)
+        return result
+    
+    def stats(self) -> dict:
+        """
+        Report extraction backend usage.
+        
+        Returns:
+            Configured backends, documents per backend used, fallbacks per reason and the fallback rate
+        """
+        total = sum(self.backends_used.values())
+        fallbacks = sum(self.fallback_reasons.values())
+        return {
+            "backend": self.backend,
+            "fallback": self.fallback,
+            "documents": total,
+            "by_backend": dict(self.backends_used),
+            "fallbacks": dict(self.fallback_reasons),
+            "fallback_rate": round(fallbacks / total, 4) if total else 0.0,
+        }
+    
+    def _record(self, result: PDFIngestionResult) -> None:
+        """Count the backend that produced a document's text, locally and in metrics."""
+        if result.backend is None:
+            return
+        self.backends_used[result.backend] += 1
+        if result.fallback_reason is not None:
+            self.fallback_reasons[result.fallback_reason] += 1
+        PDF_EXTRACTIONS.inc(backend=result.backend, fallback_reason=result.fallback_reason or "none")
+    
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+    
+    def _report_queue_depth(self) -> None:
+        """Publish how many documents are waiting for a free worker."""
+        QUEUE_DEPTH.set(max(0, self._pending - max(self.workers, 1)), queue="pdf_pool")
+    
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Return the running executor, creating it on first use."""
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # max_tasks_per_child is not supported with the fork start method
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child
+            )
+        return self._executor
+    
+    def _restart(self, executor: Optional[ProcessPoolExecutor]) -> None:
+        """Kill the given executor's workers so a fresh pool is built next time."""
+        if executor is None or executor is not self._executor:
+            return
+        self._executor = None
+        terminate_executor(executor)
+
+
+def terminate_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    Kill a process pool's workers, busy or not, and shut it down.
+    
+    Args:
+        executor: Pool to tear down
+    """
+    terminate_workers = getattr(executor, "terminate_workers", None)
+    if terminate_workers is not None:
+        terminate_workers()
+        return
+    
+    # Python < 3.14 has no public API to kill busy workers
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False)
@@ -1,19 +1,102 @@
 """
 PDF Processing Service.
-Handles extraction of text content from PDF files using pdfplumber.
+Handles extraction of text content from PDF files, using a fast backend
+with pdfplumber as the fallback.
 """
 
 import pdfplumber
 import io
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 import logging
+from .pdf_backends import degraded_reason, get_backend, open_stream
+from ..models.schemas import PDFIngestionResult
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BACKEND = "pdfminer"
+FALLBACK_BACKEND = "pdfplumber"
+
+# Error of a PDF whose pages have no text layer (e.g. a scan), which OCR may still read
+NO_TEXT_ERROR = "No text content could be extracted from the PDF"
+
 
 class PDFService:
     """Service for processing PDF files and extracting text content."""
     
+    @staticmethod
+    def ingest_pdf(
+        source: Union[bytes, str, BinaryIO],
+        backend: str = DEFAULT_BACKEND,
+        fallback: Optional[str] = FALLBACK_BACKEND,
+        min_chars_per_page: int = 100
+    ) -> PDFIngestionResult:
+        """
+        Parse a PDF once, validating it and extracting text per page.
+        
+        Replaces calling `validate_pdf` followed by `extract_text_from_bytes`,
+        which opens and parses the same document twice. Text comes from the
+        fast `backend`; when that fails or its output looks degraded (low
+        text yield, garbled glyphs, side-by-side columns), the document is
+        extracted again with the `fallback` backend.
+        
+        Args:
+            source: Raw PDF bytes, a file path, or a binary file object
+            backend: Name of the primary extraction backend
+            fallback: Name of the fallback backend; None disables the fallback
+            min_chars_per_page: Lowest mean of visible characters per page before falling back
+            
+        Returns:
+            Ingestion result; `errors` is non-empty if the PDF is unusable
+        """
+        result = PDFIngestionResult()
+        stream, owned = open_stream(source)
+        try:
+            try:
+                extraction = get_backend(backend).extract(stream)
+                reason = degraded_reason(extraction, min_chars_per_page) if extraction.page_count else None
+                error = None
+            except ValueError as e:
+                extraction, reason, error = None, "error", str(e)
+            
+            if reason is not None and fallback and fallback != backend:
+                logger.info(f"PDF backend {backend} output rejected ({reason}), falling back to {fallback}")
+                stream.seek(0)
+                try:
+                    extraction = get_backend(fallback).extract(stream)
+                    result.fallback_reason = reason
+                except ValueError as e:
+                    # Keep the fast backend's text if it had any
+                    if extraction is None:
+                        error = str(e)
+        finally:
+            if owned:
+                stream.close()
+        
+        if extraction is None:
+            logger.error(f"Error extracting text from PDF: {error}")
+            result.errors.append(error)
+            return result
+        
+        result.backend = extraction.backend
+        result.page_count = extraction.page_count
+        result.open_ms = extraction.open_ms
+        if result.page_count == 0:
+            result.errors.append("PDF has no pages")
+            return result
+        
+        result.pages = extraction.pages
+        result.extract_ms = extraction.extract_ms
+        if not result.text.strip():
+            result.errors.append(NO_TEXT_ERROR)
+            return result
+        
+        logger.info(
+            f"Successfully extracted {len(result.text)} characters from "
+            f"{result.page_count} page(s) in {result.open_ms + result.extract_ms:.1f}ms "
+            f"with {result.backend}"
+        )
+        return result
+    
     @staticmethod
     def extract_text_from_bytes(pdf_bytes: bytes) -> str:
         """
@@ -46,7 +129,7 @@ class PDFService:
             full_text = "\n\n".join(text_content)
             
             if not full_text.strip():
-                raise ValueError("No text content could be extracted from the PDF")
+                raise ValueError(NO_TEXT_ERROR)
                 
             logger.info(f"Successfully extracted {len(full_text)} characters from PDF")
             return full_text
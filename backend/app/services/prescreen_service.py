@@ -0,0 +1,160 @@
+"""
+Prescreen Service.
+Deterministic keyword screen that runs on extracted CV text before Claude is called.
+"""
+
+import logging
+from collections import Counter
+from typing import Optional
+from .keyword_matcher import KeywordMatcher
+from ..metrics import PRESCREEN_DECISIONS
+from ..models.schemas import CVEvaluationResponse, EvaluationCriteria, PassFailStatus
+
+logger = logging.getLogger(__name__)
+
+# Lexicons mirror the criteria in CV_EVALUATION_SYSTEM_PROMPT. They are
+# deliberately broad: a false hit only means the CV goes to Claude as usual.
+EDUCATION = "Education"
+FINTECH = "Fintech Experience"
+TECHNICAL = "Technical Skills"
+
+PRESCREEN_LEXICONS: dict[str, list[str]] = {
+    EDUCATION: [
+        "high school", "secondary school", "diploma", "ged", "a-levels", "baccalaureate",
+        "associate degree", "associate's", "bachelor", "bachelors", "bachelor's",
+        "bsc", "b.sc", "b.s.", "b.a.", "beng", "b.eng", "master", "masters", "master's",
+        "msc", "m.sc", "m.s.", "mba", "meng", "phd", "ph.d", "doctorate", "degree",
+        "university", "college", "graduated", "graduate", "certification", "certified",
+    ],
+    FINTECH: [
+        "fintech", "finance", "financial", "bank", "banks", "banking", "investment bank",
+        "crypto", "cryptocurrency", "cryptocurrencies", "blockchain", "defi", "web3",
+        "bitcoin", "ethereum", "stablecoin", "wallet", "exchange", "trading", "trader",
+        "brokerage", "broker", "forex", "fx", "securities", "stock", "equities",
+        "hedge fund", "asset management", "wealth management", "capital markets",
+        "payment", "payments", "lending", "credit", "insurance", "kyc", "aml",
+        "treasury", "accounting", "settlement", "clearing",
+    ],
+    TECHNICAL: [
+        "python", "typescript", "javascript", "node.js", "nodejs", "node",
+        "react", "react.js", "next.js", "angular", "vue", "deno", "express",
+        "fastapi", "django", "flask", "pandas", "numpy", "pytorch", "tensorflow",
+    ],
+}
+
+POLICY_OFF = "off"
+POLICY_SHADOW = "shadow"
+POLICY_ENFORCE = "enforce"
+
+
+class PrescreenService:
+    """
+    Fast local rule engine applied before LLM evaluation.
+    
+    The prompt's PASS rule needs at least 2 of 3 criteria, so a CV with no
+    fintech and no technical keyword at all cannot pass. Such CVs are
+    "clear fails". Under the `enforce` policy they are answered locally
+    without calling Claude. Under `shadow` the decision is only logged and
+    counted, which shows how much would be skipped. `off` disables the screen.
+    """
+    
+    def __init__(self, policy: str = POLICY_SHADOW):
+        """
+        Compile the keyword automaton.
+        
+        Args:
+            policy: One of "off", "shadow" or "enforce"
+        """
+        if policy not in (POLICY_OFF, POLICY_SHADOW, POLICY_ENFORCE):
+            raise ValueError(f"Unknown prescreen policy: {policy}")
+        self.policy = policy
+        self.matcher = KeywordMatcher(PRESCREEN_LEXICONS)
+        self.decisions: Counter[str] = Counter()
+    
+    def criteria(self, cv_text: str) -> list[EvaluationCriteria]:
+        """
+        Build provisional criteria from keyword hits.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            
+        Returns:
+            One provisional EvaluationCriteria per criterion
+        """
+        found = self.matcher.find(cv_text)
+        return [
+            EvaluationCriteria(
+                name=name,
+                passed=name in found,
+                details=(
+                    f"Keywords found: {', '.join(sorted(found[name]))}"
+                    if name in found else "No matching keywords found"
+                )
+            )
+            for name in PRESCREEN_LEXICONS
+        ]
+    
+    def screen(self, cv_text: str, filename: str) -> Optional[CVEvaluationResponse]:
+        """
+        Decide whether the CV can be answered without Claude.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename, for logging
+            
+        Returns:
+            A FAIL evaluation if the CV is a clear fail and the policy is
+            `enforce`; otherwise None (send the CV to Claude)
+        """
+        if self.policy == POLICY_OFF:
+            return None
+        
+        criteria = self.criteria(cv_text)
+        passed = {criterion.name for criterion in criteria if criterion.passed}
+        clear_fail = FINTECH not in passed and TECHNICAL not in passed
+        
+        if not clear_fail:
+            self._record("llm")
+            return None
+        
+        if self.policy == POLICY_SHADOW:
+            logger.info(f"Prescreen would skip {filename} (clear fail, shadow mode)")
+            self._record("would_skip")
+            return None
+        
+        logger.info(f"Prescreen skipped LLM for {filename} (clear fail)")
+        self._record("skipped")
+        return CVEvaluationResponse(
+            status=PassFailStatus.FAIL,
+            match_score=33 * len(passed),
+            reasoning=(
+                "Automatically screened without AI evaluation: the CV contains no "
+                "finance/banking/crypto keywords and no TypeScript/Python-related "
+                "skills, so at most one of the three required criteria can be met."
+            ),
+            criteria=criteria,
+            candidate_name=None
+        )
+    
+    def stats(self) -> dict:
+        """
+        Report prescreen decision counts.
+        
+        Returns:
+            Policy, counts per decision and the share of CVs skipped (or that would be)
+        """
+        total = sum(self.decisions.values())
+        skipped = self.decisions["skipped"] + self.decisions["would_skip"]
+        return {
+            "policy": self.policy,
+            "screened": total,
+            "sent_to_llm": self.decisions["llm"] + self.decisions["would_skip"],
+            "skipped": self.decisions["skipped"],
+            "would_skip": self.decisions["would_skip"],
+            "skip_rate": round(skipped / total, 4) if total else 0.0,
+        }
+    
+    def _record(self, decision: str) -> None:
+        """Count a decision locally and in metrics."""
+        self.decisions[decision] += 1
+        PRESCREEN_DECISIONS.inc(policy=self.policy, decision=decision)
@@ -0,0 +1,367 @@
+"""
+Profile Registry Service.
+Holds the screening profiles (one per role) with their prompts compiled at startup.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from string import Template
+from typing import Iterator, Optional
+from pydantic import ValidationError
+from ..models.schemas import CompiledProfile, ProfileCriterion, ProfileSummary, ScreeningProfile
+
+logger = logging.getLogger(__name__)
+
+# System prompt of the default (fintech engineer) profile
+CV_EVALUATION_SYSTEM_PROMPT = """You are an expert HR screening agent for XBO.com, a fintech company. 
+Your task is to evaluate CV/resume content and provide a structured assessment.
+
+You MUST evaluate candidates based on these THREE criteria:
+
+1. **Education**: Does the candidate have at least a High School Diploma (or equivalent/higher)?
+   - Look for: High School, GED, Associate's, Bachelor's, Master's, PhD, or equivalent certifications
+   
+2. **Fintech Fit**: Does the candidate have relevant experience in Finance, Banking, Cryptocurrency, or Fintech?
+   - Look for: Experience at financial institutions, crypto exchanges, trading platforms, payment companies
+   - Also consider: Blockchain experience, DeFi, traditional finance roles
+   
+3. **Technical Skills**: Does the candidate have proficiency in TypeScript OR Python?
+   - Look for: Direct mentions of TypeScript, Python, JavaScript (close to TypeScript), or related frameworks
+   - Consider: React, Node.js, FastAPI, Django, Flask as indicators of these skills
+
+SCORING GUIDELINES:
+- Each criterion is worth roughly 33 points
+- Bonus points for exceptional qualifications
+- Score 0-100 overall
+
+PASS/FAIL LOGIC:
+- PASS: Score >= 60 AND at least 2 out of 3 criteria are met
+- FAIL: Score < 60 OR fewer than 2 criteria met
+
+You MUST respond with ONLY valid JSON in this exact format:
+{
+    "status": "pass" or "fail",
+    "match_score": <number 0-100>,
+    "reasoning": "<detailed paragraph explaining your evaluation>",
+    "criteria": [
+        {
+            "name": "Education",
+            "passed": true/false,
+            "details": "<specific details found or reason for failure>"
+        },
+        {
+            "name": "Fintech Experience",
+            "passed": true/false,
+            "details": "<specific details found or reason for failure>"
+        },
+        {
+            "name": "Technical Skills",
+            "passed": true/false,
+            "details": "<specific skills found or reason for failure>"
+        }
+    ],
+    "candidate_name": "<extracted name or null if not found>"
+}
+
+Be fair but thorough. If information is missing or unclear, note it in your evaluation."""
+
+# Template for profiles without their own prompt. Placeholders use `string.Template`
+# syntax so the JSON braces in the response format need no escaping.
+PROFILE_PROMPT_TEMPLATE = """You are an expert HR screening agent for $company, hiring for the role of $role.
+Your task is to evaluate CV/resume content and provide a structured assessment.
+
+You MUST evaluate candidates based on these $criteria_count criteria:
+
+$criteria
+
+SCORING GUIDELINES:
+- Each criterion carries roughly equal weight
+- Bonus points for exceptional qualifications
+- Score 0-100 overall
+
+PASS/FAIL LOGIC:
+- PASS: Score >= $pass_score AND at least $min_criteria out of $criteria_count criteria are met
+- FAIL: Score < $pass_score OR fewer than $min_criteria criteria met
+
+You MUST respond with ONLY valid JSON in this exact format:
+{
+    "status": "pass" or "fail",
+    "match_score": <number 0-100>,
+    "reasoning": "<detailed paragraph explaining your evaluation>",
+    "criteria": [
+$criteria_json
+    ],
+    "candidate_name": "<extracted name or null if not found>"
+}
+
+Be fair but thorough. If information is missing or unclear, note it in your evaluation."""
+
+# Wraps several compiled profile prompts so one call evaluates a CV for every role
+MULTI_PROFILE_PROMPT_TEMPLATE = """You are an expert HR screening agent. The same CV is being screened for $role_count open roles at once.
+Evaluate it independently for each role below, following that role's instructions exactly
+(criteria, scoring guidelines and pass/fail logic). Do not let one role's assessment influence another.
+
+$roles
+
+You MUST respond with ONLY valid JSON in this exact format, with one entry per role keyed by its role id:
+{
+    "evaluations": {
+        "<role id>": <the evaluation object in the format that role's instructions describe>
+    }
+}"""
+
+# The original single-role profile; its prompt is used verbatim so existing
+# cached and stored evaluations keep their prompt version.
+DEFAULT_PROFILE = ScreeningProfile(
+    name="fintech-engineer",
+    role="Software Engineer",
+    company="XBO.com",
+    criteria=[
+        ProfileCriterion(
+            name="Education",
+            description="At least a High School Diploma (or equivalent/higher)"
+        ),
+        ProfileCriterion(
+            name="Fintech Experience",
+            description="Relevant experience in Finance, Banking, Cryptocurrency, or Fintech"
+        ),
+        ProfileCriterion(
+            name="Technical Skills",
+            description="Proficiency in TypeScript OR Python"
+        ),
+    ],
+    pass_score=60,
+    min_criteria=2,
+    prompt_template=CV_EVALUATION_SYSTEM_PROMPT,
+    prescreen=True
+)
+
+
+def prompt_version(system_prompt: str) -> str:
+    """
+    Short hash identifying a system prompt.
+    
+    Args:
+        system_prompt: Rendered system prompt
+    
+    Returns:
+        First 12 hex digits of its SHA-256
+    """
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:12]
+
+
+def compile_profile(profile: ScreeningProfile, default_model: str) -> CompiledProfile:
+    """
+    Validate a profile and render its system prompt.
+    
+    Args:
+        profile: Profile definition
+        default_model: Model used when the profile does not name one
+    
+    Returns:
+        Compiled profile
+    
+    Raises:
+        ValueError: If the profile is inconsistent or its template does not render
+    """
+    names = [criterion.name for criterion in profile.criteria]
+    if len(set(name.lower() for name in names)) != len(names):
+        raise ValueError(f"Profile {profile.name}: criterion names must be unique")
+    if profile.min_criteria > len(names):
+        raise ValueError(
+            f"Profile {profile.name}: min_criteria ({profile.min_criteria}) "
+            f"exceeds the number of criteria ({len(names)})"
+        )
+    
+    fields = {
+        "company": profile.company,
+        "role": profile.role,
+        "criteria": "\n".join(
+            f"{index}. **{criterion.name}**: {criterion.description}"
+            for index, criterion in enumerate(profile.criteria, start=1)
+        ),
+        "criteria_count": str(len(names)),
+        "pass_score": str(profile.pass_score),
+        "min_criteria": str(profile.min_criteria),
+        "criteria_json": ",\n".join(
+            "        {\n"
+            f"            \"name\": {json.dumps(name)},\n"
+            "            \"passed\": true/false,\n"
+            "            \"details\": \"<specific details found or reason for failure>\"\n"
+            "        }"
+            for name in names
+        ),
+    }
+    try:
+        system_prompt = Template(profile.prompt_template or PROFILE_PROMPT_TEMPLATE).substitute(fields)
+    except KeyError as e:
+        raise ValueError(f"Profile {profile.name}: unknown placeholder ${e.args[0]} in prompt template")
+    except ValueError as e:
+        raise ValueError(f"Profile {profile.name}: invalid prompt template ({e})")
+    
+    return CompiledProfile(
+        definition=profile,
+        system_prompt=system_prompt,
+        prompt_version=prompt_version(system_prompt),
+        model=profile.model or default_model
+    )
+
+
+class ProfileRegistry:
+    """
+    Named screening profiles, compiled once when the registry is built.
+    
+    Every request picks a profile by name; prompts are never rendered per
+    request, and a bad profile file fails at startup rather than on the
+    first CV that uses it.
+    """
+    
+    def __init__(
+        self,
+        profiles: list[ScreeningProfile],
+        default_model: str,
+        default_profile: str
+    ):
+        """
+        Compile and validate every profile.
+        
+        Args:
+            profiles: Profile definitions; a later profile replaces an earlier one of the same name
+            default_model: Model for profiles that do not name one
+            default_profile: Profile used when a request names none
+        
+        Raises:
+            ValueError: If a profile is invalid or the default profile is missing
+        """
+        self._profiles: dict[str, CompiledProfile] = {}
+        for profile in profiles:
+            self._profiles[profile.name] = compile_profile(profile, default_model)
+        
+        self._combined_prompts: dict[tuple[str, ...], str] = {}
+        
+        if default_profile not in self._profiles:
+            raise ValueError(f"Default profile {default_profile} is not defined")
+        self.default = self._profiles[default_profile]
+        
+        logger.info(f"Compiled {len(self._profiles)} screening profiles: {', '.join(self._profiles)}")
+    
+    @classmethod
+    def from_settings(cls, settings) -> "ProfileRegistry":
+        """
+        Build the registry from the built-in profile plus the configured profiles file.
+        
+        Args:
+            settings: Application settings
+        
+        Returns:
+            Compiled registry
+        
+        Raises:
+            ValueError: If the profiles file cannot be read or is invalid
+        """
+        profiles = [DEFAULT_PROFILE]
+        if settings.profiles_path:
+            profiles.extend(load_profiles(settings.profiles_path))
+        return cls(profiles, settings.claude_model, settings.default_profile)
+    
+    def get(self, name: Optional[str] = None) -> CompiledProfile:
+        """
+        Look up a profile by name.
+        
+        Args:
+            name: Profile name; None selects the default profile
+        
+        Returns:
+            Compiled profile
+        
+        Raises:
+            ValueError: If no profile has that name
+        """
+        if name is None:
+            return self.default
+        profile = self._profiles.get(name)
+        if profile is None:
+            raise ValueError(f"Unknown profile: {name}. Available: {', '.join(self._profiles)}")
+        return profile
+    
+    def combined_prompt(self, profiles: list[CompiledProfile]) -> str:
+        """
+        System prompt that evaluates a CV for several profiles in one call.
+        
+        Built from the already compiled profile prompts and memoized per
+        combination, so repeated multi-role requests reuse the same text
+        (and the same prompt cache entry).
+        
+        Args:
+            profiles: Profiles to evaluate, in request order
+            
+        Returns:
+            Combined system prompt; its JSON keys are the profile names
+        """
+        names = tuple(profile.name for profile in profiles)
+        prompt = self._combined_prompts.get(names)
+        if prompt is None:
+            prompt = Template(MULTI_PROFILE_PROMPT_TEMPLATE).substitute(
+                role_count=str(len(profiles)),
+                roles="\n\n".join(
+                    f'<role id="{profile.name}">\n{profile.system_prompt}\n</role>'
+                    for profile in profiles
+                )
+            )
+            self._combined_prompts[names] = prompt
+        return prompt
+    
+    def __iter__(self) -> Iterator[CompiledProfile]:
+        return iter(self._profiles.values())
+    
+    def __len__(self) -> int:
+        return len(self._profiles)
+    
+    def summaries(self) -> list[ProfileSummary]:
+        """Describe every profile for the API."""
+        return [
+            ProfileSummary(
+                name=profile.name,
+                role=profile.definition.role,
+                criteria=[criterion.name for criterion in profile.definition.criteria],
+                pass_score=profile.definition.pass_score,
+                min_criteria=profile.definition.min_criteria,
+                model=profile.model,
+                prompt_version=profile.prompt_version
+            )
+            for profile in self
+        ]
+
+
+def load_profiles(path: str) -> list[ScreeningProfile]:
+    """
+    Read profile definitions from a JSON file.
+    
+    The file holds either a list of profiles or an object with a
+    "profiles" list.
+    
+    Args:
+        path: Path to the JSON file
+    
+    Returns:
+        Profile definitions
+    
+    Raises:
+        ValueError: If the file is missing, not JSON, or fails validation
+    """
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read profiles file {path}: {e}")
+    
+    if isinstance(data, dict):
+        data = data.get("profiles", [])
+    if not isinstance(data, list):
+        raise ValueError(f"Profiles file {path} must contain a list of profiles")
+    
+    try:
+        return [ScreeningProfile.model_validate(item) for item in data]
+    except ValidationError as e:
+        raise ValueError(f"Invalid profile in {path}: {e}")
@@ -0,0 +1,321 @@
+"""
+Anthropic Call Scheduler.
+Client-side rate limiting, retries and load shedding around Claude API calls.
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Mapping, Optional, TypeVar
+from anthropic import APIConnectionError, APIStatusError
+from ..metrics import CLAUDE_RETRIES, CLAUDE_SHED, QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: rate limited, server errors and "overloaded"
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 529}
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a Claude call is shed instead of queued or retried further.
+    The router turns it into a 429/503 response with a Retry-After header.
+    """
+    
+    def __init__(self, message: str, retry_after: float, status_code: int = 503):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket sized to a per-minute limit.
+    
+    Reservations may drive the level negative; the deficit is the time the
+    caller has to wait, so concurrent callers queue up fairly.
+    """
+    
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self._updated = time.monotonic()
+    
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` from the bucket.
+        
+        Returns:
+            Seconds to wait before the reservation is covered
+        """
+        self._refill()
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+    
+    def refund(self, amount: float) -> None:
+        """Return an unused reservation."""
+        self.level = min(self.capacity, self.level + min(amount, self.capacity))
+    
+    def sync(self, remaining: float) -> None:
+        """Lower the level to what the server reports as remaining."""
+        self._refill()
+        self.level = min(self.level, remaining)
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class AnthropicScheduler:
+    """
+    Gatekeeper for Claude calls.
+    
+    Each call reserves one request and its estimated input tokens from
+    per-minute token buckets, then takes a slot under a global concurrency
+    cap. Rate-limit response headers tighten the buckets, and a 429 with
+    Retry-After pauses all callers. Retryable failures (429, 5xx,
+    overloaded, connection errors) are retried with full-jitter exponential
+    backoff. When the expected wait exceeds `max_queue_wait_seconds`, or
+    retries run out, the call is shed with `RateLimitExceeded`.
+    """
+    
+    def __init__(
+        self,
+        requests_per_minute: int,
+        input_tokens_per_minute: int,
+        max_concurrency: int,
+        max_retries: int = 3,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 30.0,
+        max_queue_wait_seconds: float = 30.0
+    ):
+        """
+        Configure limits.
+        
+        Args:
+            requests_per_minute: Request quota (RPM)
+            input_tokens_per_minute: Input token quota (ITPM)
+            max_concurrency: Maximum Claude calls in flight in this process
+            max_retries: Retries after the first attempt
+            retry_base_seconds: Backoff base delay
+            retry_max_seconds: Backoff delay cap
+            max_queue_wait_seconds: Longest a call may wait before being shed
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.input_tokens = TokenBucket(input_tokens_per_minute)
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = asyncio.Lock()
+        self._paused_until = 0.0
+        self._waiting = 0
+    
+    async def run(self, call: Callable[[], Awaitable[T]], estimated_tokens: int) -> T:
+        """
+        Run a Claude call under the rate limits, retrying transient failures.
+        
+        Args:
+            call: Zero-argument coroutine factory performing the API call
+            estimated_tokens: Estimated input tokens of the request
+            
+        Returns:
+            The call's result
+            
+        Raises:
+            RateLimitExceeded: If the call is shed or retries are exhausted
+        """
+        attempt = 0
+        while True:
+            async with self.slot(estimated_tokens):
+                try:
+                    return await call()
+                except (APIStatusError, APIConnectionError) as e:
+                    if not self._is_retryable(e):
+                        raise
+                    reason = self._reason(e)
+                    retry_after = self._retry_after(e)
+                    if retry_after is not None and reason == "rate_limited":
+                        self._pause(retry_after)
+                    
+                    if attempt >= self.max_retries:
+                        CLAUDE_SHED.inc(reason="retries_exhausted")
+                        raise RateLimitExceeded(
+                            f"Claude API unavailable after {attempt + 1} attempts ({reason})",
+                            retry_after=retry_after or self.retry_max_seconds,
+                            status_code=429 if reason == "rate_limited" else 503
+                        )
+            
+            delay = self._backoff(attempt, retry_after)
+            CLAUDE_RETRIES.inc(reason=reason)
+            logger.warning(f"Claude call failed ({reason}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int) -> AsyncIterator[None]:
+        """
+        Wait for rate-limit budget and a concurrency slot, without retries.
+        Used directly for streamed calls, which cannot be replayed mid-stream.
+        
+        Args:
+            estimated_tokens: Estimated input tokens of the request
+            
+        Raises:
+            RateLimitExceeded: If the wait would exceed the queue limit
+        """
+        self._waiting += 1
+        QUEUE_DEPTH.set(self._waiting, queue="claude")
+        try:
+            async with self._lock:
+                now = time.monotonic()
+                wait = max(
+                    self._paused_until - now,
+                    self.requests.reserve(1),
+                    self.input_tokens.reserve(estimated_tokens)
+                )
+                if wait > self.max_queue_wait_seconds:
+                    self.requests.refund(1)
+                    self.input_tokens.refund(estimated_tokens)
+                    CLAUDE_SHED.inc(reason="rate_limit_budget")
+                    raise RateLimitExceeded(
+                        "Too many CVs are being evaluated right now, please retry later",
+                        retry_after=wait,
+                        status_code=429
+                    )
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await asyncio.wait_for(
+                    self._semaphore.acquire(),
+                    timeout=max(0.0, self.max_queue_wait_seconds - wait)
+                )
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                # The call never goes out: give its reservations back so shed or
+                # abandoned calls do not drain the budget for the ones that wait
+                self.requests.refund(1)
+                self.input_tokens.refund(estimated_tokens)
+                if isinstance(e, asyncio.CancelledError):
+                    raise
+                CLAUDE_SHED.inc(reason="concurrency")
+                raise RateLimitExceeded(
+                    "The evaluation service is at capacity, please retry later",
+                    retry_after=self.retry_base_seconds * 5,
+                    status_code=503
+                )
+        finally:
+            self._waiting -= 1
+            QUEUE_DEPTH.set(self._waiting, queue="claude")
+        
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+    
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Adapt the buckets to the rate-limit headers of a response.
+        
+        Args:
+            headers: Response headers from the Messages API
+        """
+        requests_remaining = _header_number(headers, "anthropic-ratelimit-requests-remaining")
+        if requests_remaining is not None:
+            self.requests.sync(requests_remaining)
+        
+        tokens_remaining = _header_number(headers, "anthropic-ratelimit-input-tokens-remaining")
+        if tokens_remaining is None:
+            tokens_remaining = _header_number(headers, "anthropic-ratelimit-tokens-remaining")
+        if tokens_remaining is not None:
+            self.input_tokens.sync(tokens_remaining)
+    
+    def shed_error(self, error: Exception) -> Optional[RateLimitExceeded]:
+        """
+        Convert a retryable API error into a load-shedding error.
+        
+        Args:
+            error: Exception raised by an Anthropic call
+            
+        Returns:
+            RateLimitExceeded for retryable errors, otherwise None
+        """
+        if not isinstance(error, (APIStatusError, APIConnectionError)) or not self._is_retryable(error):
+            return None
+        retry_after = self._retry_after(error)
+        reason = self._reason(error)
+        if retry_after is not None and reason == "rate_limited":
+            self._pause(retry_after)
+        CLAUDE_SHED.inc(reason=reason)
+        return RateLimitExceeded(
+            f"Claude API unavailable ({reason})",
+            retry_after=retry_after or self.retry_base_seconds * 5,
+            status_code=429 if reason == "rate_limited" else 503
+        )
+    
+    def _pause(self, seconds: float) -> None:
+        """Hold every caller until the server's Retry-After has elapsed."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+    
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than Retry-After."""
+        cap = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempt))
+        return max(retry_after or 0.0, random.uniform(0, cap))
+    
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        if isinstance(error, APIConnectionError):
+            return True
+        return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+    
+    @staticmethod
+    def _reason(error: Exception) -> str:
+        status_code = getattr(error, "status_code", None)
+        if status_code == 429:
+            return "rate_limited"
+        if status_code == 529:
+            return "overloaded"
+        if isinstance(error, APIConnectionError):
+            return "connection"
+        return "server_error"
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        if response is None:
+            return None
+        return _header_number(response.headers, "retry-after")
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """
+    Read a numeric header, also accepting RFC 3339 reset timestamps.
+    
+    Returns:
+        The number, seconds until the timestamp, or None if absent/invalid
+    """
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return max(0.0, reset.timestamp() - time.time())
+    except ValueError:
+        return None
+
+
+def retry_after_header(retry_after: float) -> dict[str, str]:
+    """Build a Retry-After header with whole seconds, rounded up."""
+    return {"Retry-After": str(max(1, math.ceil(retry_after)))}
@@ -0,0 +1,908 @@
+"""
+Screening Pipeline.
+Runs the PDF ingestion and CV evaluation stages for an uploaded file.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar, Union
+from .cache_service import ResultCache
+from .evaluation_service import EvaluationService, LabelledEvaluation
+from .evaluation_store import EvaluationStore
+from .ocr_pool import OCRPool
+from .near_duplicate_index import NearDuplicateIndex, POLICY_REUSE
+from .pdf_pool import PDFExtractionPool
+from .prescreen_service import PrescreenService
+from .single_flight import SingleFlight
+from .text_compactor import TextCompactor
+from .upload_service import SpooledUpload
+from ..metrics import PROFILE_DURATION, PROFILE_EVALUATIONS, STAGE_DURATION
+from ..models.schemas import (
+    CompiledProfile,
+    CVEvaluationResponse,
+    EvaluationCriteria,
+    NearDuplicateMatch,
+    PassFailStatus,
+    PDFIngestionResult,
+    RoleFit,
+    StoredEvaluation,
+)
+
+logger = logging.getLogger(__name__)
+
+INGESTION_CACHE = "ingestion"
+EVALUATION_CACHE = "evaluation"
+
+T = TypeVar("T")
+
+
+class ScreeningPipeline:
+    """
+    Orchestrates ingestion and evaluation for a single CV.
+    
+    Both stages sit behind a content-addressed cache: ingestion is keyed on
+    the raw PDF bytes, evaluation on the normalized CV text plus the model
+    and prompt version, so a repeated CV costs neither a parse nor tokens.
+    With an evaluation store, results are also persisted, and a PDF that was
+    already screened with the current model and prompt is answered from the
+    store by its file hash alone.
+    
+    Every evaluation is made against a screening profile (the default one
+    unless the caller picks another); each profile has its own evaluation
+    cache namespace and per-profile metrics.
+    
+    Concurrent identical work is coalesced rather than repeated: uploads of
+    the same PDF for the same profile, parses of the same PDF and
+    evaluations of the same text share one in-flight run and its result or
+    error (e.g. a double-clicked upload or a client retry during a slow
+    Claude call). A shared run holds its own reference to a spooled upload,
+    so it keeps working when the request that started it goes away.
+    
+    With a near-duplicate index, text that nearly matches a stored CV
+    evaluated with the same profile, model and prompt (a new phone number,
+    reordered bullets, another PDF export) is flagged, or answered with the
+    stored evaluation under the `reuse` policy.
+    """
+    
+    def __init__(
+        self,
+        pdf_pool: PDFExtractionPool,
+        evaluation_service: EvaluationService,
+        cache: Optional[ResultCache] = None,
+        prescreen: Optional[PrescreenService] = None,
+        compactor: Optional[TextCompactor] = None,
+        store: Optional[EvaluationStore] = None,
+        near_duplicates: Optional[NearDuplicateIndex] = None,
+        ocr_pool: Optional[OCRPool] = None
+    ):
+        """
+        Initialize the pipeline with its shared stage backends.
+        
+        Args:
+            pdf_pool: Process pool used for PDF ingestion
+            evaluation_service: Service that calls Claude
+            cache: Result cache; None disables caching
+            prescreen: Local keyword screen run before Claude; None disables it
+            compactor: Text compaction stage; None sends the raw extracted text
+            store: Evaluation history; None keeps results in the cache only
+            near_duplicates: Index of stored CV texts; None disables near-duplicate detection
+            ocr_pool: OCR for pages without a text layer; None leaves scanned pages empty
+        """
+        self.pdf_pool = pdf_pool
+        self.evaluation_service = evaluation_service
+        self.cache = cache
+        self.prescreen = prescreen
+        self.compactor = compactor
+        self.store = store
+        self.near_duplicates = near_duplicates
+        self.ocr_pool = ocr_pool
+        self.upload_flights = SingleFlight("upload")
+        self.ingestion_flights = SingleFlight("pdf")
+        self.evaluation_flights = SingleFlight("evaluation")
+    
+    def profile(self, name: Optional[str] = None) -> CompiledProfile:
+        """
+        Resolve a screening profile by name.
+        
+        Args:
+            name: Profile name; None selects the default profile
+            
+        Returns:
+            Compiled profile
+            
+        Raises:
+            ValueError: If no profile has that name
+        """
+        return self.evaluation_service.profiles.get(name)
+    
+    async def run(
+        self,
+        pdf: Union[bytes, SpooledUpload],
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> CVEvaluationResponse:
+        """
+        Ingest a PDF and evaluate the extracted text.
+        
+        A call for a PDF and profile already being screened waits for that
+        run instead of starting another.
+        
+        Args:
+            pdf: Raw PDF bytes or a spooled upload
+            filename: Original filename for context
+            profile: Screening profile; defaults to the default profile
+            
+        Returns:
+            Structured evaluation response
+            
+        Raises:
+            ValueError: If the PDF is unusable or evaluation fails
+        """
+        profile = profile or self.profile()
+        file_hash = content_hash(pdf)
+        return await self.upload_flights.run(
+            f"{file_hash}:{profile.name}",
+            lambda: holding(pdf, lambda: self._run(pdf, file_hash, filename, profile))
+        )
+    
+    async def _run(
+        self,
+        pdf: Union[bytes, SpooledUpload],
+        file_hash: str,
+        filename: str,
+        profile: CompiledProfile
+    ) -> CVEvaluationResponse:
+        """Screen one PDF: store lookup, ingestion, evaluation and recording."""
+        with STAGE_DURATION.time_outcome(stage="pipeline"):
+            stored = await self.find_previous(file_hash, profile)
+            if stored is not None:
+                logger.info(f"{filename} was screened before (evaluation {stored.id})")
+                self._record_profile(profile, stored.evaluation, "store")
+                return stored.evaluation
+            
+            started = time.perf_counter()
+            ingestion = await self.ingest(pdf)
+            if not ingestion.is_valid:
+                raise ValueError(ingestion.errors[0])
+            ingested = time.perf_counter()
+            
+            cv_text = self.prepare_text(ingestion)
+            evaluation = await self.evaluate(cv_text, filename, profile)
+            finished = time.perf_counter()
+            
+            await self.record(file_hash, filename, cv_text, evaluation, {
+                "ingest_ms": (ingested - started) * 1000,
+                "evaluate_ms": (finished - ingested) * 1000,
+                "total_ms": (finished - started) * 1000,
+            }, profile)
+            return evaluation
+    
+    async def run_multi(
+        self,
+        pdf: Union[bytes, SpooledUpload],
+        filename: str,
+        profiles: list[CompiledProfile]
+    ) -> list[RoleFit]:
+        """
+        Ingest a PDF once and evaluate it against several profiles.
+        
+        Profiles answered by the store, prescreen or cache are skipped; the
+        rest are evaluated together, sending the CV text once per model.
+        
+        Args:
+            pdf: Raw PDF bytes or a spooled upload
+            filename: Original filename for context
+            profiles: Profiles to evaluate against
+            
+        Returns:
+            Role fits ranked best first (see `rank_role_fits`)
+            
+        Raises:
+            ValueError: If the PDF is unusable or evaluation fails
+        """
+        with STAGE_DURATION.time_outcome(stage="pipeline"):
+            file_hash = content_hash(pdf)
+            evaluations: dict[str, CVEvaluationResponse] = {}
+            for profile in profiles:
+                stored = await self.find_previous(file_hash, profile)
+                if stored is not None:
+                    self._record_profile(profile, stored.evaluation, "store")
+                    evaluations[profile.name] = stored.evaluation
+            
+            pending = [profile for profile in profiles if profile.name not in evaluations]
+            if pending:
+                started = time.perf_counter()
+                ingestion = await self.ingest(pdf)
+                if not ingestion.is_valid:
+                    raise ValueError(ingestion.errors[0])
+                ingested = time.perf_counter()
+                
+                cv_text = self.prepare_text(ingestion)
+                fresh = await self.evaluate_multi(cv_text, filename, pending)
+                finished = time.perf_counter()
+                
+                timings = {
+                    "ingest_ms": (ingested - started) * 1000,
+                    "evaluate_ms": (finished - ingested) * 1000,
+                    "total_ms": (finished - started) * 1000,
+                }
+                for profile in pending:
+                    evaluation, model, version = fresh[profile.name]
+                    await self.record(
+                        file_hash, filename, cv_text, evaluation, timings, profile,
+                        model=model, prompt_version=version
+                    )
+                    evaluations[profile.name] = evaluation
+            
+            return rank_role_fits(profiles, evaluations)
+    
+    async def run_stream(
+        self,
+        pdf: Union[bytes, SpooledUpload],
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> AsyncIterator[Union[PDFIngestionResult, EvaluationCriteria, CVEvaluationResponse]]:
+        """
+        Screen a PDF like `run`, yielding progress as it happens.
+        
+        A PDF already screened with the streamed model and current prompt is replayed
+        from the store without being parsed, so no ingestion result is yielded.
+        
+        Args:
+            pdf: Raw PDF bytes or a spooled upload
+            filename: Original filename for context
+            profile: Screening profile; defaults to the default profile
+            
+        Yields:
+            The ingestion result once parsed, EvaluationCriteria items, then
+            the final CVEvaluationResponse
+            
+        Raises:
+            ValueError: If the PDF is unusable or evaluation fails
+        """
+        profile = profile or self.profile()
+        model = self.evaluation_service.stream_model_key(profile)
+        file_hash = content_hash(pdf)
+        stored = await self.find_previous(file_hash, profile, model)
+        if stored is not None:
+            logger.info(f"{filename} was screened before (evaluation {stored.id})")
+            self._record_profile(profile, stored.evaluation, "store")
+            for criterion in stored.evaluation.criteria:
+                yield criterion
+            yield stored.evaluation
+            return
+        
+        started = time.perf_counter()
+        ingestion = await self.ingest(pdf)
+        if not ingestion.is_valid:
+            raise ValueError(ingestion.errors[0])
+        ingested = time.perf_counter()
+        yield ingestion
+        
+        cv_text = self.prepare_text(ingestion)
+        async for item in self.evaluate_stream(cv_text, filename, profile):
+            if isinstance(item, CVEvaluationResponse):
+                finished = time.perf_counter()
+                await self.record(file_hash, filename, cv_text, item, {
+                    "ingest_ms": (ingested - started) * 1000,
+                    "evaluate_ms": (finished - ingested) * 1000,
+                    "total_ms": (finished - started) * 1000,
+                }, profile, model=model)
+            yield item
+    
+    async def find_previous(
+        self,
+        file_hash: str,
+        profile: Optional[CompiledProfile] = None,
+        model: Optional[str] = None
+    ) -> Optional[StoredEvaluation]:
+        """
+        Look up a stored evaluation of the same PDF, model and prompt version.
+        
+        Args:
+            file_hash: SHA-256 of the PDF bytes
+            profile: Screening profile whose model and prompt must match
+            model: Model key that must match; defaults to the profile's
+            
+        Returns:
+            The latest matching record, or None (also when there is no store)
+        """
+        if self.store is None:
+            return None
+        profile = profile or self.profile()
+        return await asyncio.to_thread(
+            self.store.find_by_hash,
+            file_hash,
+            model or self.evaluation_service.model_key(profile),
+            profile.prompt_version
+        )
+    
+    async def record(
+        self,
+        file_hash: str,
+        filename: str,
+        cv_text: str,
+        evaluation: CVEvaluationResponse,
+        timings: Optional[dict[str, float]] = None,
+        profile: Optional[CompiledProfile] = None,
+        model: Optional[str] = None,
+        prompt_version: Optional[str] = None
+    ) -> None:
+        """
+        Persist an evaluation in the store, if one is configured.
+        A failed write is logged but never fails the screening itself.
+        
+        Args:
+            file_hash: SHA-256 of the PDF bytes
+            filename: Original filename
+            cv_text: Text that was evaluated
+            evaluation: Evaluation result
+            timings: Stage durations in milliseconds
+            profile: Screening profile the CV was evaluated against
+            model: Model key that produced it; defaults to the profile's
+            prompt_version: Prompt version that produced it; defaults to the profile's
+        """
+        if self.store is None:
+            return
+        profile = profile or self.profile()
+        try:
+            evaluation_id = await asyncio.to_thread(
+                self.store.save,
+                file_hash,
+                filename,
+                cv_text,
+                evaluation,
+                model or self.evaluation_service.model_key(profile),
+                prompt_version or profile.prompt_version,
+                timings,
+                profile.name
+            )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to store evaluation of {filename}: {e}")
+            return
+        
+        if self.near_duplicates is not None:
+            try:
+                await asyncio.to_thread(self.near_duplicates.insert, evaluation_id, cv_text)
+            except OSError as e:
+                logger.error(f"Failed to index evaluation {evaluation_id} for near-duplicates: {e}")
+    
+    async def find_near_duplicate(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None,
+        model: Optional[str] = None
+    ) -> Optional[CVEvaluationResponse]:
+        """
+        Look up a stored evaluation of nearly the same text, model, prompt version and profile.
+        
+        The index first picks up CVs other processes have stored since the
+        last lookup. Under the `reuse` policy the caller answers with the
+        match; under `flag` it only copies `near_duplicate_of` onto the fresh
+        evaluation (see `with_near_duplicate`).
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename, for logging
+            profile: Screening profile the match must have been evaluated against
+            model: Model key the match must have been evaluated with; defaults to the profile's
+            
+        Returns:
+            The most similar match's evaluation with `near_duplicate_of` set,
+            or None when there is no index or no match
+        """
+        if self.near_duplicates is None:
+            return None
+        profile = profile or self.profile()
+        model = model or self.evaluation_service.model_key(profile)
+        
+        def lookup() -> Optional[tuple[StoredEvaluation, float]]:
+            self.near_duplicates.refresh()
+            for evaluation_id, similarity in self.near_duplicates.query(cv_text):
+                stored = self.store.get(evaluation_id)
+                if (
+                    stored is not None
+                    and stored.profile == profile.name
+                    and stored.model == model
+                    and stored.prompt_version == profile.prompt_version
+                ):
+                    return stored, similarity
+            return None
+        
+        match = await asyncio.to_thread(lookup)
+        if match is None:
+            self.near_duplicates.record("miss")
+            return None
+        
+        stored, similarity = match
+        if self.reuses_near_duplicates:
+            logger.info(f"Reusing evaluation {stored.id} for near-duplicate {filename} (similarity {similarity})")
+            self.near_duplicates.record("reused")
+        else:
+            logger.info(f"{filename} is a near-duplicate of evaluation {stored.id} (similarity {similarity})")
+            self.near_duplicates.record("flagged")
+        return stored.evaluation.model_copy(update={
+            "near_duplicate_of": NearDuplicateMatch(evaluation_id=stored.id, similarity=similarity)
+        })
+    
+    @property
+    def reuses_near_duplicates(self) -> bool:
+        """Whether a near-duplicate's stored evaluation answers the new CV (the `reuse` policy)."""
+        return self.near_duplicates is not None and self.near_duplicates.policy == POLICY_REUSE
+    
+    async def ingest(self, pdf: Union[bytes, SpooledUpload]) -> PDFIngestionResult:
+        """
+        Parse a PDF, reusing a cached or in-flight result for identical bytes.
+        
+        Args:
+            pdf: Raw PDF bytes or a spooled upload (hashed while it was read)
+            
+        Returns:
+            Ingestion result
+        """
+        key = content_hash(pdf)
+        return await self.ingestion_flights.run(key, lambda: holding(pdf, lambda: self._ingest(pdf, key)))
+    
+    async def _ingest(self, pdf: Union[bytes, SpooledUpload], key: str) -> PDFIngestionResult:
+        """Parse a PDF in the pool (OCR'ing pages without text), through the ingestion cache."""
+        if self.cache is not None:
+            cached = await self._cache_get(INGESTION_CACHE, key)
+            if cached is not None:
+                logger.info(f"Ingestion cache hit: {key[:12]}")
+                return PDFIngestionResult.model_validate_json(cached)
+        
+        source = pdf.source() if isinstance(pdf, SpooledUpload) else pdf
+        ingestion = await self.pdf_pool.ingest(source)
+        if self.ocr_pool is not None:
+            ingestion = await self.ocr_pool.complete(source, ingestion)
+        
+        outcome = "success" if ingestion.is_valid else "error"
+        STAGE_DURATION.observe(ingestion.open_ms / 1000, stage="pdf_validate", outcome=outcome)
+        if ingestion.page_count:
+            STAGE_DURATION.observe(ingestion.extract_ms / 1000, stage="pdf_extract", outcome=outcome)
+        
+        if self.cache is not None:
+            await self._cache_set(INGESTION_CACHE, key, ingestion.model_dump_json())
+        return ingestion
+    
+    def prepare_text(self, ingestion: PDFIngestionResult) -> str:
+        """
+        Turn an ingestion result into the CV text sent for evaluation.
+        
+        Args:
+            ingestion: Valid ingestion result
+            
+        Returns:
+            Compacted text, or the raw joined page text if compaction is off
+        """
+        if self.compactor is None:
+            return ingestion.text
+        return self.compactor.compact(ingestion.pages).text
+    
+    async def evaluate(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> CVEvaluationResponse:
+        """
+        Evaluate CV text, reusing a cached or in-flight evaluation for the same content.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile; defaults to the default profile
+            
+        Returns:
+            Structured evaluation response
+            
+        Raises:
+            ValueError: If evaluation fails
+        """
+        profile = profile or self.profile()
+        namespace = evaluation_cache_namespace(profile)
+        key = self.evaluation_cache_key(cv_text, profile)
+        return await self.evaluation_flights.run(
+            f"{namespace}:{key}",
+            lambda: self._evaluate(cv_text, filename, profile, namespace, key)
+        )
+    
+    async def _evaluate(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: CompiledProfile,
+        namespace: str,
+        key: str
+    ) -> CVEvaluationResponse:
+        """Evaluate CV text: prescreen, evaluation cache, near-duplicates, then Claude."""
+        if self.prescreen is not None and profile.definition.prescreen:
+            decision = self.prescreen.screen(cv_text, filename)
+            if decision is not None:
+                self._record_profile(profile, decision, "prescreen")
+                return decision
+        
+        if self.cache is not None:
+            cached = await self._cache_get(namespace, key)
+            if cached is not None:
+                logger.info(f"Evaluation cache hit for {filename} ({profile.name})")
+                evaluation = CVEvaluationResponse.model_validate_json(cached)
+                self._record_profile(profile, evaluation, "cache")
+                return evaluation
+        
+        duplicate = await self.find_near_duplicate(cv_text, filename, profile)
+        if duplicate is not None and self.reuses_near_duplicates:
+            self._record_profile(profile, duplicate, "near_duplicate")
+            return duplicate
+        
+        with PROFILE_DURATION.time_outcome(profile=profile.name):
+            evaluation = await self.evaluation_service.evaluate_cv_async(cv_text, filename, profile)
+        evaluation = with_near_duplicate(evaluation, duplicate)
+        self._record_profile(profile, evaluation, "claude")
+        
+        if self.cache is not None:
+            await self._cache_set(namespace, key, evaluation.model_dump_json())
+        return evaluation
+    
+    async def evaluate_multi(
+        self,
+        cv_text: str,
+        filename: str,
+        profiles: list[CompiledProfile]
+    ) -> dict[str, LabelledEvaluation]:
+        """
+        Evaluate CV text against several profiles, reusing prescreen, cached and near-duplicate results.
+        
+        A profile's own cached evaluation is reused. Results of a combined
+        multi-profile call are cached under their own model key and prompt
+        version (see `EvaluationService.multi_labels`), so they are only
+        reused by the same combination and never answer a single-profile
+        request.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profiles: Profiles to evaluate against
+            
+        Returns:
+            Dict of profile name -> (evaluation, model key, prompt version)
+            
+        Raises:
+            ValueError: If evaluation fails
+        """
+        evaluations: dict[str, LabelledEvaluation] = {}
+        pending: list[CompiledProfile] = []
+        for profile in profiles:
+            label = (self.evaluation_service.model_key(profile), profile.prompt_version)
+            if self.prescreen is not None and profile.definition.prescreen:
+                decision = self.prescreen.screen(cv_text, filename)
+                if decision is not None:
+                    self._record_profile(profile, decision, "prescreen")
+                    evaluations[profile.name] = (decision, *label)
+                    continue
+            
+            cached = await self._cached_evaluation(cv_text, filename, profile, *label)
+            if cached is not None:
+                evaluations[profile.name] = (cached, *label)
+                continue
+            pending.append(profile)
+        
+        if self.cache is not None and len(pending) > 1:
+            labels = self.evaluation_service.multi_labels(pending)
+            for profile in list(pending):
+                label = labels[profile.name]
+                if label == (self.evaluation_service.model_key(profile), profile.prompt_version):
+                    continue
+                cached = await self._cached_evaluation(cv_text, filename, profile, *label)
+                if cached is not None:
+                    evaluations[profile.name] = (cached, *label)
+                    pending.remove(profile)
+        
+        duplicates: dict[str, CVEvaluationResponse] = {}
+        for profile in list(pending):
+            duplicate = await self.find_near_duplicate(cv_text, filename, profile)
+            if duplicate is None:
+                continue
+            if self.reuses_near_duplicates:
+                self._record_profile(profile, duplicate, "near_duplicate")
+                label = (self.evaluation_service.model_key(profile), profile.prompt_version)
+                evaluations[profile.name] = (duplicate, *label)
+                pending.remove(profile)
+            else:
+                duplicates[profile.name] = duplicate
+        
+        if not pending:
+            return evaluations
+        
+        started = time.perf_counter()
+        fresh = await self.evaluation_service.evaluate_cv_multi(cv_text, filename, pending)
+        elapsed = time.perf_counter() - started
+        
+        for profile in pending:
+            evaluation, model, version = fresh[profile.name]
+            evaluation = with_near_duplicate(evaluation, duplicates.get(profile.name))
+            fresh[profile.name] = (evaluation, model, version)
+            PROFILE_DURATION.observe(elapsed, profile=profile.name, outcome="success")
+            self._record_profile(profile, evaluation, "claude")
+            if self.cache is not None:
+                await self._cache_set(
+                    evaluation_cache_namespace(profile),
+                    self.evaluation_cache_key(cv_text, profile, model, version),
+                    evaluation.model_dump_json()
+                )
+        evaluations.update(fresh)
+        return evaluations
+    
+    async def _cached_evaluation(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: CompiledProfile,
+        model: str,
+        prompt_version: str
+    ) -> Optional[CVEvaluationResponse]:
+        """Look up a profile's evaluation of some text made with the given model key and prompt version."""
+        if self.cache is None:
+            return None
+        cached = await self._cache_get(
+            evaluation_cache_namespace(profile),
+            self.evaluation_cache_key(cv_text, profile, model, prompt_version)
+        )
+        if cached is None:
+            return None
+        logger.info(f"Evaluation cache hit for {filename} ({profile.name})")
+        evaluation = CVEvaluationResponse.model_validate_json(cached)
+        self._record_profile(profile, evaluation, "cache")
+        return evaluation
+    
+    async def evaluate_stream(
+        self,
+        cv_text: str,
+        filename: str,
+        profile: Optional[CompiledProfile] = None
+    ) -> AsyncIterator[Union[EvaluationCriteria, CVEvaluationResponse]]:
+        """
+        Evaluate CV text, yielding criteria as they become available.
+        
+        A prescreen decision, cached evaluation or reused near-duplicate is
+        replayed immediately in the same shape. Streams skip the model
+        cascade, so cache and near-duplicate lookups use the streamed model's
+        key rather than the cascade's.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            filename: Original filename for context
+            profile: Screening profile; defaults to the default profile
+            
+        Yields:
+            EvaluationCriteria items, then the final CVEvaluationResponse
+            
+        Raises:
+            ValueError: If evaluation fails
+        """
+        profile = profile or self.profile()
+        evaluation, source = None, None
+        if self.prescreen is not None and profile.definition.prescreen:
+            evaluation, source = self.prescreen.screen(cv_text, filename), "prescreen"
+        
+        model = self.evaluation_service.stream_model_key(profile)
+        namespace = evaluation_cache_namespace(profile)
+        key = self.evaluation_cache_key(cv_text, profile, model)
+        
+        if evaluation is None and self.cache is not None:
+            cached = await self._cache_get(namespace, key)
+            if cached is not None:
+                logger.info(f"Evaluation cache hit for {filename} ({profile.name})")
+                evaluation, source = CVEvaluationResponse.model_validate_json(cached), "cache"
+        
+        duplicate = None
+        if evaluation is None:
+            duplicate = await self.find_near_duplicate(cv_text, filename, profile, model)
+            if duplicate is not None and self.reuses_near_duplicates:
+                evaluation, source = duplicate, "near_duplicate"
+        
+        if evaluation is not None:
+            self._record_profile(profile, evaluation, source)
+            for criterion in evaluation.criteria:
+                yield criterion
+            yield evaluation
+            return
+        
+        with PROFILE_DURATION.time_outcome(profile=profile.name):
+            async for item in self.evaluation_service.evaluate_cv_stream(cv_text, filename, profile):
+                if isinstance(item, CVEvaluationResponse):
+                    item = with_near_duplicate(item, duplicate)
+                    self._record_profile(profile, item, "claude")
+                    if self.cache is not None:
+                        await self._cache_set(namespace, key, item.model_dump_json())
+                yield item
+    
+    def coalescing_stats(self) -> dict:
+        """
+        Report calls that joined identical in-flight work, per stage.
+        
+        Returns:
+            Dict of stage (upload, pdf, evaluation) -> counts
+        """
+        return {
+            flights.stage: flights.stats()
+            for flights in (self.upload_flights, self.ingestion_flights, self.evaluation_flights)
+        }
+    
+    def evaluation_cache_key(
+        self,
+        cv_text: str,
+        profile: Optional[CompiledProfile] = None,
+        model: Optional[str] = None,
+        prompt_version: Optional[str] = None
+    ) -> str:
+        """
+        Build the evaluation cache key for some CV text.
+        
+        Args:
+            cv_text: Extracted text content from the CV
+            profile: Screening profile; defaults to the default profile
+            model: Model key; defaults to the profile's
+            prompt_version: Prompt version; defaults to the profile's
+            
+        Returns:
+            Key combining the normalized text hash, model and prompt version
+        """
+        profile = profile or self.profile()
+        text_hash = hashlib.sha256(normalize_text(cv_text).encode("utf-8")).hexdigest()
+        return ResultCache.make_key(
+            text_hash,
+            model or self.evaluation_service.model_key(profile),
+            prompt_version or profile.prompt_version
+        )
+    
+    async def _cache_get(self, namespace: str, key: str) -> Optional[str]:
+        """Look up a cached value, off the event loop when the cache has a disk tier."""
+        if self.cache.persistent:
+            return await asyncio.to_thread(self.cache.get, namespace, key)
+        return self.cache.get(namespace, key)
+    
+    async def _cache_set(self, namespace: str, key: str, value: str) -> None:
+        """Cache a value, off the event loop when the cache has a disk tier."""
+        if self.cache.persistent:
+            await asyncio.to_thread(self.cache.set, namespace, key, value)
+        else:
+            self.cache.set(namespace, key, value)
+    
+    @staticmethod
+    def _record_profile(profile: CompiledProfile, evaluation: CVEvaluationResponse, source: str) -> None:
+        """Count an evaluation for its profile, by status and where it came from."""
+        PROFILE_EVALUATIONS.inc(profile=profile.name, status=evaluation.status.value, source=source)
+
+
+def rank_role_fits(
+    profiles: list[CompiledProfile],
+    evaluations: dict[str, CVEvaluationResponse]
+) -> list[RoleFit]:
+    """
+    Rank a CV's evaluations across roles, best fit first.
+    
+    Passing roles come before failing ones, then higher match scores, then
+    more criteria met; remaining ties keep the requested profile order.
+    
+    Args:
+        profiles: Profiles in request order
+        evaluations: Dict of profile name -> evaluation
+        
+    Returns:
+        Ranked role fits
+    """
+    def criteria_met(evaluation: CVEvaluationResponse) -> int:
+        return sum(1 for criterion in evaluation.criteria if criterion.passed)
+    
+    ordered = sorted(
+        profiles,
+        key=lambda profile: (
+            evaluations[profile.name].status != PassFailStatus.PASS,
+            -evaluations[profile.name].match_score,
+            -criteria_met(evaluations[profile.name]),
+        )
+    )
+    return [
+        RoleFit(
+            rank=rank,
+            profile=profile.name,
+            role=profile.definition.role,
+            criteria_met=criteria_met(evaluations[profile.name]),
+            evaluation=evaluations[profile.name]
+        )
+        for rank, profile in enumerate(ordered, start=1)
+    ]
+
+
+def evaluation_cache_namespace(profile: CompiledProfile) -> str:
+    """
+    Cache namespace holding a profile's evaluations.
+    
+    Args:
+        profile: Screening profile
+        
+    Returns:
+        Namespace such as "evaluation:fintech-engineer"
+    """
+    return f"{EVALUATION_CACHE}:{profile.name}"
+
+
+def holding(pdf: Union[bytes, SpooledUpload], work: Callable[[], Awaitable[T]]) -> Awaitable[T]:
+    """
+    Start work that reads a PDF, keeping a spooled upload open until it finishes.
+    
+    The reference is taken right away, before the caller can close the
+    upload, so a coalesced run shared by other requests still has its input
+    after the request that started it returns or is cancelled.
+    
+    Args:
+        pdf: Raw PDF bytes or a spooled upload
+        work: Zero-argument coroutine factory reading the PDF
+        
+    Returns:
+        Awaitable running the work, then releasing the reference
+    """
+    if not isinstance(pdf, SpooledUpload):
+        return work()
+    pdf.retain()
+    
+    async def run() -> T:
+        try:
+            return await work()
+        finally:
+            pdf.close()
+    
+    return run()
+
+
+def with_near_duplicate(
+    evaluation: CVEvaluationResponse,
+    duplicate: Optional[CVEvaluationResponse]
+) -> CVEvaluationResponse:
+    """
+    Flag a fresh evaluation with the near-duplicate found for its CV, if any.
+    
+    Args:
+        evaluation: Evaluation just made by Claude
+        duplicate: Result of `ScreeningPipeline.find_near_duplicate`
+        
+    Returns:
+        The evaluation, with `near_duplicate_of` copied from the duplicate
+    """
+    if duplicate is None:
+        return evaluation
+    return evaluation.model_copy(update={"near_duplicate_of": duplicate.near_duplicate_of})
+
+
+def content_hash(pdf: Union[bytes, SpooledUpload]) -> str:
+    """
+    Hex SHA-256 of a PDF's raw bytes.
+    
+    Args:
+        pdf: Raw PDF bytes or a spooled upload
+        
+    Returns:
+        Content hash (precomputed for spooled uploads)
+    """
+    if isinstance(pdf, SpooledUpload):
+        return pdf.sha256
+    return hashlib.sha256(pdf).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize CV text for hashing so whitespace-only differences still hit.
+    
+    Args:
+        text: Extracted CV text
+        
+    Returns:
+        Text with all whitespace runs collapsed to single spaces
+    """
+    return re.sub(r"\s+", " ", text).strip()
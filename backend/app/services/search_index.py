@@ -0,0 +1,313 @@
+"""
+Search Index Service.
+BM25 full-text search over screened CVs, with status and score filters.
+"""
+
+import heapq
+import json
+import logging
+import math
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import compress
+from operator import itemgetter
+from typing import Optional
+from .evaluation_store import EvaluationStore
+from ..models.schemas import PassFailStatus
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Term frequency multiplier per field: a term the evaluator wrote into the
+# reasoning or a criterion's details counts more than one in the CV itself
+FIELD_WEIGHTS = {
+    "cv_text": 1,
+    "reasoning": 2,
+    "details": 2,
+}
+
+# Impacts (the BM25 term-frequency part) are stored as one byte
+IMPACT_LEVELS = 255
+
+# Per-document filter code: match score in the low 7 bits, 0x80 if passed
+PASSED_BIT = 0x80
+
+MAX_RESULTS = 100
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase search terms.
+    
+    Args:
+        text: Text to tokenize
+    
+    Returns:
+        Terms in order of appearance
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over stored evaluations.
+    
+    Each evaluation is indexed as one document made of the extracted CV
+    text, the reasoning and every criterion's details (see FIELD_WEIGHTS).
+    A term's postings are two parallel arrays in document order: document
+    numbers and the BM25 term-frequency component quantized to a byte, with
+    the average document length taken when the document is indexed. IDF is
+    applied at query time, so new documents never rewrite old postings.
+    
+    Queries are scored term-at-a-time, highest-impact term first. Once the
+    k-th best score so far beats the most the remaining terms could add,
+    no unseen document can reach the top k: later terms only update the
+    documents already collected (by binary search when that is cheaper than
+    a scan), and collected documents that can no longer make it are
+    dropped. The result is the exact BM25 top k, while common terms like
+    "python" rarely have to be scanned in full. Status and score filters
+    are a byte per document, turned into a mask with one `translate`.
+    
+    The index is filled by a background thread that reads new records from
+    the evaluation store, so screening never waits for indexing; it is
+    woken after each evaluation saved in this process and otherwise polls,
+    which also picks up evaluations stored by separate worker processes.
+    """
+    
+    def __init__(self, store: EvaluationStore, poll_interval_seconds: float = 5.0):
+        """
+        Create an empty index; call `start` to begin indexing the store.
+        
+        Args:
+            store: Evaluation store to index
+            poll_interval_seconds: How often to look for new records without being notified
+        """
+        self.store = store
+        self.poll_interval_seconds = poll_interval_seconds
+        self.last_id = 0
+        self.searches = 0
+        
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        
+        self._doc_ids = array("Q")
+        self._codes = bytearray()
+        self._total_length = 0
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._max_impacts: dict[str, int] = {}
+    
+    def start(self) -> None:
+        """Start the background indexing thread and listen for new evaluations."""
+        if self._thread is None:
+            self.store.subscribe(self.notify)
+            self._thread = threading.Thread(target=self._run, name="search-indexer", daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the background indexing thread."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def notify(self, evaluation_id: Optional[int] = None) -> None:
+        """
+        Signal that new evaluations were stored; returns immediately.
+        
+        Args:
+            evaluation_id: ID of the new record (unused; the thread reads everything after `last_id`)
+        """
+        self._wake.set()
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        status: Optional[PassFailStatus] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None
+    ) -> list[tuple[int, float]]:
+        """
+        Rank indexed evaluations against a free-text query.
+        
+        Args:
+            query: Search terms; documents matching any of them are ranked
+            limit: Number of results (capped at MAX_RESULTS)
+            status: Only pass or only fail
+            min_score: Minimum match score (inclusive)
+            max_score: Maximum match score (inclusive)
+        
+        Returns:
+            (evaluation ID, BM25 score) pairs, best first
+        
+        Raises:
+            ValueError: If the query has no searchable terms
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            raise ValueError("Search query has no searchable terms")
+        limit = max(1, min(limit, MAX_RESULTS))
+        self.searches += 1
+        
+        with self._lock:
+            count = len(self._doc_ids)
+            lists = []
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                df = len(postings[0])
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                lists.append((idf * self._max_impacts[term], idf, *postings))
+            if not lists:
+                return []
+            
+            mask = None
+            if status is not None or min_score is not None or max_score is not None:
+                mask = self._codes.translate(_filter_table(status, min_score, max_score))
+            
+            lists.sort(key=itemgetter(0), reverse=True)
+            remaining = sum(bound for bound, *_ in lists)
+            scores: dict[int, float] = {}
+            closed = False
+            for bound, idf, docs, impacts in lists:
+                remaining -= bound
+                if not closed:
+                    pairs = zip(docs, map(idf.__mul__, impacts))
+                    if mask is not None:
+                        pairs = compress(pairs, map(mask.__getitem__, docs))
+                    term_scores = dict(pairs)
+                    if scores:
+                        for doc in scores.keys() & term_scores.keys():
+                            term_scores[doc] += scores[doc]
+                        scores.update(term_scores)
+                    else:
+                        scores = term_scores
+                elif len(scores) * math.log2(len(docs) + 1) < len(docs):
+                    for doc in scores:
+                        position = bisect_left(docs, doc)
+                        if position < len(docs) and docs[position] == doc:
+                            scores[doc] += idf * impacts[position]
+                else:
+                    term_scores = dict(zip(docs, impacts))
+                    for doc in scores.keys() & term_scores.keys():
+                        scores[doc] += idf * term_scores[doc]
+                
+                if len(scores) >= limit and remaining > 0:
+                    threshold = heapq.nlargest(limit, scores.values())[-1]
+                    closed = closed or threshold >= remaining
+                    if closed:
+                        scores = {doc: score for doc, score in scores.items() if score + remaining >= threshold}
+            
+            top = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            scale = 1 / IMPACT_LEVELS
+            return [(self._doc_ids[doc], round(score * scale, 4)) for doc, score in top]
+    
+    def stats(self) -> dict:
+        """
+        Report index size and progress.
+        
+        Returns:
+            Indexed documents, distinct terms, postings, last indexed ID and searches run
+        """
+        with self._lock:
+            return {
+                "indexed": len(self._doc_ids),
+                "terms": len(self._postings),
+                "postings": sum(len(docs) for docs, _ in self._postings.values()),
+                "last_id": self.last_id,
+                "searches": self.searches,
+            }
+    
+    def add(self, evaluation_id: int, cv_text: str, evaluation: dict) -> None:
+        """
+        Index one evaluation. IDs must be added in increasing order.
+        
+        Args:
+            evaluation_id: Evaluation store record ID
+            cv_text: Text the evaluation was based on
+            evaluation: The evaluation as a dict (CVEvaluationResponse fields)
+        """
+        frequencies: Counter[str] = Counter()
+        fields = {
+            "cv_text": cv_text,
+            "reasoning": evaluation.get("reasoning") or "",
+            "details": "\n".join(criterion.get("details") or "" for criterion in evaluation.get("criteria") or []),
+        }
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS[field]
+            for term in tokenize(text):
+                frequencies[term] += weight
+        length = sum(frequencies.values())
+        code = min(max(int(evaluation.get("match_score") or 0), 0), 100)
+        if evaluation.get("status") == PassFailStatus.PASS.value:
+            code |= PASSED_BIT
+        
+        with self._lock:
+            doc = len(self._doc_ids)
+            self._doc_ids.append(evaluation_id)
+            self._codes.append(code)
+            self._total_length += length
+            self.last_id = evaluation_id
+            norm = K1 * (1 - B + B * length / (self._total_length / len(self._doc_ids)))
+            for term, frequency in frequencies.items():
+                impact = max(1, round(IMPACT_LEVELS * frequency / (frequency + norm)))
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("B"))
+                    self._max_impacts[term] = 0
+                postings[0].append(doc)
+                postings[1].append(impact)
+                if impact > self._max_impacts[term]:
+                    self._max_impacts[term] = impact
+    
+    def _run(self) -> None:
+        """Indexing loop: index new store records, then wait for a save or the poll interval."""
+        while not self._stopping:
+            started = time.perf_counter()
+            added = 0
+            try:
+                for evaluation_id, cv_text, evaluation in self.store.iter_texts(after_id=self.last_id):
+                    if self._stopping:
+                        return
+                    self.add(evaluation_id, cv_text, json.loads(evaluation))
+                    added += 1
+            except Exception as e:
+                logger.error(f"Search indexing failed after {self.last_id}: {e}")
+            if added:
+                logger.info(
+                    f"Indexed {added} evaluations for search "
+                    f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+                )
+            self._wake.wait(self.poll_interval_seconds)
+            self._wake.clear()
+
+
+def _filter_table(
+    status: Optional[PassFailStatus],
+    min_score: Optional[int],
+    max_score: Optional[int]
+) -> bytes:
+    """Translation table mapping each document filter code to 1 (keep) or 0."""
+    low = 0 if min_score is None else min_score
+    high = 100 if max_score is None else max_score
+    table = bytearray(256)
+    for code in range(256):
+        passed = bool(code & PASSED_BIT)
+        score = code & ~PASSED_BIT
+        if status is not None and passed != (status == PassFailStatus.PASS):
+            continue
+        table[code] = low <= score <= high
+    return bytes(table)
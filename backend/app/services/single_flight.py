@@ -0,0 +1,84 @@
+"""
+Single-Flight Coalescing.
+Lets concurrent identical calls share one in-flight execution and its result.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Awaitable, Callable, TypeVar
+from ..metrics import COALESCED_CALLS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key.
+    
+    The first caller for a key starts the work as its own task; callers
+    arriving while it runs await that task instead of starting another,
+    and all of them get its result or exception. The work is shielded from
+    caller cancellation, so a client that disconnects does not abort it for
+    the others. Once finished, the key is released; later calls start anew
+    (and are expected to hit a cache).
+    """
+    
+    def __init__(self, stage: str):
+        """
+        Create an empty flight group.
+        
+        Args:
+            stage: Label for logs and metrics (e.g. "pdf", "evaluation")
+        """
+        self.stage = stage
+        self.calls: Counter[str] = Counter()
+        self._in_flight: dict[str, asyncio.Task] = {}
+    
+    async def run(self, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run `work` for a key, or join the run already in flight for it.
+        
+        Args:
+            key: Identity of the work, e.g. a content hash
+            work: Zero-argument coroutine factory doing the work
+        
+        Returns:
+            The result of the shared run
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.calls["coalesced"] += 1
+            COALESCED_CALLS.inc(stage=self.stage)
+            logger.info(f"Joining in-flight {self.stage} work for {key[:12]}")
+            return await asyncio.shield(task)
+        
+        self.calls["executed"] += 1
+        task = asyncio.ensure_future(work())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
+    
+    def _release(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished run; mark its exception retrieved if every caller left."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()
+    
+    def stats(self) -> dict:
+        """
+        Report how many calls ran and how many joined a run in flight.
+        
+        Returns:
+            Executed and coalesced call counts, coalesced share and runs in flight
+        """
+        total = self.calls["executed"] + self.calls["coalesced"]
+        return {
+            "executed": self.calls["executed"],
+            "coalesced": self.calls["coalesced"],
+            "coalesced_rate": round(self.calls["coalesced"] / total, 4) if total else 0.0,
+            "in_flight": len(self._in_flight),
+        }
@@ -0,0 +1,231 @@
+"""
+Text Compaction Service.
+Normalizes extracted CV text and shrinks it before it is sent to Claude.
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from ..metrics import COMPACTION_TOKENS_SAVED
+from ..models.schemas import TextCompactionResult
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio for English prose, used for budgeting only
+CHARS_PER_TOKEN = 4
+
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+HYPHENATED_END_PATTERN = re.compile(r"[A-Za-z]-$")
+# Page labels inside running headers/footers, e.g. "Jane Doe - Page 2 of 3"
+PAGE_LABEL_PATTERN = re.compile(r"\bpage\s*\d{1,3}(\s*(of|/)\s*\d{1,3})?\b", re.IGNORECASE)
+
+# Non-empty lines at the top and at the bottom of a page checked for headers/footers
+EDGE_LINES = 3
+
+# Section headings and their priority when a token budget forces truncation.
+# Lower numbers are kept longest; text before the first heading is the preamble.
+SECTION_PRIORITIES: dict[str, int] = {
+    "experience": 0, "work experience": 0, "professional experience": 0,
+    "employment": 0, "employment history": 0, "work history": 0, "career history": 0,
+    "skills": 1, "technical skills": 1, "core skills": 1, "technologies": 1,
+    "education": 1, "qualifications": 1, "academic background": 1,
+    "summary": 2, "profile": 2, "professional summary": 2, "about me": 2, "objective": 2,
+    "projects": 2, "certifications": 2, "certificates": 2, "courses": 3,
+    "achievements": 3, "awards": 3, "publications": 4, "languages": 4,
+    "volunteering": 4, "volunteer experience": 4, "interests": 5, "hobbies": 5,
+    "references": 5,
+}
+PREAMBLE_PRIORITY = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of some text.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Approximate number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class TextCompactor:
+    """
+    Pipeline stage between PDF extraction and evaluation.
+    
+    Drops headers and footers repeated at the edges of pages, page numbers and
+    duplicate lines. It also collapses whitespace and rejoins words
+    hyphenated across line breaks. With a token budget, whole sections are
+    trimmed lowest-priority first (hobbies and references before
+    experience and skills).
+    """
+    
+    def __init__(self, token_budget: int = 0):
+        """
+        Initialize the compactor.
+        
+        Args:
+            token_budget: Maximum estimated tokens of CV text; 0 disables truncation
+        """
+        self.token_budget = token_budget
+    
+    def compact(self, pages: list[str]) -> TextCompactionResult:
+        """
+        Compact per-page CV text.
+        
+        Args:
+            pages: Extracted text per page
+            
+        Returns:
+            Compacted text with before/after token estimates
+        """
+        original = "\n\n".join(page for page in pages if page.strip())
+        page_lines = [self._normalize_lines(page) for page in pages]
+        repeated = self._repeated_lines(page_lines)
+        
+        lines: list[str] = []
+        seen_repeated: set[str] = set()
+        for page in page_lines:
+            edges = self._edge_positions(page)
+            for position, line in enumerate(page):
+                key = _line_key(line)
+                if position in edges and key in repeated:
+                    # Keep the first copy of a running header/footer, drop the rest
+                    if key in seen_repeated:
+                        continue
+                    seen_repeated.add(key)
+                if PAGE_NUMBER_PATTERN.match(line):
+                    continue
+                if line and lines and line == lines[-1]:
+                    continue
+                if not line and (not lines or not lines[-1]):
+                    continue
+                lines.append(line)
+            if lines and lines[-1]:
+                lines.append("")
+        
+        text = "\n".join(self._dehyphenate(lines)).strip()
+        truncated = False
+        if self.token_budget and estimate_tokens(text) > self.token_budget:
+            text = self._apply_budget(text)
+            truncated = True
+        
+        result = TextCompactionResult(
+            text=text,
+            original_tokens=estimate_tokens(original),
+            compacted_tokens=estimate_tokens(text),
+            truncated=truncated
+        )
+        COMPACTION_TOKENS_SAVED.observe(result.tokens_saved)
+        logger.info(
+            f"Compacted CV text from ~{result.original_tokens} to ~{result.compacted_tokens} "
+            f"tokens (saved ~{result.tokens_saved}{', truncated' if truncated else ''})"
+        )
+        return result
+    
+    @staticmethod
+    def _normalize_lines(page: str) -> list[str]:
+        """Split a page into lines with whitespace runs collapsed."""
+        return [WHITESPACE_PATTERN.sub(" ", line).strip() for line in page.splitlines()]
+    
+    @staticmethod
+    def _repeated_lines(page_lines: list[list[str]]) -> set[str]:
+        """
+        Find header/footer lines: near the top or bottom of a page and
+        present on at least half the pages (and at least two).
+        """
+        if len(page_lines) < 2:
+            return set()
+        
+        counts: Counter[str] = Counter()
+        for lines in page_lines:
+            edges = {_line_key(lines[position]) for position in TextCompactor._edge_positions(lines)}
+            counts.update(edges)
+        
+        threshold = max(2, math.ceil(len(page_lines) / 2))
+        return {key for key, count in counts.items() if key and count >= threshold}
+    
+    @staticmethod
+    def _edge_positions(lines: list[str]) -> set[int]:
+        """Positions of the first and last few non-empty lines of a page."""
+        content = [position for position, line in enumerate(lines) if line]
+        return set(content[:EDGE_LINES] + content[-EDGE_LINES:])
+    
+    @staticmethod
+    def _dehyphenate(lines: list[str]) -> list[str]:
+        """Join words split with a hyphen at a line break (e.g. "manage-" + "ment")."""
+        merged: list[str] = []
+        for line in lines:
+            if (
+                merged
+                and line[:1].islower()
+                and HYPHENATED_END_PATTERN.search(merged[-1])
+            ):
+                head, _, word_start = merged[-1].rpartition(" ")
+                word, _, rest = line.partition(" ")
+                joined = word_start[:-1] + word
+                merged[-1] = " ".join(part for part in (head, joined) if part)
+                if rest:
+                    merged[-1] += " " + rest
+                continue
+            merged.append(line)
+        return merged
+    
+    def _apply_budget(self, text: str) -> str:
+        """
+        Trim sections, lowest priority first, until the text fits the budget.
+        Section order is preserved; a partially trimmed section keeps its
+        first lines followed by a "[...]" marker.
+        """
+        sections = _split_sections(text)
+        budget_chars = self.token_budget * CHARS_PER_TOKEN
+        total = sum(len(body) for _, body in sections)
+        
+        # Trim from the least important (and, among equals, the last) section
+        order = sorted(
+            range(len(sections)),
+            key=lambda index: (sections[index][0], index),
+            reverse=True
+        )
+        bodies = [body for _, body in sections]
+        for index in order:
+            if total <= budget_chars:
+                break
+            excess = total - budget_chars
+            body = bodies[index]
+            # Cut at a line boundary so no line is left half-written
+            kept = body[:max(0, len(body) - excess)]
+            kept = kept[:kept.rfind("\n")] if "\n" in kept else ""
+            bodies[index] = kept.rstrip() + "\n[...]" if kept.strip() else ""
+            total -= len(body) - len(bodies[index])
+        
+        return "\n".join(body for body in bodies if body).strip()
+
+
+def _line_key(line: str) -> str:
+    """
+    Normalize a line for header/footer comparison.
+    Only page labels are generalized; other digits (dates, phone numbers) must match exactly.
+    """
+    return PAGE_LABEL_PATTERN.sub("page #", line.lower())
+
+
+def _split_sections(text: str) -> list[tuple[int, str]]:
+    """
+    Split CV text at recognizable section headings.
+    
+    Returns:
+        List of (priority, section text including its heading), in order
+    """
+    sections: list[tuple[int, list[str]]] = [(PREAMBLE_PRIORITY, [])]
+    for line in text.split("\n"):
+        heading = line.strip().rstrip(":").lower()
+        if heading in SECTION_PRIORITIES and len(line) < 40:
+            sections.append((SECTION_PRIORITIES[heading], [line]))
+        else:
+            sections[-1][1].append(line)
+    return [(priority, "\n".join(lines)) for priority, lines in sections if lines]
@@ -0,0 +1,200 @@
+"""
+Upload Ingestion Service.
+Streams uploaded files into spooled temporary storage with early size and type checks.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Optional, Union
+from fastapi import UploadFile
+
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b"%PDF-"
+# PDF readers accept the header anywhere in the first kilobyte
+PDF_MAGIC_SEARCH_BYTES = 1024
+
+
+class SpooledUpload:
+    """
+    An uploaded file held in memory until it grows past a threshold, then on disk.
+    
+    Unlike `tempfile.SpooledTemporaryFile`, the on-disk file is named, so it
+    can be handed to a PDF worker process by path instead of being copied
+    through the process pool as bytes.
+    
+    The spool is reference-counted: work that may outlive the request that
+    read the upload (a shared in-flight task) calls `retain` and later
+    `close`, and the content is released only by the last `close`.
+    """
+    
+    def __init__(self, max_memory_bytes: int):
+        """
+        Create an empty spool.
+        
+        Args:
+            max_memory_bytes: Size above which content is moved to a temporary file
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.size = 0
+        self.path: Optional[str] = None
+        self._file: BinaryIO = io.BytesIO()
+        self._hash = hashlib.sha256()
+        self._references = 1
+    
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of everything written so far."""
+        return self._hash.hexdigest()
+    
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk, updating the hash and rolling over to disk if needed."""
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        
+        if self.path is None and self.size > self.max_memory_bytes:
+            self._rollover()
+        self._file.write(chunk)
+    
+    def source(self) -> Union[bytes, str]:
+        """
+        Return the content in the cheapest form for a PDF parser.
+        
+        Returns:
+            The temporary file path if spooled to disk, otherwise the bytes
+        """
+        if self.path is not None:
+            self._file.flush()
+            return self.path
+        return self._file.getvalue()
+    
+    def read_bytes(self) -> bytes:
+        """Return the full content as bytes."""
+        if self.path is None:
+            return self._file.getvalue()
+        self._file.flush()
+        with open(self.path, "rb") as f:
+            return f.read()
+    
+    def retain(self) -> "SpooledUpload":
+        """Keep the content alive until a matching `close`."""
+        self._references += 1
+        return self
+    
+    def close(self) -> None:
+        """Drop one reference; the last one releases the buffer and deletes any temporary file."""
+        self._references -= 1
+        if self._references > 0:
+            return
+        self._file.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+    
+    def __enter__(self) -> "SpooledUpload":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _rollover(self) -> None:
+        """Move buffered content into a named temporary file."""
+        buffered = self._file.getvalue()
+        disk_file = tempfile.NamedTemporaryFile(prefix="cv-upload-", suffix=".pdf", delete=False)
+        disk_file.write(buffered)
+        self._file.close()
+        self._file = disk_file
+        self.path = disk_file.name
+
+
+def check_pdf_header(head: bytes) -> None:
+    """
+    Check that content starts like a PDF.
+    
+    Args:
+        head: The first bytes of the file (at least the first chunk read)
+        
+    Raises:
+        ValueError: If no PDF header is found
+    """
+    if PDF_MAGIC not in head[:PDF_MAGIC_SEARCH_BYTES]:
+        raise ValueError("Invalid file content. The file is not a PDF.")
+
+
+def validate_pdf(content: bytes, max_bytes: int) -> bytes:
+    """
+    Apply the upload checks to a PDF that was read whole, e.g. a batch item or ZIP entry.
+    
+    Args:
+        content: File content, read up to at most `max_bytes + 1` bytes
+        max_bytes: Maximum accepted file size
+        
+    Returns:
+        The content, unchanged
+        
+    Raises:
+        ValueError: If the file is empty, too large or is not a PDF
+    """
+    if not content:
+        raise ValueError("Uploaded file is empty")
+    if len(content) > max_bytes:
+        raise ValueError(f"File too large. Maximum size is {max_bytes // (1024 * 1024)}MB.")
+    check_pdf_header(content)
+    return content
+
+
+async def read_upload(
+    upload: UploadFile,
+    max_bytes: int,
+    chunk_size: int = 64 * 1024,
+    max_memory_bytes: int = 1024 * 1024
+) -> SpooledUpload:
+    """
+    Stream an uploaded PDF into a spool, validating it while reading.
+    
+    Reading stops at the first chunk that crosses `max_bytes`, and the PDF
+    header is checked in the first chunk, so oversized or non-PDF uploads
+    are rejected without being buffered in full.
+    
+    Args:
+        upload: FastAPI upload to read
+        max_bytes: Maximum accepted file size
+        chunk_size: Bytes read per iteration
+        max_memory_bytes: Size above which the spool moves to disk
+        
+    Returns:
+        Spooled upload with size and SHA-256 (caller must close it)
+        
+    Raises:
+        ValueError: If the file is too large or is not a PDF
+    """
+    max_mb = max_bytes // (1024 * 1024)
+    if upload.size is not None and upload.size > max_bytes:
+        raise ValueError(f"File too large. Maximum size is {max_mb}MB.")
+    
+    spool = SpooledUpload(max_memory_bytes)
+    try:
+        first = True
+        while chunk := await upload.read(chunk_size):
+            if first:
+                check_pdf_header(chunk)
+                first = False
+            
+            if spool.size + len(chunk) > max_bytes:
+                raise ValueError(f"File too large. Maximum size is {max_mb}MB.")
+            spool.write(chunk)
+        
+        if first:
+            raise ValueError("Uploaded file is empty")
+        
+        return spool
+        
+    except Exception:
+        spool.close()
+        raise
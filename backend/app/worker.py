@@ -0,0 +1,65 @@
+"""
+CV Screening Agent - Standalone Job Worker.
+Processes queued screening jobs outside the API process.
+
+Run as many of these as needed against a shared SQLite queue:
+
+    JOB_QUEUE_BACKEND=sqlite JOB_WORKERS=0 uvicorn app.main:app   # API only
+    JOB_QUEUE_BACKEND=sqlite python -m app.worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Optional
+from .config import get_settings
+from .routers import shutdown_dependencies, shutdown_job_workers
+from .routers.job_router import create_job_worker
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def run(concurrency: int) -> None:
+    """
+    Process jobs until interrupted.
+    
+    Args:
+        concurrency: Jobs processed at the same time
+    """
+    worker = create_job_worker(concurrency)
+    logger.info(f"Job worker started with concurrency {concurrency}")
+    try:
+        await worker.run_forever()
+    finally:
+        await shutdown_job_workers()
+        await shutdown_dependencies()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Parse arguments and run the worker."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run CV screening job workers")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=max(1, settings.job_workers),
+        help="Jobs processed at the same time (default: JOB_WORKERS)"
+    )
+    args = parser.parse_args(argv)
+    
+    if settings.job_queue_backend == "memory":
+        parser.error("JOB_QUEUE_BACKEND=memory cannot be shared with a separate worker; use sqlite")
+    
+    try:
+        asyncio.run(run(args.concurrency))
+    except KeyboardInterrupt:
+        logger.info("Job worker stopped")
+
+
+if __name__ == "__main__":
+    main()
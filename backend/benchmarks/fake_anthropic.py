@@ -0,0 +1,303 @@
+"""
+Local fake of the Anthropic Messages and Message Batches APIs.
+
+Returns canned CV evaluations so the backend can be exercised without
+network access or an API key. Point the app at it with:
+
+    python -m benchmarks.fake_anthropic --port 8765
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8765 uvicorn app.main:app
+
+Latency and error injection (--latency-ms, --error-rate, --rate-limit-rate)
+let load tests see realistic response times and exercise retries.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+app = FastAPI(title="Fake Anthropic API")
+
+# Tunables, overridable from the command line
+config = {
+    "batch_delay_seconds": 2.0,
+    # Share of first attempts answered with malformed output (repair calls are always valid)
+    "malformed_rate": 0.0,
+    # Simulated model latency per Messages call: mean +/- uniform jitter, in milliseconds
+    "latency_ms": 0.0,
+    "latency_jitter_ms": 0.0,
+    # Share of Messages calls failing with 529 overloaded / 429 rate limited
+    "error_rate": 0.0,
+    "rate_limit_rate": 0.0,
+}
+
+# batch_id -> {"created": float, "requests": list[dict], "base_url": str}
+_batches: dict[str, dict] = {}
+
+
+def canned_evaluation(cv_text: str) -> dict:
+    """
+    Build a plausible evaluation from simple keyword checks on the CV text.
+    
+    Args:
+        cv_text: The user message sent to the model
+        
+    Returns:
+        Evaluation dict in the format requested by the system prompt
+    """
+    lowered = cv_text.lower()
+    education = bool(re.search(r"bachelor|master|bsc|msc|phd|diploma|degree", lowered))
+    fintech = bool(re.search(r"bank|crypto|fintech|trading|payment|exchange|finance", lowered))
+    tech = bool(re.search(r"python|typescript", lowered))
+    passed = [education, fintech, tech]
+    score = 30 * sum(passed) + (10 if all(passed) else 0)
+    status = "pass" if score >= 60 and sum(passed) >= 2 else "fail"
+    
+    name_match = re.search(r"--- CV CONTENT START ---\s*\n(.+)", cv_text)
+    return {
+        "status": status,
+        "match_score": score,
+        "reasoning": f"Keyword screen found {sum(passed)} of 3 criteria.",
+        "criteria": [
+            {"name": "Education", "passed": education, "details": "Keyword match" if education else "Not found"},
+            {"name": "Fintech Experience", "passed": fintech, "details": "Keyword match" if fintech else "Not found"},
+            {"name": "Technical Skills", "passed": tech, "details": "Keyword match" if tech else "Not found"},
+        ],
+        "candidate_name": name_match.group(1).strip() if name_match else None,
+    }
+
+
+def message_response(params: dict) -> dict:
+    """
+    Build a Messages API response body for the given request parameters.
+    Requests that force a tool get a `tool_use` block instead of text, and
+    multi-role requests get one evaluation per `<role id="...">` in the system prompt.
+    """
+    user_text = _user_text(params)
+    evaluation = canned_evaluation(user_text)
+    malformed = len(params.get("messages", [])) == 1 and random.random() < config["malformed_rate"]
+    
+    role_ids = re.findall(r'<role id="([^"]+)">', _system_text(params))
+    if role_ids:
+        evaluation = {"evaluations": {role_id: canned_evaluation(user_text) for role_id in role_ids}}
+    
+    tool_choice = params.get("tool_choice") or {}
+    if tool_choice.get("type") == "tool":
+        if malformed:
+            (evaluation["evaluations"][role_ids[0]] if role_ids else evaluation).pop("reasoning")
+        content = [{
+            "type": "tool_use",
+            "id": f"toolu_{uuid.uuid4().hex[:24]}",
+            "name": tool_choice["name"],
+            "input": evaluation,
+        }]
+        text = json.dumps(evaluation)
+        stop_reason = "tool_use"
+    else:
+        text = json.dumps(evaluation)
+        if malformed:
+            text = text[:len(text) // 2]
+        content = [{"type": "text", "text": text}]
+        stop_reason = "end_turn"
+    
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": params.get("model", "fake-model"),
+        "content": content,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": max(1, len(user_text) // 4),
+            "output_tokens": max(1, len(text) // 4),
+        },
+    }
+
+
+@app.post("/v1/messages")
+async def create_message(request: Request):
+    """Fake `POST /v1/messages`, with server-sent events when `stream` is set."""
+    params = await request.json()
+    
+    latency = config["latency_ms"] + random.uniform(-1, 1) * config["latency_jitter_ms"]
+    if latency > 0:
+        await asyncio.sleep(latency / 1000)
+    
+    roll = random.random()
+    if roll < config["error_rate"]:
+        return _error(529, "overloaded_error", "Overloaded")
+    if roll < config["error_rate"] + config["rate_limit_rate"]:
+        return _error(429, "rate_limit_error", "Rate limit exceeded", {"retry-after": "1"})
+    
+    message = message_response(params)
+    if params.get("stream"):
+        return StreamingResponse(_sse_events(message), media_type="text/event-stream")
+    return message
+
+
+async def _sse_events(message: dict):
+    """Replay a complete message as a Messages API event stream."""
+    block = message["content"][0]
+    start = {**message, "content": [], "stop_reason": None,
+             "usage": {**message["usage"], "output_tokens": 1}}
+    
+    yield _sse("message_start", {"type": "message_start", "message": start})
+    if block["type"] == "tool_use":
+        text = json.dumps(block["input"])
+        opening = {**block, "input": {}}
+        delta_type, delta_key = "input_json_delta", "partial_json"
+    else:
+        text = block["text"]
+        opening = {"type": "text", "text": ""}
+        delta_type, delta_key = "text_delta", "text"
+    yield _sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                       "content_block": opening})
+    for offset in range(0, len(text), 16):
+        yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                           "delta": {"type": delta_type, delta_key: text[offset:offset + 16]}})
+    yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+    yield _sse("message_delta", {"type": "message_delta",
+                                 "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                                 "usage": {"output_tokens": message["usage"]["output_tokens"]}})
+    yield _sse("message_stop", {"type": "message_stop"})
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/v1/messages/batches")
+async def create_batch(request: Request):
+    """Fake `POST /v1/messages/batches`."""
+    body = await request.json()
+    batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+    _batches[batch_id] = {
+        "created": time.time(),
+        "requests": body["requests"],
+        "base_url": str(request.base_url).rstrip("/"),
+    }
+    return _batch_object(batch_id)
+
+
+@app.get("/v1/messages/batches/{batch_id}")
+async def retrieve_batch(batch_id: str):
+    """Fake `GET /v1/messages/batches/{id}`."""
+    if batch_id not in _batches:
+        return _not_found(batch_id)
+    return _batch_object(batch_id)
+
+
+@app.get("/v1/messages/batches/{batch_id}/results")
+async def batch_results(batch_id: str):
+    """Fake results download: one JSON line per request."""
+    if batch_id not in _batches:
+        return _not_found(batch_id)
+    lines = [
+        json.dumps({
+            "custom_id": item["custom_id"],
+            "result": {"type": "succeeded", "message": message_response(item["params"])},
+        })
+        for item in _batches[batch_id]["requests"]
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="application/binary")
+
+
+def _batch_object(batch_id: str) -> dict:
+    """Render the stored batch as a MessageBatch object."""
+    batch = _batches[batch_id]
+    created = datetime.fromtimestamp(batch["created"], tz=timezone.utc)
+    ended = time.time() - batch["created"] >= config["batch_delay_seconds"]
+    count = len(batch["requests"])
+    return {
+        "id": batch_id,
+        "type": "message_batch",
+        "processing_status": "ended" if ended else "in_progress",
+        "request_counts": {
+            "processing": 0 if ended else count,
+            "succeeded": count if ended else 0,
+            "errored": 0,
+            "canceled": 0,
+            "expired": 0,
+        },
+        "created_at": created.isoformat(),
+        "expires_at": (created + timedelta(hours=24)).isoformat(),
+        "ended_at": (created + timedelta(seconds=config["batch_delay_seconds"])).isoformat() if ended else None,
+        "archived_at": None,
+        "cancel_initiated_at": None,
+        "results_url": f"{batch['base_url']}/v1/messages/batches/{batch_id}/results" if ended else None,
+    }
+
+
+def _user_text(params: dict) -> str:
+    """Concatenate the text of every user message in a request."""
+    parts = []
+    for message in params.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get("text", "") for block in content or [])
+    return "\n".join(parts)
+
+
+def _system_text(params: dict) -> str:
+    """Text of the system prompt, given as a string or as text blocks."""
+    system = params.get("system") or ""
+    if isinstance(system, str):
+        return system
+    return "\n".join(block.get("text", "") for block in system)
+
+
+def _not_found(batch_id: str) -> JSONResponse:
+    """Anthropic-style 404 error body."""
+    return _error(404, "not_found_error", f"{batch_id} not found")
+
+
+def _error(status_code: int, error_type: str, message: str, headers: Optional[dict] = None) -> JSONResponse:
+    """Anthropic-style error response."""
+    return JSONResponse(
+        status_code=status_code,
+        content={"type": "error", "error": {"type": error_type, "message": message}},
+        headers=headers,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description="Fake Anthropic API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--batch-delay", type=float, default=config["batch_delay_seconds"])
+    parser.add_argument("--malformed-rate", type=float, default=config["malformed_rate"],
+                        help="Share of first attempts answered with malformed output")
+    parser.add_argument("--latency-ms", type=float, default=config["latency_ms"],
+                        help="Mean simulated latency of each Messages call")
+    parser.add_argument("--latency-jitter-ms", type=float, default=config["latency_jitter_ms"],
+                        help="Uniform jitter added to or removed from the latency")
+    parser.add_argument("--error-rate", type=float, default=config["error_rate"],
+                        help="Share of Messages calls answered with 529 overloaded")
+    parser.add_argument("--rate-limit-rate", type=float, default=config["rate_limit_rate"],
+                        help="Share of Messages calls answered with 429 and Retry-After")
+    args = parser.parse_args(argv)
+    
+    config["batch_delay_seconds"] = args.batch_delay
+    config["malformed_rate"] = args.malformed_rate
+    config["latency_ms"] = args.latency_ms
+    config["latency_jitter_ms"] = args.latency_jitter_ms
+    config["error_rate"] = args.error_rate
+    config["rate_limit_rate"] = args.rate_limit_rate
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
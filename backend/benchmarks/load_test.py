@@ -0,0 +1,395 @@
+"""
+Benchmark: end-to-end load test of POST /api/cv/upload against the fake Anthropic API.
+
+Starts the fake Messages API in a subprocess, runs the FastAPI app in-process
+(no sockets on the app side), and uploads a corpus of generated CVs of
+several page counts. Needs no network access or API key.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --requests 200 --concurrency 16 --pages 1 3 10
+    python -m benchmarks.load_test --latency-ms 800 --error-rate 0.05 --json results.json
+    python -m benchmarks.load_test --max-p95-ms 1500 --min-throughput 10   # fail on regression
+
+Reports throughput, p50/p95/p99 latency (overall and per page count),
+Python heap per request, peak RSS, and CPU per pipeline stage. Stage CPU
+and memory come from sequential calibration passes, where process CPU
+time between stage boundaries belongs to that one request (heap is
+traced in a separate pass, since tracing inflates CPU time). With
+--pdf-workers > 0, PDF parsing runs in child processes and the
+pdf_ingest stage only shows the in-process share.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Optional
+from .pdf_factory import build_cv_pdf
+
+
+def free_port() -> int:
+    """Ask the OS for an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_anthropic(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    """Launch the fake Anthropic API and wait until it accepts connections."""
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.fake_anthropic", "--port", str(port),
+            "--latency-ms", str(args.latency_ms),
+            "--latency-jitter-ms", str(args.latency_jitter_ms),
+            "--error-rate", str(args.error_rate),
+            "--rate-limit-rate", str(args.rate_limit_rate),
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Fake Anthropic server exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Fake Anthropic server did not start")
+
+
+def configure_app(base_url: str, args: argparse.Namespace) -> None:
+    """
+    Point the app at the fake server before it is imported.
+    The Anthropic endpoint is always the fake server; other settings use
+    setdefault, so they can still be overridden from the environment.
+    """
+    os.environ["ANTHROPIC_BASE_URL"] = base_url
+    os.environ["ANTHROPIC_API_KEY"] = "sk-benchmark-not-a-real-key"
+    defaults = {
+        # Measure the full pipeline on every request unless asked otherwise
+        "CACHE_ENABLED": str(args.cache).lower(),
+        "STORE_ENABLED": "false",
+        "JOB_WORKERS": "0",
+        # Keep the client-side scheduler from pacing the benchmark itself
+        "ANTHROPIC_REQUESTS_PER_MINUTE": "1000000",
+        "ANTHROPIC_INPUT_TOKENS_PER_MINUTE": "1000000000",
+        "ANTHROPIC_MAX_CONCURRENCY": str(max(args.concurrency, 1)),
+        "ANTHROPIC_RETRY_BASE_SECONDS": "0.05",
+        "ANTHROPIC_RETRY_MAX_SECONDS": "1",
+        "PDF_POOL_WORKERS": str(args.pdf_workers),
+    }
+    for name, value in defaults.items():
+        os.environ.setdefault(name, value)
+
+
+def build_corpus(pages: list[int], per_size: int) -> list[tuple[int, str, bytes]]:
+    """Distinct CVs (so no two share text) for every page count."""
+    corpus = []
+    for page_count in pages:
+        for index in range(per_size):
+            seed = page_count * 1000 + index
+            corpus.append((page_count, f"cv_{page_count}p_{index}.pdf", build_cv_pdf(page_count, seed=seed)))
+    return corpus
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def latency_summary(values: list[float]) -> dict:
+    """Latency percentiles in milliseconds."""
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values), 1),
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "p99_ms": round(percentile(values, 99), 1),
+        "max_ms": round(max(values), 1),
+    }
+
+
+class StageProfiler:
+    """
+    Accumulates process CPU time per pipeline stage by wrapping the stage
+    methods of the shared pipeline. Only meaningful while one request runs
+    at a time.
+    """
+    
+    def __init__(self):
+        self.cpu_ms: dict[str, list[float]] = defaultdict(list)
+        self.enabled = False
+    
+    def wrap_async(self, owner, name: str, stage: str) -> None:
+        original = getattr(owner, name)
+        
+        async def timed(*args, **kwargs):
+            started = time.process_time()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                if self.enabled:
+                    self.cpu_ms[stage].append((time.process_time() - started) * 1000)
+        
+        setattr(owner, name, timed)
+    
+    def wrap_sync(self, owner, name: str, stage: str) -> None:
+        original = getattr(owner, name)
+        
+        def timed(*args, **kwargs):
+            started = time.process_time()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if self.enabled:
+                    self.cpu_ms[stage].append((time.process_time() - started) * 1000)
+        
+        setattr(owner, name, timed)
+    
+    def summary(self) -> dict:
+        return {
+            stage: {"mean_ms": round(statistics.fmean(values), 2), "p95_ms": round(percentile(values, 95), 2)}
+            for stage, values in self.cpu_ms.items()
+        }
+
+
+async def upload(client, filename: str, pdf: bytes) -> tuple[int, float]:
+    """POST one CV; returns (status code, latency in ms)."""
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/cv/upload",
+        files={"file": (filename, pdf, "application/pdf")}
+    )
+    return response.status_code, (time.perf_counter() - started) * 1000
+
+
+async def calibrate(client, corpus: list[tuple[int, str, bytes]], profiler: StageProfiler) -> dict:
+    """
+    Sequential passes: stage CPU, then Python heap growth per request.
+    
+    Returns:
+        Per page count: mean CPU per request and peak traced heap per request
+    """
+    per_size: dict[int, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+    
+    profiler.enabled = True
+    try:
+        for page_count, filename, pdf in corpus:
+            started = time.process_time()
+            status, _ = await upload(client, filename, pdf)
+            if status == 200:
+                per_size[page_count]["cpu_ms"].append((time.process_time() - started) * 1000)
+    finally:
+        profiler.enabled = False
+    
+    tracemalloc.start()
+    try:
+        for page_count, filename, pdf in corpus:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            status, _ = await upload(client, filename, pdf)
+            _, peak = tracemalloc.get_traced_memory()
+            if status == 200:
+                per_size[page_count]["heap_kb"].append((peak - baseline) / 1024)
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        page_count: {
+            "cpu_ms_per_request": round(statistics.fmean(values["cpu_ms"]), 2),
+            "peak_heap_kb_per_request": round(statistics.fmean(values["heap_kb"]), 1),
+        }
+        for page_count, values in sorted(per_size.items())
+        if values["cpu_ms"] and values["heap_kb"]
+    }
+
+
+async def load(client, corpus: list[tuple[int, str, bytes]], total: int, concurrency: int) -> dict:
+    """
+    Concurrent pass: throughput and latency percentiles.
+    
+    Returns:
+        Throughput, status counts and latency summaries (overall and per page count)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results: list[tuple[int, int, float]] = []
+    
+    async def one(index: int) -> None:
+        page_count, filename, pdf = corpus[index % len(corpus)]
+        async with semaphore:
+            status, latency = await upload(client, filename, pdf)
+        results.append((page_count, status, latency))
+    
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(total)))
+    elapsed = time.perf_counter() - started
+    cpu_ms = (time.process_time() - cpu_started) * 1000
+    
+    ok = [latency for _, status, latency in results if status == 200]
+    statuses: dict[str, int] = defaultdict(int)
+    by_size: dict[int, list[float]] = defaultdict(list)
+    for page_count, status, latency in results:
+        statuses[str(status)] += 1
+        if status == 200:
+            by_size[page_count].append(latency)
+    
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "cpu_ms_per_request": round(cpu_ms / total, 2),
+        "status_counts": dict(statuses),
+        "latency": latency_summary(ok),
+        "latency_by_pages": {page_count: latency_summary(values) for page_count, values in sorted(by_size.items())},
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run calibration and load passes against the in-process app."""
+    import httpx
+    from app.main import app
+    from app.routers.cv_router import get_screening_pipeline
+    
+    # The package re-exports the router object under the module's name
+    cv_router_module = importlib.import_module("app.routers.cv_router")
+    
+    corpus = build_corpus(args.pages, args.corpus_size)
+    profiler = StageProfiler()
+    
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            # Warm up imports, pools and the HTTP connection to the fake server
+            await upload(client, "warmup.pdf", build_cv_pdf(1, seed=999999))
+            
+            pipeline = get_screening_pipeline()
+            profiler.wrap_async(cv_router_module, "_read_upload", "upload_read")
+            profiler.wrap_async(pipeline, "ingest", "pdf_ingest")
+            profiler.wrap_sync(pipeline, "prepare_text", "text_prepare")
+            profiler.wrap_async(pipeline, "evaluate", "evaluate")
+            profiler.wrap_async(pipeline, "run", "pipeline_total")
+            
+            calibration = await calibrate(client, corpus, profiler)
+            stage_cpu = profiler.summary()
+            
+            load_results = await load(client, corpus, args.requests, args.concurrency)
+    
+    return {
+        "config": {
+            "pages": args.pages,
+            "corpus_size_per_page_count": args.corpus_size,
+            "latency_ms": args.latency_ms,
+            "latency_jitter_ms": args.latency_jitter_ms,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+            "cache": args.cache,
+            "pdf_workers": args.pdf_workers,
+        },
+        "load": load_results,
+        "per_request": calibration,
+        "stage_cpu_ms": stage_cpu,
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+            1
+        ),
+    }
+
+
+def print_report(report: dict) -> None:
+    """Human-readable summary."""
+    load_results = report["load"]
+    latency = load_results["latency"]
+    print(f"\nLoad: {load_results['requests']} requests, concurrency {load_results['concurrency']}, "
+          f"{load_results['elapsed_s']}s")
+    print(f"  throughput   {load_results['throughput_rps']} req/s   statuses {load_results['status_counts']}")
+    if latency["count"]:
+        print(f"  latency ms   p50 {latency['p50_ms']}  p95 {latency['p95_ms']}  "
+              f"p99 {latency['p99_ms']}  max {latency['max_ms']}")
+    print(f"  CPU/request  {load_results['cpu_ms_per_request']} ms   peak RSS {report['peak_rss_mb']} MB")
+    
+    print(f"\n{'pages':>5}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'CPU ms/req':>10}  {'heap KB/req':>11}")
+    for page_count, summary in load_results["latency_by_pages"].items():
+        calibration = report["per_request"].get(page_count, {})
+        print(f"{page_count:>5}  {summary.get('p50_ms', 0):>8}  {summary.get('p95_ms', 0):>8}  "
+              f"{summary.get('p99_ms', 0):>8}  {calibration.get('cpu_ms_per_request', 0):>10}  "
+              f"{calibration.get('peak_heap_kb_per_request', 0):>11}")
+    
+    print(f"\n{'stage':<15}  {'CPU mean ms':>11}  {'CPU p95 ms':>10}")
+    for stage, summary in report["stage_cpu_ms"].items():
+        print(f"{stage:<15}  {summary['mean_ms']:>11}  {summary['p95_ms']:>10}")
+
+
+def check_thresholds(report: dict, args: argparse.Namespace) -> list[str]:
+    """Regression gates; returns the violated ones."""
+    failures = []
+    latency = report["load"]["latency"]
+    if args.max_p95_ms is not None and latency.get("p95_ms", float("inf")) > args.max_p95_ms:
+        failures.append(f"p95 latency {latency.get('p95_ms')} ms > {args.max_p95_ms} ms")
+    if args.min_throughput is not None and report["load"]["throughput_rps"] < args.min_throughput:
+        failures.append(f"throughput {report['load']['throughput_rps']} req/s < {args.min_throughput} req/s")
+    ok = report["load"]["status_counts"].get("200", 0)
+    if args.max_error_share is not None and 1 - ok / report["load"]["requests"] > args.max_error_share:
+        failures.append(f"{report['load']['requests'] - ok} failed requests exceed {args.max_error_share:.0%}")
+    return failures
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100, help="Uploads in the load pass")
+    parser.add_argument("--concurrency", type=int, default=8, help="Uploads in flight at once")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 3, 10], help="Page counts in the corpus")
+    parser.add_argument("--corpus-size", type=int, default=5, help="Distinct CVs per page count")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Mean fake Claude latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=100.0, help="Uniform latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fake 529 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of fake 429 responses")
+    parser.add_argument("--cache", action="store_true", help="Keep the result cache enabled")
+    parser.add_argument("--pdf-workers", type=int, default=0,
+                        help="PDF process pool size (0 parses in a thread, so stage CPU covers parsing)")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, help="Exit non-zero if p95 latency exceeds this")
+    parser.add_argument("--min-throughput", type=float, help="Exit non-zero if req/s falls below this")
+    parser.add_argument("--max-error-share", type=float, help="Exit non-zero if more uploads than this fail")
+    args = parser.parse_args(argv)
+    
+    port = free_port()
+    fake = start_fake_anthropic(port, args)
+    try:
+        configure_app(f"http://127.0.0.1:{port}", args)
+        report = asyncio.run(run(args))
+    finally:
+        fake.terminate()
+        fake.wait(timeout=10)
+    
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump(report, handle, indent=2)
+    
+    failures = check_thresholds(report, args)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
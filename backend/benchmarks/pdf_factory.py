@@ -0,0 +1,135 @@
+"""
+Synthetic CV PDF generator for benchmarks.
+Builds small text-only PDFs by hand so benchmarks need no extra dependencies.
+"""
+
+import random
+
+CV_SECTIONS = [
+    ("Summary", [
+        "Software engineer with {years} years of experience building trading and payment systems.",
+        "Comfortable across backend services, data pipelines and customer-facing web apps.",
+    ]),
+    ("Experience", [
+        "Senior Engineer, Crypto Exchange Ltd ({start} - Present)",
+        "- Built order matching services in Python and FastAPI handling 5k req/s",
+        "- Led migration of the settlement dashboard to React and TypeScript",
+        "Backend Developer, Retail Bank plc ({start2} - {start})",
+        "- Maintained payment reconciliation jobs and KYC integrations",
+        "- Wrote Django services for card transaction monitoring",
+    ]),
+    ("Education", [
+        "BSc Computer Science, State University ({grad})",
+        "High School Diploma, Central High School",
+    ]),
+    ("Skills", [
+        "Python, TypeScript, JavaScript, Node.js, React, PostgreSQL, Redis, Docker",
+        "Blockchain, DeFi protocols, market data feeds, risk engines",
+    ]),
+    ("Interests", [
+        "Chess, marathon running, open-source contributions",
+    ]),
+]
+
+
+def _escape(text: str) -> str:
+    """Escape characters that are special inside PDF literal strings."""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def cv_lines(seed: int = 0, name: str = "Jane Doe") -> list[str]:
+    """
+    Produce one page worth of plausible CV lines.
+    
+    Args:
+        seed: Random seed so corpora are reproducible
+        name: Candidate name used in the header
+        
+    Returns:
+        List of text lines
+    """
+    rng = random.Random(seed)
+    start = rng.randint(2015, 2021)
+    values = {
+        "years": rng.randint(2, 12),
+        "start": start,
+        "start2": start - rng.randint(1, 4),
+        "grad": start - rng.randint(1, 3),
+    }
+    lines = [name, f"{name.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(1000, 9999)}"]
+    for heading, body in CV_SECTIONS:
+        lines.append("")
+        lines.append(heading)
+        lines.extend(line.format(**values) for line in body)
+    return lines
+
+
+def build_pdf(pages: list[list[str]]) -> bytes:
+    """
+    Build a minimal, valid PDF with one Helvetica text block per page.
+    
+    Args:
+        pages: Text lines for each page
+        
+    Returns:
+        Raw PDF bytes
+    """
+    objects: list[bytes] = []
+    page_count = len(pages)
+    font_id = 3 + 2 * page_count
+    page_ids = [3 + 2 * i for i in range(page_count)]
+    
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{pid} 0 R" for pid in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode())
+    
+    for index, lines in enumerate(pages):
+        content_id = page_ids[index] + 1
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+            f"/Contents {content_id} 0 R >>".encode()
+        )
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 750 Td"]
+        for line in lines:
+            ops.append(f"({_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", errors="replace")
+        objects.append(
+            b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n"
+            + stream + b"\nendstream"
+        )
+    
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n".encode()
+    out += b"0000000000 65535 f \n"
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(out)
+
+
+def build_cv_pdf(page_count: int, seed: int = 0, name: str = "Jane Doe") -> bytes:
+    """
+    Build a synthetic multi-page CV.
+    
+    Args:
+        page_count: Number of pages to generate
+        seed: Random seed for reproducible content
+        name: Candidate name
+        
+    Returns:
+        Raw PDF bytes
+    """
+    return build_pdf([cv_lines(seed + page, name) for page in range(page_count)])
@@ -0,0 +1,78 @@
+"""
+Benchmark: single-pass PDF ingestion vs. the two-pass validate + extract path.
+
+Also compares the text extraction backends in pages per second of one core
+(CPU time, fallback disabled).
+
+Usage (from backend/):
+    python -m benchmarks.pdf_ingestion --pages 1 2 5 10 --iterations 20
+"""
+
+import argparse
+import statistics
+import time
+from app.services.pdf_backends import BACKENDS
+from app.services.pdf_service import PDFService
+from .pdf_factory import build_cv_pdf
+
+
+def two_pass(pdf_bytes: bytes) -> str:
+    """The original router path: validate, then parse again to extract."""
+    is_valid, error_msg = PDFService.validate_pdf(pdf_bytes)
+    if not is_valid:
+        raise ValueError(error_msg)
+    return PDFService.extract_text_from_bytes(pdf_bytes)
+
+
+def single_pass(pdf_bytes: bytes) -> str:
+    """The unified ingestion path, with the same extractor as the two-pass path."""
+    result = PDFService.ingest_pdf(pdf_bytes, backend="pdfplumber", fallback=None)
+    if not result.is_valid:
+        raise ValueError(result.errors[0])
+    return result.text
+
+
+def time_it(func, pdf_bytes: bytes, iterations: int) -> list[float]:
+    """Run `func` repeatedly and return per-call durations in milliseconds."""
+    func(pdf_bytes)  # warm-up
+    durations = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func(pdf_bytes)
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def backend_pages_per_second(backend: str, pdf_bytes: bytes, page_count: int, iterations: int) -> float:
+    """Pages extracted per CPU second by one backend."""
+    PDFService.ingest_pdf(pdf_bytes, backend=backend, fallback=None)  # warm-up
+    started = time.process_time()
+    for _ in range(iterations):
+        PDFService.ingest_pdf(pdf_bytes, backend=backend, fallback=None)
+    return page_count * iterations / (time.process_time() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    
+    print(f"{'pages':>5}  {'two-pass ms':>12}  {'single-pass ms':>15}  {'speedup':>8}")
+    for page_count in args.pages:
+        pdf_bytes = build_cv_pdf(page_count)
+        assert two_pass(pdf_bytes) == single_pass(pdf_bytes)
+        
+        old = statistics.median(time_it(two_pass, pdf_bytes, args.iterations))
+        new = statistics.median(time_it(single_pass, pdf_bytes, args.iterations))
+        print(f"{page_count:>5}  {old:>12.2f}  {new:>15.2f}  {old / new:>7.2f}x")
+    
+    print(f"\n{'pages':>5}  " + "  ".join(f"{name + ' p/s':>16}" for name in BACKENDS))
+    for page_count in args.pages:
+        pdf_bytes = build_cv_pdf(page_count)
+        rates = [backend_pages_per_second(name, pdf_bytes, page_count, args.iterations) for name in BACKENDS]
+        print(f"{page_count:>5}  " + "  ".join(f"{rate:>16.1f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Bulk job tests: the Message Batches flow against the local fake Anthropic API.
+"""
+
+import asyncio
+import io
+import re
+import zipfile
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from fastapi import FastAPI
+from benchmarks import fake_anthropic
+from app.models.schemas import PDFIngestionResult
+from app.routers import batch_router, get_evaluation_service, get_screening_pipeline
+from app.routers.batch_router import CUSTOM_ID_MAX_LENGTH, _decode_custom_id, _encode_custom_id
+from app.services.evaluation_service import EvaluationService
+from app.services.screening_pipeline import ScreeningPipeline
+
+try:
+    # Newer SDK releases are built on httpx2; the app's test client stays on httpx
+    import httpx2 as sdk_httpx
+except ImportError:
+    sdk_httpx = httpx
+
+
+class TextPDFPool:
+    """Stand-in for the PDF pool: every PDF holds a short CV naming its size."""
+    
+    async def ingest(self, source):
+        return PDFIngestionResult(page_count=1, pages=[f"Jane Doe, Python developer, {len(source)} bytes"])
+
+
+def pdf(size: int) -> bytes:
+    return b"%PDF-1.4\n" + b"0" * size
+
+
+def evaluation_service(transport) -> EvaluationService:
+    """An evaluation service whose async client talks to the given transport."""
+    service = EvaluationService()
+    service.async_client = AsyncAnthropic(
+        api_key="sk-test",
+        base_url="http://anthropic.test",
+        max_retries=0,
+        http_client=sdk_httpx.AsyncClient(transport=transport, base_url="http://anthropic.test")
+    )
+    return service
+
+
+def bulk_client(service: EvaluationService) -> httpx.AsyncClient:
+    """An HTTP client for the batch router, wired to the given service."""
+    app = FastAPI()
+    app.include_router(batch_router)
+    pipeline = ScreeningPipeline(pdf_pool=TextPDFPool(), evaluation_service=service)
+    app.dependency_overrides[get_evaluation_service] = lambda: service
+    app.dependency_overrides[get_screening_pipeline] = lambda: pipeline
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setitem(fake_anthropic.config, "batch_delay_seconds", 0.0)
+    return evaluation_service(sdk_httpx.ASGITransport(app=fake_anthropic.app))
+
+
+def test_results_usage_is_counted_once(service):
+    async def scenario():
+        async with bulk_client(service) as client:
+            files = [("files", (f"cv{i}.pdf", pdf(100 + i), "application/pdf")) for i in range(2)]
+            batch_id = (await client.post("/api/cv/bulk", files=files)).json()["batch_id"]
+            for _ in range(3):
+                response = await client.get(f"/api/cv/bulk/{batch_id}/results")
+                assert response.status_code == 200
+    
+    asyncio.run(scenario())
+    assert service.usage["requests"] == 2
+
+
+def test_unknown_batch_is_not_found(service):
+    async def scenario():
+        async with bulk_client(service) as client:
+            return [
+                await client.get("/api/cv/bulk/msgbatch_missing"),
+                await client.get("/api/cv/bulk/msgbatch_missing/results"),
+            ]
+    
+    for response in asyncio.run(scenario()):
+        assert response.status_code == 404
+
+
+@pytest.mark.parametrize("failure", [
+    sdk_httpx.Response(401, json={"type": "error", "error": {"type": "authentication_error", "message": "bad key"}}),
+    sdk_httpx.Response(500, json={"type": "error", "error": {"type": "api_error", "message": "boom"}}),
+    sdk_httpx.ConnectError("connection refused"),
+])
+def test_anthropic_failure_is_a_bad_gateway(failure):
+    def handler(request):
+        if isinstance(failure, Exception):
+            raise failure
+        return failure
+    
+    service = evaluation_service(sdk_httpx.MockTransport(handler))
+    
+    async def scenario():
+        async with bulk_client(service) as client:
+            return [
+                await client.get("/api/cv/bulk/msgbatch_1"),
+                await client.get("/api/cv/bulk/msgbatch_1/results"),
+            ]
+    
+    for response in asyncio.run(scenario()):
+        assert response.status_code == 502
+
+
+def test_zip_archives_are_closed_once_read(service, monkeypatch):
+    opened: list[zipfile.ZipFile] = []
+    
+    class TrackedZipFile(zipfile.ZipFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            opened.append(self)
+    
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as writer:
+        writer.writestr("cvs/a.pdf", pdf(10))
+        writer.writestr("cvs/b.pdf", pdf(20))
+    monkeypatch.setattr(zipfile, "ZipFile", TrackedZipFile)
+    
+    async def scenario():
+        async with bulk_client(service) as client:
+            return await client.post("/api/cv/bulk", files=[("files", ("cvs.zip", archive.getvalue(), "application/zip"))])
+    
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.json()["request_counts"]["processing"] + response.json()["request_counts"]["succeeded"] == 2
+    assert len(opened) == 1
+    assert opened[0].fp is None
+
+
+NAMES = ["Zoë Müller.pdf", "简历-王伟.pdf", "résumé 🙂.pdf", "cv.pdf"]
+
+
+def test_bulk_job_is_submitted_polled_and_mapped_back_to_files(service, monkeypatch):
+    monkeypatch.setitem(fake_anthropic.config, "batch_delay_seconds", 3600.0)
+    files = [("files", (name, pdf(100 * (i + 1)), "application/pdf")) for i, name in enumerate(NAMES)]
+    files.append(("files", ("notes.txt", b"not a pdf", "text/plain")))
+    
+    async def scenario():
+        async with bulk_client(service) as client:
+            submitted = (await client.post("/api/cv/bulk", files=files)).json()
+            batch_id = submitted["batch_id"]
+            pending = (await client.get(f"/api/cv/bulk/{batch_id}")).json()
+            early = await client.get(f"/api/cv/bulk/{batch_id}/results")
+            
+            monkeypatch.setitem(fake_anthropic.config, "batch_delay_seconds", 0.0)
+            ended = (await client.get(f"/api/cv/bulk/{batch_id}")).json()
+            results = (await client.get(f"/api/cv/bulk/{batch_id}/results")).json()
+            return submitted, pending, early, ended, results
+    
+    submitted, pending, early, ended, results = asyncio.run(scenario())
+    
+    assert [rejected["filename"] for rejected in submitted["rejected"]] == ["notes.txt"]
+    assert pending["processing_status"] == "in_progress"
+    assert pending["request_counts"]["processing"] == len(NAMES)
+    assert early.status_code == 409
+    assert ended["processing_status"] == "ended"
+    assert ended["request_counts"]["succeeded"] == len(NAMES)
+    
+    assert results["total"] == results["succeeded"] == len(NAMES)
+    # Results come back in upload order, each labelled with its own file
+    assert [result["filename"] for result in results["results"]] == NAMES
+    for i, result in enumerate(results["results"]):
+        assert f"{len(pdf(100 * (i + 1)))} bytes" in result["evaluation"]["candidate_name"]
+
+
+@pytest.mark.parametrize("filename", NAMES + ["a" * 200 + ".pdf", "ü" * 60 + ".pdf", "简" * 14 + ".pdf"])
+def test_custom_ids_round_trip_filenames(filename):
+    custom_id = _encode_custom_id(12, filename)
+    index, decoded = _decode_custom_id(custom_id)
+    room = (CUSTOM_ID_MAX_LENGTH - len("cv-12-")) * 3 // 4
+    
+    # The Message Batches API accepts 1-64 characters from [a-zA-Z0-9_-]
+    assert re.fullmatch(r"[a-zA-Z0-9_-]{1,64}", custom_id)
+    assert index == 12
+    if len(filename.encode("utf-8")) <= room:
+        assert decoded == filename
+    else:
+        # Shortened names keep a whole-character prefix
+        assert filename.startswith(decoded)
+        assert len(decoded) >= 10
+
+
+@pytest.mark.parametrize("custom_id", ["request-1", "cv-x-Zm9v", "cv-3-!!!", "plain"])
+def test_foreign_custom_ids_are_kept_as_labels(custom_id):
+    index, label = _decode_custom_id(custom_id)
+    
+    assert label == custom_id
+    assert index == (3 if custom_id.startswith("cv-3") else -1)
@@ -0,0 +1,188 @@
+"""
+Evaluation store tests: keyset pagination, filters combined with cursors,
+naive and aware time bounds, and lookups by file hash.
+"""
+
+import time
+import types
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.models.schemas import CVEvaluationResponse, PassFailStatus
+from app.services import evaluation_store as evaluation_store_module
+from app.services.evaluation_store import MAX_PAGE_SIZE, SORT_NEWEST, SORT_SCORE, EvaluationStore
+
+START = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Stands in for the store's `time` module: saves happen at chosen moments."""
+    
+    def __init__(self):
+        self.now = START.timestamp()
+    
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(evaluation_store_module, "time", types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EvaluationStore(str(tmp_path / "evaluations.sqlite3"))
+    yield store
+    store.close()
+
+
+def evaluation(score: int, name: str = "Jane Doe", profile: str = "default") -> CVEvaluationResponse:
+    return CVEvaluationResponse(
+        status=PassFailStatus.PASS if score >= 70 else PassFailStatus.FAIL,
+        match_score=score,
+        reasoning=f"Scored {score} for {profile}",
+        criteria=[],
+        candidate_name=name
+    )
+
+
+def seed(store: EvaluationStore, clock: FakeClock, count: int = 30) -> list[int]:
+    """Save records whose scores and timestamps repeat, so both sort orders have ties."""
+    ids = []
+    for i in range(count):
+        clock.now = START.timestamp() + (i // 3) * 60
+        profile = "default" if i % 2 else "backend"
+        record = evaluation(50 + (i * 7) % 40, profile=profile)
+        ids.append(store.save(f"hash{i}", f"cv{i}.pdf", "text", record, "test-model", "v1", {"total_ms": 1.0}, profile))
+    return ids
+
+
+def page_through(store: EvaluationStore, limit: int, **filters) -> list[int]:
+    """Follow `next_cursor` to the end, collecting record IDs in order."""
+    ids, cursor = [], None
+    while True:
+        page = store.list(limit=limit, cursor=cursor, **filters)
+        assert len(page.items) <= limit
+        ids.extend(record.id for record in page.items)
+        if page.next_cursor is None:
+            return ids
+        assert len(page.items) == limit
+        cursor = page.next_cursor
+
+
+def expected_order(store: EvaluationStore, sort: str, keep=lambda record: True) -> list[int]:
+    """Every record in the store, filtered and ordered like `list` should return them."""
+    records = [record for record in store.get_many(list(range(1, 100))).values() if keep(record)]
+    key = (lambda r: (r.created_at, r.id)) if sort == SORT_NEWEST else (lambda r: (r.match_score, r.id))
+    return [record.id for record in sorted(records, key=key, reverse=True)]
+
+
+@pytest.mark.parametrize("sort", [SORT_NEWEST, SORT_SCORE])
+@pytest.mark.parametrize("limit", [1, 4, 7, 30, 50])
+def test_cursor_pages_cover_every_record_once_in_order(store, clock, sort, limit):
+    seed(store, clock)
+    
+    assert page_through(store, limit, sort=sort) == expected_order(store, sort)
+
+
+@pytest.mark.parametrize("sort", [SORT_NEWEST, SORT_SCORE])
+def test_filters_combine_with_the_cursor(store, clock, sort):
+    seed(store, clock)
+    filters = {"status": PassFailStatus.PASS, "min_score": 72, "profile": "default"}
+    
+    ids = page_through(store, 2, sort=sort, **filters)
+    
+    assert ids == expected_order(
+        store, sort,
+        lambda r: r.status == PassFailStatus.PASS and r.match_score >= 72 and r.profile == "default"
+    )
+    assert ids
+
+
+def test_score_range_and_name_prefix(store, clock):
+    store.save("a", "a.pdf", "text", evaluation(60, "Ann_Lee"), "test-model", "v1")
+    store.save("b", "b.pdf", "text", evaluation(80, "annabel smith"), "test-model", "v1")
+    store.save("c", "c.pdf", "text", evaluation(90, "Annika%"), "test-model", "v1")
+    store.save("d", "d.pdf", "text", evaluation(95, "Bob"), "test-model", "v1")
+    
+    def names(**filters):
+        return [record.candidate_name for record in store.list(sort=SORT_SCORE, **filters).items]
+    
+    assert names(candidate_name="ANN") == ["Annika%", "annabel smith", "Ann_Lee"]
+    # LIKE wildcards in the prefix are matched literally
+    assert names(candidate_name="Ann_") == ["Ann_Lee"]
+    assert names(candidate_name="Annika%") == ["Annika%"]
+    assert names(candidate_name="A%") == []
+    assert names(min_score=80, max_score=90) == ["Annika%", "annabel smith"]
+
+
+@pytest.fixture
+def non_utc_local_time(monkeypatch):
+    """Run with a local timezone far from UTC, where reading naive times as local would shift them."""
+    if not hasattr(time, "tzset"):
+        pytest.skip("time.tzset is not available")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_naive_time_bounds_are_read_as_utc(store, clock, non_utc_local_time):
+    ids = seed(store, clock, count=9)
+    # Records were saved at START, START + 1m and START + 2m, three each
+    boundary = START + timedelta(minutes=1)
+    
+    def listed(**bounds) -> list[int]:
+        return sorted(record.id for record in store.list(limit=MAX_PAGE_SIZE, **bounds).items)
+    
+    aware = listed(created_after=boundary)
+    assert aware == ids[3:]
+    assert listed(created_after=boundary.replace(tzinfo=None)) == aware
+    assert listed(created_after=boundary.astimezone(timezone(timedelta(hours=-5)))) == aware
+    
+    assert listed(created_before=boundary) == ids[:3]
+    assert listed(created_before=boundary.replace(tzinfo=None)) == ids[:3]
+    assert listed(created_after=START.replace(tzinfo=None), created_before=boundary.replace(tzinfo=None)) == ids[:3]
+
+
+def test_page_size_is_capped(store, clock):
+    for i in range(MAX_PAGE_SIZE + 5):
+        store.save(f"hash{i}", "cv.pdf", "text", evaluation(60), "test-model", "v1")
+    
+    page = store.list(limit=10_000)
+    
+    assert len(page.items) == MAX_PAGE_SIZE
+    assert page.next_cursor is not None
+    assert len(store.list(limit=10_000, cursor=page.next_cursor).items) == 5
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10=", "WyJ4Il0=", "é"])
+def test_malformed_cursor_is_rejected(store, cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        store.list(cursor=cursor)
+
+
+def test_unknown_sort_is_rejected(store):
+    with pytest.raises(ValueError, match="Invalid sort order"):
+        store.list(sort="oldest")
+
+
+def test_find_by_hash_returns_the_latest_matching_record(store, clock):
+    first = store.save("same", "a.pdf", "text", evaluation(60), "model-a", "v1")
+    second = store.save("same", "b.pdf", "text", evaluation(70), "model-a", "v2")
+    third = store.save("same", "c.pdf", "text", evaluation(80), "model-b", "v1")
+    store.save("other", "d.pdf", "text", evaluation(90), "model-a", "v1")
+    
+    assert store.find_by_hash("same").id == third
+    assert store.find_by_hash("same", "model-a").id == second
+    assert store.find_by_hash("same", "model-a", "v1").id == first
+    assert store.find_by_hash("same", "model-b", "v2") is None
+    assert store.find_by_hash("missing") is None
+    
+    record = store.find_by_hash("same", "model-a", "v2")
+    assert record.filename == "b.pdf"
+    assert record.evaluation.match_score == 70
+    assert record.created_at == START.isoformat()
@@ -0,0 +1,254 @@
+"""
+Incremental JSON parser tests: criteria emitted as they close, whatever the chunking,
+and the NDJSON event sequence of the streaming upload endpoint.
+"""
+
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.requests import ClientDisconnect
+from app.models.schemas import CVEvaluationResponse, EvaluationCriteria, PassFailStatus, PDFIngestionResult
+from app.routers import cv_router, get_profile_registry, get_screening_pipeline
+from app.routers.cv_router import _UploadStreamingResponse
+from app.services.incremental_json import IncrementalJSONParser
+from app.services.profile_registry import DEFAULT_PROFILE, ProfileRegistry
+from app.services.screening_pipeline import ScreeningPipeline
+from app.services.upload_service import SpooledUpload
+
+CRITERIA = [
+    {"name": "Languages", "passed": True, "details": "Python, \"TypeScript\" and C\\C++"},
+    {"name": "Experience", "passed": False, "details": "Two {years} [junior]\nat École 42"},
+]
+
+DOCUMENT = json.dumps({
+    "status": "FAIL",
+    "match_score": 40,
+    "criteria": CRITERIA,
+    "reasoning": "Not enough experience, see {\"criteria\": []}",
+})
+
+
+def chunks(text: str, size: int) -> list[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def feed_all(parser: IncrementalJSONParser, pieces: list[str]) -> list[list[dict]]:
+    """Feed every piece, returning what each one completed."""
+    return [parser.feed(piece) for piece in pieces]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_criteria_survive_any_chunk_boundary(size):
+    parser = IncrementalJSONParser()
+    emitted = [item for items in feed_all(parser, chunks(DOCUMENT, size)) for item in items]
+    
+    assert emitted == CRITERIA
+    assert parser.complete
+    assert parser.result() == json.loads(DOCUMENT)
+
+
+def test_each_criterion_is_emitted_when_its_brace_closes():
+    parser = IncrementalJSONParser()
+    first_end = DOCUMENT.index("}") + 1
+    
+    assert parser.feed(DOCUMENT[:first_end - 1]) == []
+    assert parser.feed(DOCUMENT[first_end - 1:first_end]) == [CRITERIA[0]]
+    assert parser.feed(DOCUMENT[first_end:]) == [CRITERIA[1]]
+
+
+def test_escaped_quote_split_from_its_backslash():
+    document = json.dumps({"criteria": [{"name": "Quote", "details": "said \"yes\" } ]"}]})
+    split = document.index("\\\"") + 1
+    parser = IncrementalJSONParser()
+    
+    assert parser.feed(document[:split]) == []
+    assert parser.feed(document[split:]) == [{"name": "Quote", "details": "said \"yes\" } ]"}]
+
+
+def test_fenced_prefix_and_trailing_text_are_ignored():
+    text = "Here is the evaluation:\n```json\n" + DOCUMENT + "\n```\nLet me know if { anything"
+    parser = IncrementalJSONParser()
+    emitted = [item for items in feed_all(parser, chunks(text, 5)) for item in items]
+    
+    assert emitted == CRITERIA
+    assert parser.result() == json.loads(DOCUMENT)
+    assert parser.feed('{"criteria": [{"name": "late"}]}') == []
+
+
+def test_nested_objects_inside_criteria_are_part_of_their_item():
+    item = {"name": "Skills", "evidence": {"languages": [{"name": "Python"}], "years": {"min": 3}}}
+    document = json.dumps({"criteria": [item, {"name": "Tail"}], "meta": {"criteria": [{"name": "other"}]}})
+    parser = IncrementalJSONParser()
+    
+    assert [found for items in feed_all(parser, chunks(document, 1)) for found in items] == [item, {"name": "Tail"}]
+
+
+def test_only_the_watched_key_is_reported():
+    document = json.dumps({"findings": [{"name": "A"}], "criteria": [{"name": "B"}]})
+    
+    assert IncrementalJSONParser().feed(document) == [{"name": "B"}]
+    assert IncrementalJSONParser(watch_key="findings").feed(document) == [{"name": "A"}]
+
+
+def test_unterminated_document_is_not_complete():
+    cut = DOCUMENT[:DOCUMENT.index("reasoning")]
+    parser = IncrementalJSONParser()
+    
+    assert [item for items in feed_all(parser, chunks(cut, 4)) for item in items] == CRITERIA
+    assert not parser.complete
+    with pytest.raises(json.JSONDecodeError):
+        parser.result()
+
+
+def test_unterminated_criterion_is_not_emitted():
+    parser = IncrementalJSONParser()
+    
+    assert parser.feed('{"criteria": [{"name": "Cut", "details": "mid }') == []
+    with pytest.raises(json.JSONDecodeError):
+        parser.result()
+
+
+def test_text_without_an_object_fails_to_decode():
+    parser = IncrementalJSONParser()
+    
+    assert parser.feed("I cannot evaluate this CV.") == []
+    with pytest.raises(json.JSONDecodeError):
+        parser.result()
+
+
+class PagePDFPool:
+    """Stand-in for the PDF pool: every PDF has two pages of CV text."""
+    
+    async def ingest(self, source):
+        return PDFIngestionResult(page_count=2, pages=["Jane Doe, Python developer", "Five years at Acme"])
+
+
+class StreamingEvaluationService:
+    """Stand-in for the Claude-backed service: streams two criteria, then the evaluation."""
+    
+    def __init__(self):
+        self.profiles = ProfileRegistry([DEFAULT_PROFILE], "test-model", DEFAULT_PROFILE.name)
+    
+    def model_key(self, profile=None) -> str:
+        return "test-model"
+    
+    def stream_model_key(self, profile=None) -> str:
+        return "test-model"
+    
+    async def evaluate_cv_stream(self, cv_text, filename, profile=None):
+        criteria = [EvaluationCriteria(**criterion) for criterion in CRITERIA]
+        for criterion in criteria:
+            yield criterion
+        yield CVEvaluationResponse(
+            status=PassFailStatus.FAIL,
+            match_score=40,
+            reasoning="Not enough experience",
+            criteria=criteria,
+            candidate_name="Jane Doe"
+        )
+
+
+class TrackedUpload(SpooledUpload):
+    """A spooled upload that remembers being released."""
+    
+    instances: list["TrackedUpload"] = []
+    
+    def __init__(self, max_memory_bytes: int):
+        super().__init__(max_memory_bytes)
+        self.released = False
+        TrackedUpload.instances.append(self)
+    
+    def close(self) -> None:
+        super().close()
+        self.released = self._references == 0
+
+
+@pytest.fixture
+def tracked_uploads(monkeypatch):
+    TrackedUpload.instances = []
+    monkeypatch.setattr("app.services.upload_service.SpooledUpload", TrackedUpload)
+    return TrackedUpload.instances
+
+
+def stream_client(pipeline: ScreeningPipeline) -> httpx.AsyncClient:
+    """An HTTP client for the CV router, wired to the given pipeline."""
+    app = FastAPI()
+    app.include_router(cv_router)
+    app.dependency_overrides[get_screening_pipeline] = lambda: pipeline
+    app.dependency_overrides[get_profile_registry] = lambda: pipeline.evaluation_service.profiles
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_stream_reports_progress_then_the_result(tracked_uploads):
+    pipeline = ScreeningPipeline(pdf_pool=PagePDFPool(), evaluation_service=StreamingEvaluationService())
+    content = b"%PDF-1.4\n" + b"0" * 512
+    
+    async def scenario():
+        async with stream_client(pipeline) as client:
+            response = await client.post(
+                "/api/cv/upload/stream",
+                files={"file": ("jane.pdf", content, "application/pdf")}
+            )
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            return [json.loads(line) for line in response.text.splitlines()]
+    
+    events = asyncio.run(scenario())
+    
+    assert [event["event"] for event in events] == [
+        "upload_received", "pdf_parsed", "evaluation_started", "criterion", "criterion", "result"
+    ]
+    assert events[0] == {"event": "upload_received", "filename": "jane.pdf", "size_bytes": len(content)}
+    assert events[1]["page_count"] == 2
+    assert [event["criterion"] for event in events[3:5]] == CRITERIA
+    assert events[-1]["evaluation"]["match_score"] == 40
+    assert [upload.released for upload in tracked_uploads] == [True]
+
+
+def test_stream_reports_unusable_pdf_as_an_error_event(tracked_uploads):
+    class EmptyPDFPool:
+        """Stand-in for the PDF pool: no text in any PDF."""
+        
+        async def ingest(self, source):
+            return PDFIngestionResult(page_count=1, pages=[""], errors=["No text found in PDF"])
+    
+    pipeline = ScreeningPipeline(pdf_pool=EmptyPDFPool(), evaluation_service=StreamingEvaluationService())
+    
+    async def scenario():
+        async with stream_client(pipeline) as client:
+            response = await client.post(
+                "/api/cv/upload/stream",
+                files={"file": ("jane.pdf", b"%PDF-1.4\n", "application/pdf")}
+            )
+            return [json.loads(line) for line in response.text.splitlines()]
+    
+    events = asyncio.run(scenario())
+    
+    assert [event["event"] for event in events] == ["upload_received", "error"]
+    assert events[-1] == {"event": "error", "status_code": 400, "detail": "No text found in PDF"}
+    assert [upload.released for upload in tracked_uploads] == [True]
+
+
+def test_upload_is_released_when_the_response_never_starts():
+    upload = TrackedUpload(max_memory_bytes=1024)
+    started = []
+    
+    async def body():
+        started.append(True)
+        yield "never sent\n"
+    
+    async def receive():
+        await asyncio.Event().wait()
+    
+    async def send(message):
+        raise OSError("client went away")
+    
+    response = _UploadStreamingResponse(body(), upload, media_type="application/x-ndjson")
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "method": "POST", "path": "/"}
+    with pytest.raises(ClientDisconnect):
+        asyncio.run(response(scope, receive, send))
+    
+    assert started == []
+    assert upload.released
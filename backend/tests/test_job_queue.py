@@ -0,0 +1,168 @@
+"""
+Job queue tests: both backends claim, retry, expire and fence jobs the same way.
+"""
+
+import asyncio
+import pytest
+from app.models.schemas import CVEvaluationResponse, JobStatus, PassFailStatus
+from app.services.job_queue import InMemoryJobQueue, JobQueue, SQLiteJobQueue
+from app.services.job_worker import JobWorker
+
+EVALUATION = CVEvaluationResponse(
+    status=PassFailStatus.PASS,
+    match_score=90,
+    reasoning="Strong fintech background.",
+    criteria=[]
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_queue(request, tmp_path):
+    queues: list[JobQueue] = []
+    
+    def make(max_attempts: int = 3) -> JobQueue:
+        if request.param == "memory":
+            queue = InMemoryJobQueue(max_attempts=max_attempts)
+        else:
+            queue = SQLiteJobQueue(str(tmp_path / f"jobs{len(queues)}.sqlite3"), max_attempts=max_attempts)
+        queues.append(queue)
+        return queue
+    
+    yield make
+    for queue in queues:
+        queue.close()
+
+
+def test_claim_and_complete(make_queue):
+    queue = make_queue()
+    job = queue.enqueue(b"%PDF-1.4", "cv.pdf", profile="data-scientist")
+    
+    claimed = queue.claim(lease_seconds=60)
+    assert (claimed.job_id, claimed.status, claimed.attempts) == (job.job_id, JobStatus.RUNNING, 1)
+    assert claimed.profile == "data-scientist"
+    assert queue.payload(job.job_id) == b"%PDF-1.4"
+    assert queue.claim(lease_seconds=60) is None
+    
+    assert queue.complete(job.job_id, 1, EVALUATION)
+    finished = queue.get(job.job_id)
+    assert finished.status == JobStatus.SUCCEEDED
+    assert finished.evaluation == EVALUATION
+    with pytest.raises(ValueError):
+        queue.payload(job.job_id)
+
+
+def test_claims_highest_priority_then_oldest(make_queue):
+    queue = make_queue()
+    low = queue.enqueue(b"%PDF", "low.pdf", priority=0)
+    high = queue.enqueue(b"%PDF", "high.pdf", priority=5)
+    later_low = queue.enqueue(b"%PDF", "later-low.pdf", priority=0)
+    
+    order = [queue.claim(lease_seconds=60).job_id for _ in range(3)]
+    assert order == [high.job_id, low.job_id, later_low.job_id]
+
+
+def test_failed_attempts_retry_until_max_attempts(make_queue):
+    queue = make_queue(max_attempts=2)
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    
+    queue.claim(lease_seconds=60)
+    retried = queue.fail(job.job_id, 1, "Overloaded", retry_delay_seconds=0)
+    assert (retried.status, retried.error) == (JobStatus.QUEUED, "Overloaded")
+    
+    assert queue.claim(lease_seconds=60).attempts == 2
+    failed = queue.fail(job.job_id, 2, "Overloaded", retry_delay_seconds=0)
+    assert failed.status == JobStatus.FAILED
+    with pytest.raises(ValueError):
+        queue.payload(job.job_id)
+
+
+def test_retry_waits_for_its_delay(make_queue):
+    queue = make_queue()
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    queue.claim(lease_seconds=60)
+    queue.fail(job.job_id, 1, "Overloaded", retry_delay_seconds=60)
+    
+    assert queue.claim(lease_seconds=60) is None
+
+
+def test_failure_without_retry_is_final(make_queue):
+    queue = make_queue()
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    queue.claim(lease_seconds=60)
+    
+    assert queue.fail(job.job_id, 1, "Not a CV").status == JobStatus.FAILED
+    assert queue.claim(lease_seconds=60) is None
+
+
+def test_expired_lease_is_reclaimed_and_fences_the_old_attempt(make_queue):
+    queue = make_queue()
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    queue.claim(lease_seconds=0)
+    
+    reclaimed = queue.claim(lease_seconds=60)
+    assert (reclaimed.job_id, reclaimed.attempts) == (job.job_id, 2)
+    
+    # The first worker lost the job: none of its updates apply
+    assert not queue.renew(job.job_id, 1, 60)
+    assert not queue.complete(job.job_id, 1, EVALUATION)
+    assert queue.fail(job.job_id, 1, "Timed out", retry_delay_seconds=0) is None
+    assert queue.get(job.job_id).status == JobStatus.RUNNING
+    
+    assert queue.complete(job.job_id, 2, EVALUATION)
+    assert queue.get(job.job_id).status == JobStatus.SUCCEEDED
+
+
+def test_renewed_lease_is_not_reclaimed(make_queue):
+    queue = make_queue()
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    queue.claim(lease_seconds=0)
+    
+    assert queue.renew(job.job_id, 1, 60)
+    assert queue.claim(lease_seconds=60) is None
+    assert queue.complete(job.job_id, 1, EVALUATION)
+
+
+def test_expired_lease_on_last_attempt_fails_and_drops_the_payload(make_queue):
+    queue = make_queue(max_attempts=1)
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    queue.claim(lease_seconds=0)
+    
+    assert queue.claim(lease_seconds=60) is None
+    expired = queue.get(job.job_id)
+    assert (expired.status, expired.error) == (JobStatus.FAILED, "Worker lease expired")
+    with pytest.raises(ValueError):
+        queue.payload(job.job_id)
+
+
+class SlowPipeline:
+    """Stand-in for the screening pipeline: one evaluation after a delay."""
+    
+    def __init__(self, delay_seconds: float):
+        self.delay_seconds = delay_seconds
+        self.runs = 0
+    
+    def profile(self, name=None):
+        return None
+    
+    async def run(self, pdf, filename, profile=None):
+        self.runs += 1
+        await asyncio.sleep(self.delay_seconds)
+        return EVALUATION
+
+
+def test_worker_renews_the_lease_of_a_slow_job(make_queue):
+    queue = make_queue()
+    pipeline = SlowPipeline(delay_seconds=0.6)
+    worker = JobWorker(queue, pipeline, concurrency=1, lease_seconds=0.3)
+    job = queue.enqueue(b"%PDF", "cv.pdf")
+    
+    async def scenario():
+        processing = asyncio.create_task(worker.process(queue.claim(worker.lease_seconds)))
+        await asyncio.sleep(0.45)
+        # Past the original lease: another worker must not get the job
+        assert queue.claim(lease_seconds=60) is None
+        await processing
+    
+    asyncio.run(scenario())
+    assert queue.get(job.job_id).status == JobStatus.SUCCEEDED
+    assert pipeline.runs == 1
@@ -0,0 +1,30 @@
+"""
+Near-duplicate index tests: processes sharing a signature file see each other's CVs.
+"""
+
+from app.services.near_duplicate_index import NearDuplicateIndex
+
+CV_TEXT = "Jane Doe. " + " ".join(f"Shipped payments feature {i} in TypeScript and Python." for i in range(40))
+EDITED_CV_TEXT = CV_TEXT.replace("feature 17 ", "feature seventeen ")
+
+
+def test_refresh_picks_up_records_appended_by_another_index(tmp_path):
+    path = str(tmp_path / "near_duplicates.idx")
+    api = NearDuplicateIndex(path)
+    worker = NearDuplicateIndex(path)
+    
+    assert worker.insert(1, CV_TEXT)
+    assert api.query(EDITED_CV_TEXT) == []
+    
+    assert api.refresh() == 1
+    assert [evaluation_id for evaluation_id, _ in api.query(EDITED_CV_TEXT)] == [1]
+    assert api.refresh() == 0
+
+
+def test_refresh_skips_own_records(tmp_path):
+    path = str(tmp_path / "near_duplicates.idx")
+    index = NearDuplicateIndex(path)
+    index.insert(1, CV_TEXT)
+    
+    assert index.refresh() == 0
+    assert NearDuplicateIndex(path).stats()["indexed"] == 1
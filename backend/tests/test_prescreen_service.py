@@ -0,0 +1,153 @@
+"""
+Prescreen tests: word-bounded keyword matching and the clear-fail rule under each policy.
+"""
+
+import random
+import pytest
+from app.models.schemas import PassFailStatus
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.prescreen_service import (
+    EDUCATION,
+    FINTECH,
+    POLICY_ENFORCE,
+    POLICY_OFF,
+    POLICY_SHADOW,
+    TECHNICAL,
+    PrescreenService,
+)
+
+LEXICONS = {
+    "languages": ["python", "node", "node.js", "c++"],
+    "finance": ["bank", "investment bank", "banking", "fx"],
+}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Python developer", {"languages": {"python"}}),
+    ("PYTHON, TypeScript", {"languages": {"python"}}),
+    ("Pythonic code, cpython internals", {}),
+    ("python3 and jython", {}),
+    ("(python)", {"languages": {"python"}}),
+    ("Node.js services", {"languages": {"node", "node.js"}}),
+    ("Nodes and nodejs", {}),
+    ("C++ and c++17", {"languages": {"c++"}}),
+    ("Worked at an investment bank", {"finance": {"investment bank", "bank"}}),
+    ("Banking and banks", {"finance": {"banking"}}),
+    ("FX desk; fxpro; affix", {"finance": {"fx"}}),
+    ("python/banking", {"languages": {"python"}, "finance": {"banking"}}),
+    ("", {}),
+])
+def test_keywords_match_on_word_boundaries(text, expected):
+    assert KeywordMatcher(LEXICONS).find(text) == expected
+
+
+def brute_force_find(lexicons: dict[str, list[str]], text: str) -> dict[str, set[str]]:
+    """Reference matcher: every occurrence of every keyword, checked for word boundaries."""
+    lowered = text.lower()
+    found: dict[str, set[str]] = {}
+    for category, keywords in lexicons.items():
+        for keyword in keywords:
+            start = lowered.find(keyword)
+            while start != -1:
+                end = start + len(keyword)
+                if (start == 0 or not lowered[start - 1].isalnum()) and (
+                    end == len(lowered) or not lowered[end].isalnum()
+                ):
+                    found.setdefault(category, set()).add(keyword)
+                    break
+                start = lowered.find(keyword, start + 1)
+    return found
+
+
+def test_automaton_matches_brute_force_on_random_text():
+    rng = random.Random(11)
+    # Overlapping keywords exercise fail links and merged outputs
+    lexicons = {
+        "a": ["ab", "abc", "bc", "c"],
+        "b": ["b c", "cab", "a.b", "bca"],
+    }
+    matcher = KeywordMatcher(lexicons)
+    for _ in range(500):
+        text = "".join(rng.choice("abcAB. ") for _ in range(rng.randint(0, 30)))
+        assert matcher.find(text) == brute_force_find(lexicons, text), text
+
+
+FINTECH_AND_PYTHON = "BSc in Computer Science. Five years of Python at a crypto exchange."
+FINTECH_ONLY = "Relationship manager at a retail bank."
+PYTHON_ONLY = "Backend engineer writing Django services."
+EDUCATION_ONLY = "Graduated with a degree in history; museum curator since."
+NOTHING = "Chef at a seaside restaurant."
+
+
+@pytest.mark.parametrize("text, passed", [
+    (FINTECH_AND_PYTHON, {EDUCATION, FINTECH, TECHNICAL}),
+    (FINTECH_ONLY, {FINTECH}),
+    (PYTHON_ONLY, {TECHNICAL}),
+    (EDUCATION_ONLY, {EDUCATION}),
+    (NOTHING, set()),
+])
+def test_criteria_report_keyword_hits(text, passed):
+    criteria = PrescreenService(POLICY_ENFORCE).criteria(text)
+    
+    assert [criterion.name for criterion in criteria] == [EDUCATION, FINTECH, TECHNICAL]
+    assert {criterion.name for criterion in criteria if criterion.passed} == passed
+    for criterion in criteria:
+        assert criterion.details.startswith("Keywords found: " if criterion.passed else "No matching")
+
+
+@pytest.mark.parametrize("policy, text, decision, match_score", [
+    (POLICY_OFF, NOTHING, None, None),
+    (POLICY_OFF, FINTECH_AND_PYTHON, None, None),
+    (POLICY_SHADOW, FINTECH_AND_PYTHON, "llm", None),
+    (POLICY_SHADOW, FINTECH_ONLY, "llm", None),
+    (POLICY_SHADOW, PYTHON_ONLY, "llm", None),
+    (POLICY_SHADOW, EDUCATION_ONLY, "would_skip", None),
+    (POLICY_SHADOW, NOTHING, "would_skip", None),
+    (POLICY_ENFORCE, FINTECH_AND_PYTHON, "llm", None),
+    (POLICY_ENFORCE, FINTECH_ONLY, "llm", None),
+    (POLICY_ENFORCE, PYTHON_ONLY, "llm", None),
+    (POLICY_ENFORCE, EDUCATION_ONLY, "skipped", 33),
+    (POLICY_ENFORCE, NOTHING, "skipped", 0),
+])
+def test_only_clear_fails_are_answered_and_only_when_enforced(policy, text, decision, match_score):
+    service = PrescreenService(policy)
+    evaluation = service.screen(text, "cv.pdf")
+    
+    if match_score is None:
+        assert evaluation is None
+    else:
+        assert evaluation.status == PassFailStatus.FAIL
+        assert evaluation.match_score == match_score
+        assert not any(criterion.passed for criterion in evaluation.criteria if criterion.name != EDUCATION)
+    assert dict(service.decisions) == ({decision: 1} if decision else {})
+
+
+def test_stats_count_skips_and_would_be_skips():
+    shadow = PrescreenService(POLICY_SHADOW)
+    enforce = PrescreenService(POLICY_ENFORCE)
+    for text in (NOTHING, EDUCATION_ONLY, PYTHON_ONLY, FINTECH_ONLY):
+        shadow.screen(text, "cv.pdf")
+        enforce.screen(text, "cv.pdf")
+    
+    assert shadow.stats() == {
+        "policy": POLICY_SHADOW,
+        "screened": 4,
+        "sent_to_llm": 4,
+        "skipped": 0,
+        "would_skip": 2,
+        "skip_rate": 0.5,
+    }
+    assert enforce.stats() == {
+        "policy": POLICY_ENFORCE,
+        "screened": 4,
+        "sent_to_llm": 2,
+        "skipped": 2,
+        "would_skip": 0,
+        "skip_rate": 0.5,
+    }
+    assert PrescreenService(POLICY_OFF).stats()["skip_rate"] == 0.0
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown prescreen policy"):
+        PrescreenService("strict")
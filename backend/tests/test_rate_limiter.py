@@ -0,0 +1,256 @@
+"""
+Rate limiter tests: token buckets, shedding with refunds, retries and Retry-After, on a fake clock.
+"""
+
+import asyncio
+import types
+import pytest
+from anthropic import APIConnectionError, APIStatusError
+from app.services import rate_limiter
+from app.services.rate_limiter import AnthropicScheduler, RateLimitExceeded, TokenBucket, retry_after_header
+
+try:
+    # Newer SDK releases are built on httpx2
+    import httpx2 as sdk_httpx
+except ImportError:
+    import httpx as sdk_httpx
+
+REQUEST = sdk_httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+class FakeClock:
+    """Monotonic and wall clock that only moves when the scheduler sleeps."""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def time(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    monkeypatch.setattr(rate_limiter, "asyncio", types.SimpleNamespace(**{**vars(asyncio), "sleep": clock.sleep}))
+    # Full jitter picks the top of the range, so backoff delays are predictable
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: high)
+    return clock
+
+
+def status_error(status_code: int, headers=None) -> APIStatusError:
+    response = sdk_httpx.Response(status_code, headers=headers or {}, request=REQUEST)
+    return APIStatusError(f"HTTP {status_code}", response=response, body=None)
+
+
+def scheduler(**overrides) -> AnthropicScheduler:
+    options = dict(
+        requests_per_minute=60,
+        input_tokens_per_minute=60000,
+        max_concurrency=4,
+        max_retries=2,
+        retry_base_seconds=1.0,
+        retry_max_seconds=30.0,
+        max_queue_wait_seconds=5.0,
+    )
+    options.update(overrides)
+    return AnthropicScheduler(**options)
+
+
+class FlakyCall:
+    """A Claude call failing with the given errors before succeeding."""
+    
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    async def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "evaluation"
+
+
+def test_bucket_waits_for_the_deficit_and_refills(clock):
+    bucket = TokenBucket(per_minute=60)
+    
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(3) == pytest.approx(3.0)
+    clock.now += 30
+    assert bucket.reserve(0) == 0.0
+    assert bucket.level == pytest.approx(27.0)
+
+
+def test_bucket_clamps_reservations_and_refunds_to_capacity(clock):
+    bucket = TokenBucket(per_minute=60)
+    
+    assert bucket.reserve(600) == 0.0
+    assert bucket.level == 0.0
+    bucket.refund(600)
+    assert bucket.level == 60.0
+
+
+def test_bucket_sync_only_lowers_the_level(clock):
+    bucket = TokenBucket(per_minute=60)
+    
+    bucket.sync(10)
+    assert bucket.level == 10.0
+    bucket.sync(50)
+    assert bucket.level == 10.0
+
+
+def test_call_over_the_budget_is_shed_and_refunded(clock):
+    limiter = scheduler(requests_per_minute=1)
+    
+    async def scenario():
+        async with limiter.slot(100):
+            pass
+        levels = (limiter.requests.level, limiter.input_tokens.level)
+        with pytest.raises(RateLimitExceeded) as shed:
+            async with limiter.slot(100):
+                pass
+        return levels, shed.value
+    
+    levels, shed = asyncio.run(scenario())
+    assert (shed.status_code, shed.retry_after) == (429, pytest.approx(60.0))
+    assert (limiter.requests.level, limiter.input_tokens.level) == levels
+
+
+def test_call_within_the_budget_waits_for_it(clock):
+    limiter = scheduler(requests_per_minute=60)
+    limiter.requests.reserve(60)
+    
+    async def scenario():
+        async with limiter.slot(100):
+            pass
+    
+    asyncio.run(scenario())
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_call_without_a_free_slot_is_shed_and_refunded(clock):
+    limiter = scheduler(max_concurrency=1, max_queue_wait_seconds=0.05)
+    
+    async def scenario():
+        async with limiter.slot(100):
+            levels = (limiter.requests.level, limiter.input_tokens.level)
+            with pytest.raises(RateLimitExceeded) as shed:
+                async with limiter.slot(100):
+                    pass
+            return levels, shed.value
+    
+    levels, shed = asyncio.run(scenario())
+    assert shed.status_code == 503
+    assert (limiter.requests.level, limiter.input_tokens.level) == levels
+
+
+def test_cancelled_waiter_is_refunded(clock):
+    limiter = scheduler(max_concurrency=1, max_queue_wait_seconds=60)
+    
+    async def wait_for_slot():
+        async with limiter.slot(100):
+            pass
+    
+    async def scenario():
+        async with limiter.slot(100):
+            levels = (limiter.requests.level, limiter.input_tokens.level)
+            waiter = asyncio.create_task(wait_for_slot())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            return levels, waiter
+    
+    levels, waiter = asyncio.run(scenario())
+    assert waiter.cancelled()
+    assert (limiter.requests.level, limiter.input_tokens.level) == levels
+    assert limiter._waiting == 0
+
+
+def test_transient_failures_are_retried_with_backoff(clock):
+    limiter = scheduler(max_retries=2)
+    call = FlakyCall(status_error(529), APIConnectionError(request=REQUEST))
+    
+    assert asyncio.run(limiter.run(call, 100)) == "evaluation"
+    assert call.calls == 3
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_backoff_is_capped(clock):
+    limiter = scheduler(max_retries=3, retry_base_seconds=10.0, retry_max_seconds=15.0)
+    call = FlakyCall(status_error(500), status_error(502), status_error(503))
+    
+    asyncio.run(limiter.run(call, 100))
+    assert clock.sleeps == [10.0, 15.0, 15.0]
+
+
+def test_retry_after_is_respected_and_pauses_every_caller(clock):
+    limiter = scheduler(max_retries=1, retry_base_seconds=1.0)
+    call = FlakyCall(status_error(429, {"retry-after": "20"}))
+    
+    assert asyncio.run(limiter.run(call, 100)) == "evaluation"
+    # The backoff waits out Retry-After, and so does the next slot (already elapsed here)
+    assert clock.sleeps == [20.0]
+    assert limiter._paused_until == pytest.approx(1020.0)
+
+
+@pytest.mark.parametrize("error, status_code, retry_after", [
+    (status_error(429, {"retry-after": "12"}), 429, 12.0),
+    (status_error(429), 429, 30.0),
+    (status_error(529), 503, 30.0),
+    (status_error(503, {"retry-after": "7"}), 503, 7.0),
+])
+def test_exhausted_retries_map_to_429_or_503(clock, error, status_code, retry_after):
+    limiter = scheduler(max_retries=0)
+    
+    with pytest.raises(RateLimitExceeded) as shed:
+        asyncio.run(limiter.run(FlakyCall(error), 100))
+    assert (shed.value.status_code, shed.value.retry_after) == (status_code, retry_after)
+
+
+def test_client_errors_are_not_retried(clock):
+    limiter = scheduler(max_retries=2)
+    call = FlakyCall(status_error(400))
+    
+    with pytest.raises(APIStatusError):
+        asyncio.run(limiter.run(call, 100))
+    assert call.calls == 1
+
+
+@pytest.mark.parametrize("error, status_code, retry_after", [
+    (status_error(429, {"retry-after": "9"}), 429, 9.0),
+    (status_error(500), 503, 5.0),
+    (APIConnectionError(request=REQUEST), 503, 5.0),
+])
+def test_shed_error_maps_retryable_errors(clock, error, status_code, retry_after):
+    shed = scheduler().shed_error(error)
+    
+    assert (shed.status_code, shed.retry_after) == (status_code, retry_after)
+
+
+def test_shed_error_ignores_other_errors(clock):
+    assert scheduler().shed_error(status_error(400)) is None
+    assert scheduler().shed_error(ValueError("bad JSON")) is None
+
+
+def test_headers_tighten_the_buckets(clock):
+    limiter = scheduler()
+    limiter.observe_headers({
+        "anthropic-ratelimit-requests-remaining": "5",
+        "anthropic-ratelimit-input-tokens-remaining": "1000",
+    })
+    
+    assert (limiter.requests.level, limiter.input_tokens.level) == (5.0, 1000.0)
+
+
+def test_retry_after_header_rounds_up_to_whole_seconds():
+    assert retry_after_header(0.2) == {"Retry-After": "1"}
+    assert retry_after_header(12.1) == {"Retry-After": "13"}
@@ -0,0 +1,211 @@
+"""
+Screening pipeline tests: coalesced uploads outliving the request that started them,
+near-duplicates flagged on every evaluation path, and streamed results keyed by
+the model that produced them.
+"""
+
+import asyncio
+import os
+from app.models.schemas import CVEvaluationResponse, PassFailStatus, PDFIngestionResult
+from app.services.cache_service import ResultCache
+from app.services.evaluation_store import EvaluationStore
+from app.services.near_duplicate_index import NearDuplicateIndex, POLICY_FLAG, POLICY_REUSE
+from app.services.profile_registry import DEFAULT_PROFILE, ProfileRegistry
+from app.services.screening_pipeline import ScreeningPipeline
+from app.services.upload_service import SpooledUpload
+
+PDF = b"%PDF-1.4\n" + b"0" * 4096
+
+CV_TEXT = "Jane Doe. " + " ".join(f"Shipped payments feature {i} in TypeScript and Python." for i in range(40))
+EDITED_CV_TEXT = CV_TEXT.replace("feature 17 ", "feature seventeen ")
+
+
+class SlowPDFPool:
+    """Stand-in for the PDF pool: reads the source once released, like a worker process would."""
+    
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.started = asyncio.Event()
+    
+    async def ingest(self, source):
+        self.started.set()
+        await self.release.wait()
+        if isinstance(source, str):
+            with open(source, "rb") as file:
+                source = file.read()
+        return PDFIngestionResult(page_count=1, pages=[f"Jane Doe, {len(source)} bytes"])
+
+
+class StubEvaluationService:
+    """Stand-in for the Claude-backed service: a fixed evaluation per call."""
+    
+    def __init__(self):
+        self.profiles = ProfileRegistry([DEFAULT_PROFILE], "test-model", DEFAULT_PROFILE.name)
+        self.calls = 0
+    
+    def model_key(self, profile=None) -> str:
+        return "test-model"
+    
+    def stream_model_key(self, profile=None) -> str:
+        return "test-model"
+    
+    async def evaluate_cv_async(self, cv_text, filename, profile=None):
+        self.calls += 1
+        return CVEvaluationResponse(
+            status=PassFailStatus.PASS,
+            match_score=90,
+            reasoning=cv_text,
+            criteria=[],
+            candidate_name="Jane Doe"
+        )
+    
+    async def evaluate_cv_multi(self, cv_text, filename, profiles):
+        return {
+            profile.name: (await self.evaluate_cv_async(cv_text, filename, profile), "test-model", profile.prompt_version)
+            for profile in profiles
+        }
+    
+    async def evaluate_cv_stream(self, cv_text, filename, profile=None):
+        yield await self.evaluate_cv_async(cv_text, filename, profile)
+
+
+def spool(content: bytes) -> SpooledUpload:
+    """Spool content straight to a temporary file, as a large upload would be."""
+    upload = SpooledUpload(max_memory_bytes=0)
+    upload.write(content)
+    return upload
+
+
+def test_joined_upload_survives_first_caller_disconnecting():
+    async def scenario():
+        pool = SlowPDFPool()
+        service = StubEvaluationService()
+        pipeline = ScreeningPipeline(pdf_pool=pool, evaluation_service=service)
+        
+        first_upload = spool(PDF)
+        second_upload = spool(PDF)
+        first_path = first_upload.path
+        
+        async def request(upload: SpooledUpload):
+            # What the upload routes do: the request owns and closes its upload
+            with upload:
+                return await pipeline.run(upload, "cv.pdf")
+        
+        first = asyncio.create_task(request(first_upload))
+        await pool.started.wait()
+        second = asyncio.create_task(request(second_upload))
+        await asyncio.sleep(0)
+        
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        assert first.cancelled()
+        # The shared run still holds the first upload's file
+        assert os.path.exists(first_path)
+        
+        pool.release.set()
+        evaluation = await second
+        assert evaluation.reasoning == f"Jane Doe, {len(PDF)} bytes"
+        assert service.calls == 1
+        assert pipeline.upload_flights.calls["coalesced"] == 1
+        # Released once the shared run finished
+        assert not os.path.exists(first_path)
+    
+    asyncio.run(scenario())
+
+
+def test_spooled_upload_is_released_by_last_reference():
+    upload = spool(PDF)
+    path = upload.path
+    upload.retain()
+    upload.close()
+    assert os.path.exists(path)
+    assert upload.read_bytes() == PDF
+    upload.close()
+    assert not os.path.exists(path)
+
+
+def near_duplicate_pipeline(tmp_path, policy: str) -> ScreeningPipeline:
+    """A pipeline with a store and near-duplicate index holding one evaluation of CV_TEXT."""
+    store = EvaluationStore(str(tmp_path / "evaluations.sqlite3"))
+    index = NearDuplicateIndex(str(tmp_path / "near_duplicates.idx"), policy=policy)
+    pipeline = ScreeningPipeline(
+        pdf_pool=SlowPDFPool(),
+        evaluation_service=StubEvaluationService(),
+        store=store,
+        near_duplicates=index
+    )
+    
+    async def seed():
+        evaluation = await pipeline.evaluate(CV_TEXT, "original.pdf")
+        await pipeline.record("0" * 64, "original.pdf", CV_TEXT, evaluation)
+    
+    asyncio.run(seed())
+    return pipeline
+
+
+def test_flagged_near_duplicate_is_evaluated_and_marked_on_every_path(tmp_path):
+    pipeline = near_duplicate_pipeline(tmp_path, POLICY_FLAG)
+    profile = pipeline.profile()
+    
+    async def scenario():
+        single = await pipeline.evaluate(EDITED_CV_TEXT, "edited.pdf")
+        multi = await pipeline.evaluate_multi(EDITED_CV_TEXT, "edited.pdf", [profile])
+        streamed = [item async for item in pipeline.evaluate_stream(EDITED_CV_TEXT, "edited.pdf")]
+        return single, multi[profile.name][0], streamed[-1]
+    
+    for evaluation in asyncio.run(scenario()):
+        assert evaluation.reasoning == EDITED_CV_TEXT
+        assert evaluation.near_duplicate_of.evaluation_id == 1
+        assert evaluation.near_duplicate_of.similarity >= 0.9
+    assert pipeline.evaluation_service.calls == 4
+    assert pipeline.near_duplicates.lookups["flagged"] == 3
+
+
+def test_reused_near_duplicate_answers_without_claude(tmp_path):
+    pipeline = near_duplicate_pipeline(tmp_path, POLICY_REUSE)
+    profile = pipeline.profile()
+    
+    async def scenario():
+        single = await pipeline.evaluate(EDITED_CV_TEXT, "edited.pdf")
+        multi = await pipeline.evaluate_multi(EDITED_CV_TEXT, "edited.pdf", [profile])
+        streamed = [item async for item in pipeline.evaluate_stream(EDITED_CV_TEXT, "edited.pdf")]
+        return single, multi[profile.name][0], streamed[-1]
+    
+    for evaluation in asyncio.run(scenario()):
+        assert evaluation.reasoning == CV_TEXT
+        assert evaluation.near_duplicate_of.evaluation_id == 1
+    assert pipeline.evaluation_service.calls == 1
+
+
+class CascadeStubService(StubEvaluationService):
+    """Stand-in for a service with the model cascade on: only streams skip it."""
+    
+    def model_key(self, profile=None) -> str:
+        return "screen-model>test-model"
+
+
+def test_streamed_results_are_keyed_by_the_streamed_model(tmp_path):
+    store = EvaluationStore(str(tmp_path / "evaluations.sqlite3"))
+    pipeline = ScreeningPipeline(
+        pdf_pool=SlowPDFPool(),
+        evaluation_service=CascadeStubService(),
+        cache=ResultCache(),
+        store=store
+    )
+    pipeline.pdf_pool.release.set()
+    
+    async def scenario():
+        await pipeline.run(PDF, "cascade.pdf")
+        first = [item async for item in pipeline.run_stream(PDF, "streamed.pdf")]
+        replayed = [item async for item in pipeline.run_stream(PDF, "streamed.pdf")]
+        return first, replayed
+    
+    first, replayed = asyncio.run(scenario())
+    
+    # The cascade's result is neither replayed nor overwritten by the stream
+    assert isinstance(first[0], PDFIngestionResult)
+    assert not isinstance(replayed[0], PDFIngestionResult)
+    assert pipeline.evaluation_service.calls == 2
+    assert sorted(record.model for record in store.list(limit=10).items) == [
+        "screen-model>test-model", "test-model"
+    ]
@@ -0,0 +1,162 @@
+"""
+Search index tests: the pruned top-k against an exhaustive BM25 ranking,
+and the status and score filter mask.
+"""
+
+import math
+import random
+import pytest
+from app.models.schemas import PassFailStatus
+from app.services.search_index import IMPACT_LEVELS, MAX_RESULTS, PASSED_BIT, SearchIndex, _filter_table
+
+# Zipf-like vocabulary: a few terms in nearly every CV, a long tail of rare ones
+VOCABULARY = [f"term{i}" for i in range(200)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def random_index(rng: random.Random, documents: int = 400) -> SearchIndex:
+    index = SearchIndex(store=None)
+    for evaluation_id in range(1, documents + 1):
+        words = rng.choices(VOCABULARY, WEIGHTS, k=rng.randint(5, 120))
+        score = rng.randint(0, 100)
+        index.add(evaluation_id * 3, " ".join(words), {
+            "status": PassFailStatus.PASS.value if rng.random() < 0.4 else PassFailStatus.FAIL.value,
+            "match_score": score,
+            "reasoning": " ".join(rng.choices(VOCABULARY, WEIGHTS, k=rng.randint(0, 10))),
+            "criteria": [{"details": " ".join(rng.choices(VOCABULARY, k=3))}],
+        })
+    return index
+
+
+def keeps(code: int, status, min_score, max_score) -> bool:
+    """Whether a document's filter code satisfies the filters, decoded the long way."""
+    passed = code >= 128
+    score = code - 128 if passed else code
+    if status is not None and passed != (status == PassFailStatus.PASS):
+        return False
+    return (min_score is None or score >= min_score) and (max_score is None or score <= max_score)
+
+
+def brute_force(index: SearchIndex, query: str, status=None, min_score=None, max_score=None) -> dict[int, float]:
+    """Score every matching document on every query term, with no pruning."""
+    count = len(index._doc_ids)
+    scores: dict[int, float] = {}
+    for term in set(query.split()):
+        if term not in index._postings:
+            continue
+        docs, impacts = index._postings[term]
+        idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+        for doc, impact in zip(docs, impacts):
+            if keeps(index._codes[doc], status, min_score, max_score):
+                scores[doc] = scores.get(doc, 0.0) + idf * impact / IMPACT_LEVELS
+    return {index._doc_ids[doc]: score for doc, score in scores.items()}
+
+
+def assert_exact_top_k(results: list[tuple[int, float]], expected: dict[int, float], limit: int) -> None:
+    """Results must be the best `limit` scores, each the document's full score (ties in any order)."""
+    best = sorted(expected.values(), reverse=True)[:limit]
+    assert [score for _, score in results] == pytest.approx(best, abs=1e-3)
+    for evaluation_id, score in results:
+        assert score == pytest.approx(expected[evaluation_id], abs=1e-3)
+    assert len({evaluation_id for evaluation_id, _ in results}) == len(results)
+
+
+def test_pruned_search_matches_brute_force_ranking():
+    rng = random.Random(25)
+    index = random_index(rng)
+    for _ in range(300):
+        # Mix the common head with the rare tail so both pruning branches run
+        terms = rng.sample(VOCABULARY[:5], rng.randint(0, 3)) + rng.sample(VOCABULARY, rng.randint(1, 3))
+        query = " ".join(terms)
+        limit = rng.choice([1, 3, 10, 25])
+        results = index.search(query, limit=limit)
+        assert_exact_top_k(results, brute_force(index, query), limit)
+
+
+def test_filtered_search_matches_brute_force_ranking():
+    rng = random.Random(52)
+    index = random_index(rng)
+    for _ in range(300):
+        query = " ".join(rng.sample(VOCABULARY[:40], rng.randint(1, 4)))
+        filters = {
+            "status": rng.choice([None, PassFailStatus.PASS, PassFailStatus.FAIL]),
+            "min_score": rng.choice([None, 0, 30, 70]),
+            "max_score": rng.choice([None, 50, 90, 100]),
+        }
+        limit = rng.choice([1, 5, 20])
+        results = index.search(query, limit=limit, **filters)
+        assert_exact_top_k(results, brute_force(index, query, **filters), limit)
+
+
+@pytest.mark.parametrize("status, min_score, max_score", [
+    (None, None, None),
+    (PassFailStatus.PASS, None, None),
+    (PassFailStatus.FAIL, None, None),
+    (None, 40, None),
+    (None, None, 40),
+    (None, 40, 40),
+    (PassFailStatus.PASS, 70, 100),
+    (PassFailStatus.FAIL, 0, 0),
+    (None, 60, 50),
+])
+def test_filter_table_keeps_exactly_the_matching_codes(status, min_score, max_score):
+    table = _filter_table(status, min_score, max_score)
+    
+    for score in range(101):
+        for passed in (False, True):
+            code = score | (PASSED_BIT if passed else 0)
+            assert table[code] == keeps(code, status, min_score, max_score), (score, passed)
+
+
+def test_filters_apply_to_status_and_score():
+    index = SearchIndex(store=None)
+    for evaluation_id, status, score in [
+        (1, PassFailStatus.PASS, 90),
+        (2, PassFailStatus.PASS, 70),
+        (3, PassFailStatus.FAIL, 69),
+        (4, PassFailStatus.FAIL, 10),
+        (5, PassFailStatus.PASS, 100),
+    ]:
+        index.add(evaluation_id, "python developer", {"status": status.value, "match_score": score})
+    
+    def found(**filters) -> set[int]:
+        return {evaluation_id for evaluation_id, _ in index.search("python", limit=10, **filters)}
+    
+    assert found() == {1, 2, 3, 4, 5}
+    assert found(status=PassFailStatus.PASS) == {1, 2, 5}
+    assert found(status=PassFailStatus.FAIL) == {3, 4}
+    assert found(min_score=70) == {1, 2, 5}
+    assert found(max_score=69) == {3, 4}
+    assert found(status=PassFailStatus.PASS, min_score=75, max_score=99) == {1}
+    assert found(status=PassFailStatus.FAIL, min_score=70) == set()
+
+
+def test_reasoning_and_details_outweigh_the_cv_text():
+    index = SearchIndex(store=None)
+    index.add(1, "kubernetes", {"reasoning": "", "criteria": []})
+    index.add(2, "", {"reasoning": "kubernetes", "criteria": []})
+    index.add(3, "", {"reasoning": "", "criteria": [{"details": "kubernetes"}]})
+    index.add(4, "unrelated", {"reasoning": "unrelated", "criteria": []})
+    
+    results = index.search("Kubernetes", limit=10)
+    
+    assert {evaluation_id for evaluation_id, _ in results[:2]} == {2, 3}
+    assert results[-1][0] == 1
+
+
+def test_queries_without_matches_or_terms():
+    index = SearchIndex(store=None)
+    index.add(1, "python developer", {})
+    
+    assert index.search("cobol") == []
+    with pytest.raises(ValueError, match="no searchable terms"):
+        index.search("?! --")
+
+
+def test_limit_is_capped():
+    index = SearchIndex(store=None)
+    for evaluation_id in range(1, MAX_RESULTS + 20):
+        index.add(evaluation_id, "python", {})
+    
+    assert len(index.search("python", limit=10_000)) == MAX_RESULTS
+    assert len(index.search("python", limit=0)) == 1
@@ -0,0 +1,96 @@
+"""
+Text compactor tests: header/footer and page-number removal, de-hyphenation and section budgets.
+"""
+
+import pytest
+from app.services.text_compactor import TextCompactor
+
+PAGE_ONE = """Jane Doe - Curriculum Vitae
+jane@example.com
+Experience
+Acme Payments
+2016 - 2019
+Built the settlement engine in Python.
+Beta Exchange
+2014 - 2016
+Jane Doe | Page 1 of 2
+1"""
+
+PAGE_TWO = """Jane Doe - Curriculum Vitae
+Wrote trading APIs in TypeScript.
+Education
+BSc Computer Science, MIT
+2010 - 2014
+Jane Doe | Page 2 of 2
+2"""
+
+
+def test_repeated_header_and_footer_are_kept_once():
+    text = TextCompactor().compact([PAGE_ONE, PAGE_TWO]).text
+    
+    assert text.count("Jane Doe - Curriculum Vitae") == 1
+    assert text.count("Jane Doe | Page 1 of 2") == 1
+    assert "Page 2 of 2" not in text
+    assert "\n1\n" not in text and not text.endswith("\n2")
+
+
+def test_date_lines_survive_on_every_page():
+    text = TextCompactor().compact([PAGE_ONE, PAGE_TWO]).text
+    
+    for dates in ("2016 - 2019", "2014 - 2016", "2010 - 2014"):
+        assert dates in text
+
+
+def test_edge_repeat_is_not_dropped_from_the_middle_of_a_page():
+    pages = [
+        "Header\nIntro\nAcme Payments\nSkills\nPython\nRust\nFooter",
+        "Header\nMore\nText\nAcme Payments\nSkills\nJava\nGo\nFooter",
+        "Acme Payments\nHeader\nOther\nMiddle\nLines\nHere\nTail\nFooter",
+    ]
+    text = TextCompactor().compact(pages).text
+    
+    assert text.count("Header") == 1
+    assert text.count("Footer") == 1
+    # Repeated at the edges of two pages, but the middle copy on page two is content
+    assert text.count("Acme Payments") == 2
+
+
+@pytest.mark.parametrize("line", ["3", "Page 3", "page 3 of 4", "3 / 4"])
+def test_page_numbers_are_dropped(line):
+    text = TextCompactor().compact([f"Jane Doe\nPython developer\n{line}"]).text
+    
+    assert text == "Jane Doe\nPython developer"
+
+
+def test_words_hyphenated_across_lines_are_rejoined():
+    text = TextCompactor().compact(["Led change manage-\nment for the payments team"]).text
+    
+    assert text == "Led change management for the payments team"
+
+
+def test_capitalized_continuation_keeps_its_hyphen():
+    text = TextCompactor().compact(["Worked on Python-\nTypeScript tooling"]).text
+    
+    assert text == "Worked on Python-\nTypeScript tooling"
+
+
+def test_budget_trims_lowest_priority_sections_first():
+    experience = "\n".join(f"Shipped payments feature {i}" for i in range(20))
+    hobbies = "\n".join(f"Climbing trip {i}" for i in range(40))
+    page = f"Jane Doe\nExperience\n{experience}\nHobbies\n{hobbies}"
+    
+    result = TextCompactor(token_budget=150).compact([page])
+    
+    assert result.truncated
+    assert result.compacted_tokens <= 150
+    assert experience in result.text
+    assert "Climbing trip 0" in result.text
+    assert "Climbing trip 39" not in result.text
+    assert result.text.endswith("[...]")
+
+
+def test_text_within_budget_is_not_truncated():
+    result = TextCompactor(token_budget=1000).compact(["Jane Doe\nExperience\nAcme Payments"])
+    
+    assert not result.truncated
+    assert result.text == "Jane Doe\nExperience\nAcme Payments"